@@ -1,50 +1,79 @@
-def _get_soft_caps_gradient(skill_points: int, soft_caps_locations: list):
+import heapq
+import numpy as np
+# the game profiles and precomputed rating tables are shared with the simplex scripts, which
+# have to be importable (see test_script.py)
+import game_profiles
+from exact_allocation import InfeasibleBuildException, allocate, sweep
+from solve_cache import get_problem_key
+
+
+def _get_soft_caps_gradient(skill_points: int, gradients: np.ndarray):
     """
-    Function which returns the gradient of the damage rating function based off
-    where the soft caps are located.
+    Function which returns the gradient of the damage rating function from
+    the soft cap gradients of the skill, tabulated by its game profile.
 
     This encodes the partial differentation explained in the LaTeX doc.
     """
-    if skill_points >= 99:
-        return 0
-    for i in range(len(soft_caps_locations) - 1):
-        # if skill_points is between a boundary of the soft caps
-        if soft_caps_locations[i] <= skill_points < soft_caps_locations[i+1]:
-            # calculate the gradient of the damage rating function here
-            # use a base 2 "logarthmic-like" piece-wise linear function
-            return 0.5**(i+1)
-
-
-def _convert_letter_grades_to_floats(grades: list):
-    grades_to_floats_dict = {"S": 1.7, "A": 1.195, "B": 0.87,
-                             "C": 0.62, "D": 0.37, "E": 0.125,
-                             "F": 0}
+    return gradients[min(skill_points, len(gradients) - 1)]
+
+
+def _convert_letter_grades_to_floats(grades: list, profile):
+    grades_to_floats_dict = profile.grade_multipliers
     for i in range(len(grades)):
         grades[i] = grades_to_floats_dict[grades[i]]
     return grades
 
 
-def _get_maximum_skill_change(weapon: dict, floats: bool, skills_points : list[int]):
-    damage_ratings = weapon["grades"].copy()
-    if not floats:
-        damage_ratings = _convert_letter_grades_to_floats(damage_ratings)
-    max_i = 0
-    for i in range(len(damage_ratings)):
-        if i < 2:
-            damage_ratings[i] *= _get_soft_caps_gradient(
-                    skills_points[i],
-                    [1, 10, 20, 40, 99]) * weapon["physical_damage"]
+def _get_base_damages(weapon: dict, profile) -> list:
+    """Base damage of the weapon for every damage type of the profile"""
+    return [weapon[name + "_damage"] for name in profile.damage_names]
+
+
+def _get_skill_change(grade: float, base_damage: float, gradients: np.ndarray,
+                      skill_points: int):
+    """
+    Function which returns the damage gained by levelling a skill once.
+    """
+    return grade * (_get_soft_caps_gradient(skill_points, gradients)
+                    * base_damage)
+
+
+def _allocate_greedily(grades: list, base_damages: list, x: list,
+                       levels: int, profile) -> list:
+    """
+    Spends the levels one at a time on the skill with the greatest damage
+    gain, ties going to the first skill.
+
+    The gain of a skill only changes at its soft caps so the chosen skill is
+    levelled straight to its next soft cap (or until the levels run out) and
+    only its entry in the heap of (-gain, skill) is replaced, taking
+    O(soft caps * log n) rather than O(levels * n) steps.
+    """
+    gradients = profile.soft_cap_gain
+    ends = profile.soft_cap_segment_end
+    bases = [base_damages[profile.damage_types[i]]
+             for i in range(len(grades))]
+    heap = [(-_get_skill_change(grades[i], bases[i], gradients[i], x[i]), i)
+            for i in range(len(grades))]
+    heapq.heapify(heap)
+    while levels > 0:
+        _, i = heapq.heappop(heap)
+        if x[i] >= profile.max_skill:
+            # the gain never changes past the skill cap
+            steps = levels
         else:
-            damage_ratings[i] *= _get_soft_caps_gradient(
-                    skills_points[i],
-                    [1, 10, 30, 50, 99]) * weapon["magic_damage"]
-        if damage_ratings[i] > damage_ratings[max_i]:
-            max_i = i
-    return max_i
+            steps = min(int(ends[i, x[i]]) - x[i], levels)
+        x[i] += steps
+        levels -= steps
+        heapq.heappush(
+            heap, (-_get_skill_change(grades[i], bases[i], gradients[i],
+                                      x[i]), i))
+    return x
 
 
 def maximise_damage(weapon: dict, default_skills: list,
-                    levels: int, floats: bool = False) -> list:
+                    levels: int, floats: bool = False,
+                    profile=None, cache=None) -> list:
     """
     Function which takes in a damage maximisation problem and returns the
     optimal skill setup for maximising the damage.
@@ -60,11 +89,20 @@ def maximise_damage(weapon: dict, default_skills: list,
         levels - number of skills to level up by
         grades - whether the grades given in weapon are letter grades
              or exact float scalars.
+        profile - game profile (or its name) whose soft caps are used,
+             dark souls by default
+        cache - optional SolveCache, problems it has seen (up to scaling the
+             base damages) are not solved again
     Returns
     =======
         Optimal skill distribution to maximise damage dealt by the given weapon
         using the number of levels given.
     """
+    if cache is not None:
+        profile = game_profiles.get_profile(profile)
+        key = get_problem_key("maximise_damage", weapon["grades"], weapon["requirements"], default_skills,
+                              _get_base_damages(weapon, profile), levels, profile)
+        return cache.get_or_solve(key, lambda: maximise_damage(weapon, default_skills, levels, floats, profile))
     # constraint 2 part 1 enforced here
     x: list = default_skills.copy()
     # firstly check if you can meet minimum requirements for the weapon
@@ -78,9 +116,79 @@ def maximise_damage(weapon: dict, default_skills: list,
     # which would allow for a best guess/encouragement for leveling
     # up appropriately for weapon requirements
     if levels < 0:
-        raise Exception("Build is not feasible!")
-    while levels > 0:
-        skill = _get_maximum_skill_change(weapon, floats, x)
-        x[skill] += 1
-        levels -= 1
-    return x
+        raise InfeasibleBuildException("Build is not feasible!")
+    profile = game_profiles.get_profile(profile)
+    grades = weapon["grades"].copy()
+    if not floats:
+        grades = _convert_letter_grades_to_floats(grades, profile)
+    return _allocate_greedily(grades, _get_base_damages(weapon, profile), x,
+                              levels, profile)
+
+
+def _get_allocation_problem(weapon: dict, default_skills: list, floats: bool,
+                            profile):
+    """
+    Gets the value tables of every skill, the lower bound of every skill and
+    the number of levels it takes to meet the weapon requirements.
+    """
+    profile = game_profiles.get_profile(profile)
+    grades = weapon["grades"].copy()
+    if not floats:
+        grades = _convert_letter_grades_to_floats(grades, profile)
+    lower_bounds = [max(skill, requirement) for skill, requirement
+                    in zip(default_skills, weapon["requirements"])]
+    # constraint 2 costs the points needed to reach every requirement
+    shortfall = sum(lower_bounds) - sum(default_skills)
+    base_damages = _get_base_damages(weapon, profile)
+    values = [grades[i] * profile.soft_cap_rating[i]
+              * base_damages[profile.damage_types[i]]
+              for i in range(len(grades))]
+    return values, lower_bounds, shortfall
+
+
+def maximise_damage_exactly(weapon: dict, default_skills: list,
+                            levels: int, floats: bool = False,
+                            profile=None) -> list:
+    """
+    Exact counterpart of maximise_damage which solves the allocation by
+    dynamic programming over (skill, points spent) instead of greedily.
+
+    Parameters
+    ==========
+        weapon - information about the weapon (as in maximise_damage)
+        default_skills - skills that are defaulted by the character
+        levels - number of skills to level up by, raising a skill up to the
+             weapon requirement costs the difference in points
+        floats - whether the grades given in weapon are exact float scalars
+             rather than letter grades.
+        profile - game profile (or its name), dark souls by default
+    Returns
+    =======
+        Provably optimal skill distribution within the weapon requirements
+        and the skill cap using the number of levels given.
+    """
+    values, lower_bounds, shortfall = _get_allocation_problem(
+        weapon, default_skills, floats, profile)
+    return [int(x) for x in allocate(values, lower_bounds, levels - shortfall)]
+
+
+def maximise_damage_sweep(weapon: dict, default_skills: list,
+                          max_levels: int, floats: bool = False,
+                          profile=None):
+    """
+    Solves maximise_damage_exactly for every number of levels
+    0,...,max_levels in one pass of the dynamic program.
+
+    Returns
+    =======
+        (max_levels + 1, n) uint8 array whose row l is the optimal skill
+        distribution using l levels, rows with no feasible distribution
+        are all 0.
+    """
+    values, lower_bounds, shortfall = _get_allocation_problem(
+        weapon, default_skills, floats, profile)
+    builds = np.zeros((max_levels + 1, len(lower_bounds)), dtype=np.uint8)
+    if max_levels >= shortfall:
+        builds[shortfall:], _ = sweep(values, lower_bounds,
+                                      max_levels - shortfall)
+    return builds
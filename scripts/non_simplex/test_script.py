@@ -1,3 +1,9 @@
+import os
+import sys
+
+# the solvers share the game profiles of the simplex scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "simplex"))
+
 import damage_maximisation, damage_maximisation_elden_ring
 import json
 
@@ -8,3 +14,5 @@ with open("problem.json", "r") as file:
 
 print("DS1 ", damage_maximisation.maximise_damage(problem["weapon"], problem["skills"], problem["levels"]))
 print("ER ", damage_maximisation_elden_ring.maximise_damage(problem["weapon"], problem["skills"], problem["levels"]))
+print("DS1 exact ", damage_maximisation.maximise_damage_exactly(problem["weapon"], problem["skills"], problem["levels"]))
+print("ER exact ", damage_maximisation_elden_ring.maximise_damage_exactly(problem["weapon"], problem["skills"], problem["levels"]))
@@ -0,0 +1,229 @@
+"""
+This module benchmarks every solver of the damage maximisation problem on the same seeded test
+cases. Every solver is warmed up and then timed with perf_counter_ns over repeated trials, its
+report holds the throughput, p50/p99 latency, pivot count and the damage gap to the exact optimum
+found by exact_allocation so that regressions show up as numbers.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+import game_profiles
+from damage_optimisation_script_approximation_function import _get_constraints_batch, _get_weights_batch
+from exact_allocation import optimise_exactly
+from objective_fn import get_total_damage_ratings
+from testing_scripts import generate_random_feasible_test_cases
+from two_phase_simplex import TwoPhaseSimplex, RevisedTwoPhaseSimplex, LinearPieceWiseTwoPhaseSimplex, PivotInstrumentation
+
+try:
+    from scipy.optimize import linprog
+except ImportError:
+    linprog = None
+
+
+class _Program:
+    """The linear programs and weapon of one test case, built once outside of the timings"""
+
+    def __init__(self, test_case : dict, profile) -> None:
+        self.test_case : dict = test_case
+        self.profile : game_profiles.GameProfile = profile
+        a, b = _get_constraints_batch(test_case["requirements"], test_case["skills"], test_case["levels"], profile)
+        scalings_floats, weights = _get_weights_batch(
+            test_case["grades"], test_case["base_physical"], test_case["base_magical"], profile
+        )
+        self.a : np.ndarray = a
+        self.b : np.ndarray = b[0]
+        self.scalings_floats : list = list(scalings_floats[0])
+        skills : np.ndarray = np.array(test_case["skills"], dtype=float)
+        # costs of the fixed linear approximation and of the pieces the default skills lie on
+        self.approximate_c : np.ndarray = np.zeros(4*3)
+        self.approximate_c[0:4] = -profile.approximation_costs * weights[0]
+        self.piecewise_c : np.ndarray = np.zeros(4*3)
+        self.piecewise_c[0:4] = skills * profile.get_lp_slopes(skills) * weights[0]
+        self.weapon : dict = {
+            "grades": list(test_case["grades"]),
+            "requirements": list(test_case["requirements"]),
+            "physical_damage": test_case["base_physical"],
+            "magic_damage": test_case["base_magical"],
+        }
+
+
+def _solve_two_phase_simplex(program : _Program, count : bool = False) -> tuple:
+    instrumentation = PivotInstrumentation() if count else None
+    solver = TwoPhaseSimplex(program.a, program.b, program.approximate_c, instrumentation=instrumentation)
+    solver.solve_program()
+    return solver.get_solution(), instrumentation and instrumentation.get_total_pivots()
+
+
+def _solve_revised_two_phase_simplex(program : _Program, count : bool = False) -> tuple:
+    solver = RevisedTwoPhaseSimplex(program.a, program.b, program.approximate_c)
+    solver.solve_program()
+    return solver.get_solution(), solver.get_pivot_count() if count else None
+
+
+def _solve_linear_piecewise(program : _Program, count : bool = False) -> tuple:
+    test_case : dict = program.test_case
+    instrumentation = PivotInstrumentation() if count else None
+    solver = LinearPieceWiseTwoPhaseSimplex(
+        program.a, program.b, program.piecewise_c, program.scalings_floats,
+        test_case["base_physical"], test_case["base_magical"], profile=program.profile,
+        instrumentation=instrumentation
+    )
+    solver.solve_program()
+    return solver.get_solution(), instrumentation and instrumentation.get_total_pivots()
+
+
+def _solve_linprog(program : _Program, count : bool = False) -> tuple:
+    result = linprog(program.approximate_c, A_eq=program.a, b_eq=program.b, method="highs")
+    return list(result.x[0:4]), int(result.nit)
+
+
+def _solve_greedy(program : _Program, count : bool = False) -> tuple:
+    # the greedy solvers live alongside the simplex scripts and are only loaded when asked for
+    import damage_maximisation
+    test_case : dict = program.test_case
+    return damage_maximisation.maximise_damage(
+        program.weapon, list(test_case["skills"]), test_case["levels"], profile=program.profile
+    ), None
+
+
+def _solve_greedy_exactly(program : _Program, count : bool = False) -> tuple:
+    import damage_maximisation
+    test_case : dict = program.test_case
+    return damage_maximisation.maximise_damage_exactly(
+        program.weapon, list(test_case["skills"]), test_case["levels"], profile=program.profile
+    ), None
+
+
+# every solver takes a program and whether to count its pivots and returns (build, pivots)
+SOLVERS : dict = {
+    "two_phase_simplex": _solve_two_phase_simplex,
+    "revised_two_phase_simplex": _solve_revised_two_phase_simplex,
+    "linear_piecewise": _solve_linear_piecewise,
+    "linprog": _solve_linprog,
+    "maximise_damage": _solve_greedy,
+    "maximise_damage_exactly": _solve_greedy_exactly,
+}
+
+
+def _get_optimum(test_case : dict, profile) -> float:
+    """Attack rating of the exact optimum of a test case"""
+    build : list = optimise_exactly(
+        test_case["grades"], test_case["requirements"], test_case["skills"],
+        test_case["base_physical"], test_case["base_magical"], test_case["levels"], profile
+    )
+    return _get_damage(build, test_case, profile)
+
+
+def _get_damage(build : list, test_case : dict, profile) -> float:
+    return float(get_total_damage_ratings(
+        np.array(build, dtype=float), test_case["grades"],
+        [test_case["base_physical"], test_case["base_magical"]], profile=profile
+    )[0])
+
+
+def _percentile(latencies : np.ndarray, q : float) -> float:
+    return float(np.percentile(latencies, q)) if len(latencies) else float("nan")
+
+
+def benchmark_solver(solve, programs : list, optima : np.ndarray, profile, trials : int = 5, warmup : int = 3) -> dict:
+    """
+    Benchmarks one solver over every program, the first warmup programs are solved once
+    untimed, then every program is solved trials times with each call timed separately.
+    Pivots and damage come from one extra untimed (and instrumented) run of every program.
+    Latencies are reported in microseconds and the gap as a fraction of the optimum.
+    """
+    for program in programs[:warmup]:
+        solve(program)
+    latencies : list = []
+    started : int = time.perf_counter_ns()
+    for program in programs:
+        for _ in range(trials):
+            start : int = time.perf_counter_ns()
+            solve(program)
+            latencies.append(time.perf_counter_ns() - start)
+    elapsed : int = time.perf_counter_ns() - started
+    pivots : list = []
+    gaps : list = []
+    for program, optimum in zip(programs, optima):
+        build, pivot_count = solve(program, count=True)
+        if pivot_count is not None:
+            pivots.append(pivot_count)
+        damage : float = _get_damage(build, program.test_case, profile)
+        gaps.append((optimum - damage) / optimum if optimum > 0 else 0.0)
+    latencies_us : np.ndarray = np.array(latencies) / 1e3
+    gaps_array : np.ndarray = np.array(gaps)
+    return {
+        "calls": len(latencies),
+        "throughput": len(latencies) / (elapsed / 1e9) if elapsed > 0 else float("inf"),
+        "p50_us": _percentile(latencies_us, 50),
+        "p99_us": _percentile(latencies_us, 99),
+        "mean_us": float(latencies_us.mean()) if len(latencies) else float("nan"),
+        "mean_pivots": float(np.mean(pivots)) if pivots else None,
+        "mean_gap": float(gaps_array.mean()) if len(gaps) else float("nan"),
+        "max_gap": float(gaps_array.max()) if len(gaps) else float("nan"),
+    }
+
+
+def run_benchmark(
+    n_cases : int = 100, seed : int = 0, trials : int = 5, warmup : int = 3, solvers : list = None, profile=None
+) -> dict:
+    """
+    Benchmarks the chosen solvers (every solver by default) on n_cases random feasible test
+    cases generated from seed, returns the report of every solver keyed by its name.
+    linprog is skipped when scipy isn't installed.
+    """
+    profile = game_profiles.get_profile(profile)
+    random.seed(seed)
+    test_cases : list = generate_random_feasible_test_cases(n_cases)
+    programs : list = [_Program(test_case, profile) for test_case in test_cases]
+    optima : np.ndarray = np.array([_get_optimum(test_case, profile) for test_case in test_cases])
+    report : dict = {}
+    for name in solvers or SOLVERS:
+        if name == "linprog" and linprog is None:
+            continue
+        report[name] = benchmark_solver(SOLVERS[name], programs, optima, profile, trials, warmup)
+    return report
+
+
+def format_report(report : dict) -> str:
+    """Formats a benchmark report as a fixed width table"""
+    lines : list = [
+        f"{'solver':<26}{'calls/s':>12}{'p50 us':>12}{'p99 us':>12}{'pivots':>10}{'mean gap':>12}{'max gap':>12}"
+    ]
+    for name, stats in report.items():
+        pivots : str = "-" if stats["mean_pivots"] is None else f"{stats['mean_pivots']:.1f}"
+        lines.append(
+            f"{name:<26}{stats['throughput']:>12.1f}{stats['p50_us']:>12.1f}{stats['p99_us']:>12.1f}"
+            f"{pivots:>10}{stats['mean_gap']:>12.2%}{stats['max_gap']:>12.2%}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the damage maximisation solvers")
+    parser.add_argument("--cases", type=int, default=100, help="number of random test cases")
+    parser.add_argument("--seed", type=int, default=0, help="seed the test cases are generated from")
+    parser.add_argument("--trials", type=int, default=5, help="timed solves of every test case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed solves before timing")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), help="solvers to benchmark")
+    parser.add_argument(
+        "--profile", default=None, choices=game_profiles.get_profile_names(), help="game profile name, dark souls by default"
+    )
+    parser.add_argument("--json", help="also write the report as JSON to this path")
+    args = parser.parse_args()
+    report : dict = run_benchmark(args.cases, args.seed, args.trials, args.warmup, args.solvers, args.profile)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    # run as a script the greedy solvers are found alongside the simplex scripts
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "non_simplex"))
+    main()
@@ -0,0 +1,102 @@
+"""
+This module finds the true optimum of the damage maximisation problem by enumerating every feasible
+(STR, DEX, INT, FAITH) allocation, giving a certified reference to compare the other solvers against.
+The allocations are scored with the vectorized objective function in memory bounded chunks which can
+be spread over a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import game_profiles
+from exact_allocation import InfeasibleBuildException
+from objective_fn import get_total_damage_ratings
+
+# number of allocations held in memory by a single chunk
+DEFAULT_CHUNK_SIZE: int = 1 << 18
+
+
+def _get_chunks(
+    lower_bounds: np.ndarray, total: int, chunk_size: int, max_skill: int
+) -> list[tuple]:
+    """
+    Splits the enumeration into slices of STR values, each slice covers every DEX and INT value
+    for its STR values with FAITH being fixed by the total.
+    """
+    # STR can't exceed what is left once every other skill is at its lower bound
+    highest: int = min(max_skill, total - int(lower_bounds[1:].sum()))
+    rows_per_strength: int = (max_skill + 1 - lower_bounds[1]) * (max_skill + 1 - lower_bounds[2])
+    step: int = max(1, chunk_size // rows_per_strength)
+    return [
+        (start, min(start + step, highest + 1))
+        for start in range(int(lower_bounds[0]), highest + 1, step)
+    ]
+
+
+def _evaluate_chunk(args: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scores every feasible allocation of a chunk and returns its top k builds and damages, builds
+    are enumerated in lexicographic order so ties keep the lexicographically smallest build.
+    """
+    (start, stop), lower_bounds, total, scalings, weapon, top_k, profile = args
+    strength, dexterity, intelligence = np.meshgrid(
+        np.arange(start, stop),
+        np.arange(lower_bounds[1], profile.max_skill + 1),
+        np.arange(lower_bounds[2], profile.max_skill + 1),
+        indexing="ij",
+    )
+    faith: np.ndarray = total - strength - dexterity - intelligence
+    feasible: np.ndarray = (faith >= lower_bounds[3]) & (faith <= profile.max_skill)
+    builds: np.ndarray = np.stack(
+        (strength[feasible], dexterity[feasible], intelligence[feasible], faith[feasible]),
+        axis=1,
+    )
+    damages: np.ndarray = get_total_damage_ratings(builds, scalings, weapon, profile=profile)
+    best: np.ndarray = np.argsort(-damages, kind="stable")[:top_k]
+    return builds[best], damages[best]
+
+
+def brute_force_optimum(
+    grades: list,
+    requirements: list,
+    skills: list,
+    base_physical: float,
+    base_magical: float,
+    level: int,
+    top_k: int = 10,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    profile=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerates every build with max(requirement, skill) <= x <= 99 for each skill which spends
+    level + sum(skills) points in total, the same constraints as the linear programs.
+    The profile must have four skills, the skill cap and rating curves come from the profile.
+
+    Returns the (top_k, 4) array of the best builds and the (top_k,) array of their damages in
+    descending order of damage, the first row is the true optimum.
+    Raises InfeasibleBuildException if no build satisfies the constraints.
+    """
+    profile = game_profiles.get_profile(profile)
+    lower_bounds: np.ndarray = np.maximum(requirements, skills).astype(np.intp)
+    total: int = int(level + sum(skills))
+    if (
+        np.any(lower_bounds > profile.max_skill)
+        or not lower_bounds.sum() <= total <= 4 * profile.max_skill
+    ):
+        raise InfeasibleBuildException("Build is not feasible!")
+    scalings: np.ndarray = profile.get_scales(grades)
+    weapon: np.ndarray = np.array([base_physical, base_magical], dtype=float)
+    tasks = [
+        (chunk, lower_bounds, total, scalings, weapon, top_k, profile)
+        for chunk in _get_chunks(lower_bounds, total, chunk_size, profile.max_skill)
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_chunk, tasks))
+    else:
+        results = [_evaluate_chunk(task) for task in tasks]
+    builds: np.ndarray = np.concatenate([result[0] for result in results])
+    damages: np.ndarray = np.concatenate([result[1] for result in results])
+    # chunks are in lexicographic order so a stable sort keeps the tie break consistent
+    best: np.ndarray = np.argsort(-damages, kind="stable")[:top_k]
+    return builds[best], damages[best]
@@ -0,0 +1,136 @@
+"""
+This module precomputes the optimal build of every (weapon, starting class, level) of a game offline
+so that the best build can be looked up in O(1) at request time without running any solver.
+The builds are found exactly by exact_allocation.sweep_levels (one pass of the dynamic program per
+weapon and class covers every level) and stored as a (weapons, classes, levels + 1, skills) uint8
+array in a .npy file which is memory mapped by BuildIndex, next to a small JSON file naming the rows.
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+import game_profiles
+from exact_allocation import sweep_levels
+
+_BUILDS_FILE: str = "builds.npy"
+_INDEX_FILE: str = "index.json"
+
+
+def _get_capacities(profile, classes: list) -> list:
+    """Most levels every class can spend before all of its skills are capped"""
+    return [
+        profile.stat_count * profile.max_skill - sum(profile.starting_classes[name])
+        for name in classes
+    ]
+
+
+def build_index(weapons: list, path: str, profile=None, classes: list = None, max_level: int = None) -> None:
+    """
+    Solves every weapon and starting class of the profile for every level and writes the index to
+    the directory at path.
+
+    Parameters
+    ==========
+        weapons - weapons in the form maximise_damage takes them with a unique "name" added
+            {name, grades, requirements, physical_damage, magic_damage}
+        path - directory the index is written to, created if needed
+        profile - game profile (or its name), dark souls by default
+        classes - names of the starting classes to index, every class of the profile by default
+        max_level - greatest number of levels indexed, by default the most levels any class
+            can spend before all of its skills are capped
+    """
+    profile = game_profiles.get_profile(profile)
+    classes = list(profile.starting_classes) if classes is None else list(classes)
+    names: list = [weapon["name"] for weapon in weapons]
+    if len(set(names)) != len(names):
+        raise ValueError("weapon names must be unique")
+    capacities: list = _get_capacities(profile, classes)
+    if max_level is None:
+        max_level = max(capacities, default=0)
+    os.makedirs(path, exist_ok=True)
+    builds: np.memmap = np.lib.format.open_memmap(
+        os.path.join(path, _BUILDS_FILE),
+        mode="w+",
+        dtype=np.uint8,
+        shape=(len(weapons), len(classes), max_level + 1, profile.stat_count),
+    )
+    for w, weapon in enumerate(weapons):
+        base_damages: list = [weapon[name + "_damage"] for name in profile.damage_names]
+        for c, name in enumerate(classes):
+            builds[w, c], _ = sweep_levels(
+                weapon["grades"], weapon["requirements"], profile.starting_classes[name],
+                *base_damages, max_level, profile
+            )
+    builds.flush()
+    del builds
+    index: dict = {
+        "profile": profile.name,
+        "weapons": names,
+        "classes": classes,
+        "capacities": capacities,
+        "max_level": max_level,
+    }
+    with open(os.path.join(path, _INDEX_FILE), "w") as file:
+        json.dump(index, file)
+
+
+class BuildIndex:
+    """
+    Read only view of an index written by build_index, the builds are memory mapped so opening
+    an index costs nothing however many weapons it holds and every lookup is O(1).
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, _INDEX_FILE)) as file:
+            index: dict = json.load(file)
+        self.profile: str = index["profile"]
+        self.max_level: int = index["max_level"]
+        self._weapons: dict = {name: i for i, name in enumerate(index["weapons"])}
+        self._classes: dict = {name: i for i, name in enumerate(index["classes"])}
+        self._capacities: list = index["capacities"]
+        # a plain ndarray view of the map indexes several times faster than np.memmap
+        self._builds: np.ndarray = np.load(os.path.join(path, _BUILDS_FILE), mmap_mode="r").view(np.ndarray)
+
+    def get_weapon_names(self) -> list:
+        return list(self._weapons)
+
+    def get_class_names(self) -> list:
+        return list(self._classes)
+
+    def get_build(self, weapon: str, class_name: str, level: int) -> np.ndarray:
+        """
+        Optimal build of a weapon spending level levels from a starting class, as
+        optimise_exactly would find it. Levels past what the class can spend give the fully
+        capped build, None is returned when the levels can't meet the weapon requirements.
+        Raises KeyError for weapons or classes which aren't indexed and ValueError for negative
+        levels or levels past max_level which the class could still spend.
+        """
+        c: int = self._classes[class_name]
+        spent: int = min(level, self._capacities[c])
+        if spent < 0 or spent > self.max_level:
+            raise ValueError(f"level {level} is outside the indexed levels 0 to {self.max_level}")
+        build: np.ndarray = self._builds[self._weapons[weapon], c, spent]
+        return build if build.any() else None
+
+    def get_builds(self, weapon: str, class_name: str) -> np.ndarray:
+        """(max_level + 1, skills) view of the builds of every level, infeasible levels are rows of 0s"""
+        return self._builds[self._weapons[weapon], self._classes[class_name]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute the optimal build of every weapon, class and level")
+    parser.add_argument("weapons", help="JSON file holding a list of named weapons")
+    parser.add_argument("path", help="directory the index is written to")
+    parser.add_argument(
+        "--profile", default=None, choices=game_profiles.get_profile_names(), help="game profile name, dark souls by default"
+    )
+    parser.add_argument("--max-level", type=int, default=None, help="greatest number of levels indexed")
+    args = parser.parse_args()
+    with open(args.weapons) as file:
+        weapons: list = json.load(file)
+    build_index(weapons, args.path, args.profile, max_level=args.max_level)
+
+
+if __name__ == "__main__":
+    main()
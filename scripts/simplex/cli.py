@@ -0,0 +1,202 @@
+"""
+Command line entry point solving many damage maximisation problems in one process.
+Problems are read as JSON Lines (one problem.json style object per line) from a file or stdin and
+the answers are streamed out in input order as JSON Lines or CSV as soon as they are solved, over
+a pool of worker processes if asked:
+
+    python cli.py --input problems.jsonl --solver exact --workers 4 > answers.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+import game_profiles
+from damage_optimisation_script_approximation_function import optimise_damage_approximately
+from damage_optimisation_script_iterative_function import optimise_iteratively
+from exact_allocation import InfeasibleBuildException, optimise_exactly
+from objective_fn import get_total_damage_ratings
+from solve_cache import to_python
+
+# builds of the linear programs are floats so they are checked to within this
+_TOLERANCE : float = 1e-6
+
+
+def _get_arguments(problem : dict) -> tuple:
+    return (
+        problem["grades"], problem["requirements"], problem["skills"],
+        problem["base_physical"], problem["base_magical"], problem["levels"],
+    )
+
+
+def _solve_greedy(problem : dict, profile) -> list:
+    # the greedy solver lives alongside the simplex scripts and is only loaded when asked for
+    import damage_maximisation
+    weapon : dict = {
+        "grades": list(problem["grades"]),
+        "requirements": list(problem["requirements"]),
+        "physical_damage": problem["base_physical"],
+        "magic_damage": problem["base_magical"],
+    }
+    return damage_maximisation.maximise_damage(weapon, list(problem["skills"]), problem["levels"], profile=profile)
+
+
+# every solver takes a problem dict and a profile and returns a build
+SOLVERS : dict = {
+    "exact": lambda problem, profile: optimise_exactly(*_get_arguments(problem), profile),
+    "iterative": lambda problem, profile: optimise_iteratively(*_get_arguments(problem), profile),
+    "approximation": lambda problem, profile: optimise_damage_approximately(*_get_arguments(problem), profile),
+    "greedy": _solve_greedy,
+}
+
+
+# the greedy solver charges a whole requirement rather than the points to reach it so its
+# builds don't spend levels + sum(skills), only their bounds are checked
+_UNBUDGETED_SOLVERS : frozenset = frozenset({"greedy"})
+
+
+def _check_build(build : list, problem : dict, profile, spends_levels : bool = True) -> None:
+    """
+    Raises InfeasibleBuildException unless the build meets every requirement and default skill,
+    stays under the skill cap and (if spends_levels) spends exactly the levels given. The simplex
+    solvers return whatever their tableau holds when the program is infeasible so their builds
+    must be checked.
+    """
+    points : np.ndarray = np.asarray(build, dtype=float)
+    lower_bounds : np.ndarray = np.maximum(problem["requirements"], problem["skills"])
+    total : float = problem["levels"] + float(np.sum(problem["skills"]))
+    if (
+        np.any(points < lower_bounds - _TOLERANCE)
+        or np.any(points > profile.max_skill + _TOLERANCE)
+        or (spends_levels and abs(points.sum() - total) > _TOLERANCE)
+    ):
+        raise InfeasibleBuildException("Build is not feasible!")
+
+
+def solve_problem(problem : dict, solver : str = "exact", profile=None) -> dict:
+    """
+    Solves one problem, returns its build and the attack rating of the build.
+    Raises InfeasibleBuildException if the solver finds no feasible build.
+    """
+    profile = game_profiles.get_profile(profile)
+    build : list = to_python(SOLVERS[solver](problem, profile))
+    _check_build(build, problem, profile, solver not in _UNBUDGETED_SOLVERS)
+    attack_rating : float = get_total_damage_ratings(
+        np.array(build, dtype=float), problem["grades"],
+        [problem["base_physical"], problem["base_magical"]], profile=profile
+    )[0]
+    return {"build": build, "attack_rating": float(attack_rating)}
+
+
+def _solve_chunk(solver : str, profile, lines : list) -> list:
+    """
+    Solves a chunk of (index, line) pairs, lines which can't be parsed or solved get a record
+    holding the error instead of a build
+    """
+    records : list = []
+    for index, line in lines:
+        record : dict = {"index": index}
+        try:
+            problem : dict = json.loads(line)
+            if "id" in problem:
+                record["id"] = problem["id"]
+            record.update(solve_problem(problem, solver, profile))
+        except Exception as exception:
+            record["error"] = f"{type(exception).__name__}: {exception}"
+        records.append(record)
+    return records
+
+
+class _CsvWriter:
+    """Writes records as CSV rows, one column per skill of the build"""
+
+    def __init__(self, file, profile) -> None:
+        self._skill_names : tuple = game_profiles.get_profile(profile).skill_names
+        self._writer = csv.writer(file)
+        self._writer.writerow(["index", "id", *self._skill_names, "attack_rating", "error"])
+
+    def write(self, record : dict) -> None:
+        build : list = record.get("build", [""] * len(self._skill_names))
+        self._writer.writerow([
+            record["index"], record.get("id", ""), *build, record.get("attack_rating", ""), record.get("error", "")
+        ])
+
+
+class _JsonLinesWriter:
+    def __init__(self, file) -> None:
+        self._file = file
+
+    def write(self, record : dict) -> None:
+        self._file.write(json.dumps(record) + "\n")
+
+
+def run_batch(
+    lines, output, solver : str = "exact", profile=None, workers : int = 1,
+    output_format : str = "jsonl", chunk_size : int = 64
+) -> int:
+    """
+    Solves every non blank line of lines (an iterable of JSON strings) and writes one record per
+    problem to the output file in input order, flushing after every chunk so answers stream out.
+    Lines are read lazily and at most 2 chunks per worker are in flight at once.
+    Returns the number of problems answered.
+    """
+    profile = game_profiles.get_profile(profile)
+    writer = _CsvWriter(output, profile) if output_format == "csv" else _JsonLinesWriter(output)
+    problems = ((index, line) for index, line in enumerate(lines) if line.strip())
+    count : int = 0
+
+    def write(records : list) -> None:
+        nonlocal count
+        for record in records:
+            writer.write(record)
+        count += len(records)
+        output.flush()
+
+    if workers <= 1:
+        while chunk := list(islice(problems, chunk_size)):
+            write(_solve_chunk(solver, profile, chunk))
+        return count
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending : deque = deque()
+        while True:
+            while len(pending) < 2 * workers and (chunk := list(islice(problems, chunk_size))):
+                pending.append(executor.submit(_solve_chunk, solver, profile, chunk))
+            if not pending:
+                break
+            # chunks are written in the order they were submitted
+            write(pending.popleft().result())
+    return count
+
+
+def main(arguments : list = None) -> None:
+    parser = argparse.ArgumentParser(description="Solve damage maximisation problems read as JSON Lines")
+    parser.add_argument("--input", default="-", help="JSON Lines file of problems, - for stdin")
+    parser.add_argument("--output", default="-", help="file the answers are written to, - for stdout")
+    parser.add_argument("--solver", choices=list(SOLVERS), default="exact", help="solver used for every problem")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="format of the answers")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, 1 solves in this process")
+    parser.add_argument("--chunk-size", type=int, default=64, help="problems sent to a worker at a time")
+    parser.add_argument(
+        "--profile", default=None, choices=game_profiles.get_profile_names(), help="game profile name, dark souls by default"
+    )
+    args = parser.parse_args(arguments)
+    source = sys.stdin if args.input == "-" else open(args.input)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        run_batch(source, output, args.solver, args.profile, args.workers, args.format, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    # run as a script the greedy solver is found alongside the simplex scripts
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "non_simplex"))
+    main()
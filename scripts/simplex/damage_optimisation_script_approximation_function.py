@@ -1,27 +1,36 @@
-from two_phase_simplex import TwoPhaseSimplex
+from two_phase_simplex import TwoPhaseSimplex, RevisedTwoPhaseSimplex, BatchedTwoPhaseSimplex
 import numpy as np
+import game_profiles
+from solve_cache import get_problem_key
 
-def _get_scales_list(scalings : list[str]) -> list[float]:
+def _get_scales_list(scalings : list[str], profile = None) -> list[float]:
     """Gets the list of float damage scales for the weapon given"""
     scalings_copy = []
     # translate scalings to floats
-    scaling_dict = {"S" : 1.7, "A" : 1.195, "B" : 0.87, "C": 0.62, "D" : 0.37, "E" : 0.125, "F" : 0}
+    scaling_dict = game_profiles.get_profile(profile).grade_multipliers
     for letter_scale in scalings:
         scalings_copy.append(scaling_dict[letter_scale])
     return scalings_copy
 
 
-def optimise_damage_approximately(grades, requirements, skills, base_physical, base_magical, level):
+def optimise_damage_approximately(grades, requirements, skills, base_physical, base_magical, level, profile = None, cache = None, revised = False):
+    """
+    revised solves the linear program with RevisedTwoPhaseSimplex, which reaches the true minimum
+    of the program, rather than TwoPhaseSimplex so the builds found can differ.
+    """
+    profile = game_profiles.get_profile(profile)
+    # problems solved before (up to scaling the base damages) are looked up in the SolveCache
+    if cache is not None:
+        key = get_problem_key("approximation", grades, requirements, skills, (base_physical, base_magical), level, profile, ("revised",) if revised else ())
+        return cache.get_or_solve(key, lambda: optimise_damage_approximately(grades, requirements, skills, base_physical, base_magical, level, profile, revised=revised))
     # cost vector for objective function
-    scalings_floats = _get_scales_list(grades)
-    cost_vector = [-0.612, -0.612, -0.642, -0.642, 0, 0, 0, 0, 0, 0, 0, 0]
+    scalings_floats = _get_scales_list(grades, profile)
+    cost_vector = [-float(cost) for cost in profile.approximation_costs] + [0 for i in range(8)]
 
     # multiply correctly according to mathematical formulation
+    weapon = (base_physical, base_magical)
     for i, scalar in enumerate(scalings_floats):
-        if i < 2:
-            cost_vector[i] *= scalar * base_physical
-        else:
-            cost_vector[i] *= scalar * base_magical
+        cost_vector[i] *= scalar * weapon[profile.damage_types[i]]
 
     # now the cost_vector is fully constructed
 
@@ -37,7 +46,7 @@ def optimise_damage_approximately(grades, requirements, skills, base_physical, b
         row_i[i] = 1
         row_i[i+4] = 1
         constraint_matrix.append(row_i)
-        constraint_vector.append(99)
+        constraint_vector.append(profile.max_skill)
 
     #constraint 2:
     for i in range(4):
@@ -54,8 +63,54 @@ def optimise_damage_approximately(grades, requirements, skills, base_physical, b
     constraint_vector.append(level + sum(skills))
 
 
-    problem_solver = TwoPhaseSimplex(constraint_matrix, constraint_vector, cost_vector)
+    solver_class = RevisedTwoPhaseSimplex if revised else TwoPhaseSimplex
+    problem_solver = solver_class(constraint_matrix, constraint_vector, cost_vector)
 
     problem_solver.solve_program()
 
     return problem_solver.get_solution()
+
+
+def _get_constraints_batch(requirements, skills, level, profile = None):
+    """
+    Builds the constraint matrix shared by every problem and the (K, 9) right hand sides
+    of K problems, these are the same three constraint sets as a single problem.
+    """
+    constraint_matrix = np.zeros((9, 4*3))
+    constraint_matrix[0:4, 0:4] = np.identity(4)
+    constraint_matrix[0:4, 4:8] = np.identity(4)
+    constraint_matrix[4:8, 0:4] = np.identity(4)
+    constraint_matrix[4:8, 8:12] = -np.identity(4)
+    constraint_matrix[8, 0:4] = 1
+    skills = np.array(skills, ndmin=2)
+    constraint_vectors = np.empty((len(skills), 9))
+    constraint_vectors[:, 0:4] = game_profiles.get_profile(profile).max_skill
+    constraint_vectors[:, 4:8] = np.maximum(requirements, skills)
+    constraint_vectors[:, 8] = level + skills.sum(axis=1)
+    return constraint_matrix, constraint_vectors
+
+
+def _get_weights_batch(grades, base_physical, base_magical, profile):
+    """
+    Gets the (K, 4) float scales of K weapons and the (K, 4) multipliers of their skills
+    """
+    scalings_floats = np.array([_get_scales_list(row, profile) for row in np.array(grades, ndmin=2)])
+    weapons = np.stack(np.broadcast_arrays(np.ravel(base_physical), np.ravel(base_magical)), axis=-1)
+    return scalings_floats, profile.get_weights(scalings_floats, weapons)
+
+
+def optimise_damage_approximately_batch(grades, requirements, skills, base_physical, base_magical, level, profile = None):
+    """
+    Solves K problems through one batched simplex, every argument is the batch of the
+    respective argument of optimise_damage_approximately.
+    Returns the (K, 4) array of solutions, rows of infeasible problems are 0.
+    """
+    profile = game_profiles.get_profile(profile)
+    scalings_floats, weights = _get_weights_batch(grades, base_physical, base_magical, profile)
+    cost_vectors = np.zeros((len(scalings_floats), 4*3))
+    cost_vectors[:, 0:4] = -profile.approximation_costs
+    cost_vectors[:, 0:4] *= weights
+    constraint_matrix, constraint_vectors = _get_constraints_batch(requirements, skills, level, profile)
+    problem_solver = BatchedTwoPhaseSimplex(constraint_matrix, constraint_vectors, cost_vectors)
+    problem_solver.solve_programs()
+    return problem_solver.get_solutions()
@@ -1,5 +1,6 @@
 from two_phase_simplex import LinearPieceWiseTwoPhaseSimplex
 import numpy as np
+import game_profiles
 
 def _get_scales_list(scalings : list[str]) -> list[float]:
     """Gets the list of float damage scales for the weapon given"""
@@ -11,93 +12,81 @@ def _get_scales_list(scalings : list[str]) -> list[float]:
     return scalings_copy
 
 def _get_cost_vector(skill_vector : list[float]) -> list[float]:
-    skill_vector_copy = skill_vector.copy()
+    skill_vector_copy = np.array(skill_vector, dtype=float)
     print(skill_vector_copy)
-    for i in range(4):
-        # physical skills
+    # physical skills
+    skill_vector_copy[0:2] *= game_profiles.DARK_SOULS.rating_curves[0].slope_at(skill_vector_copy[0:2])
+    # magical skills
+    skill_vector_copy[2:4] *= game_profiles.DARK_SOULS.rating_curves[1].slope_at(skill_vector_copy[2:4])
+    return list(skill_vector_copy) + [0 for i in range(8)]
+
+def main():
+    """Reads a problem through prompts and prints the LinearPieceWiseTwoPhaseSimplex solution"""
+    # input weapon details
+    grades : list[str]= [input(f"Input grade for skill {1+i}: ").upper() for i in range(4)]
+    requirements : list[int] = [int(input(f"Input requirement for skill {i+1}: ")) for i in range(4)]
+
+    # input default class skills
+    skills : list[float] = [int(input(f"Input default skill level {1 + i}: ")) for i in range(4)]
+
+    #input base phy + magic damage 
+    base_physical : int = int(input(f"Input base physical damage of weapon: "))
+    base_magical : int = int(input(f"Input base magical damage of weapon: "))
+
+    # levels to optimize with
+    level : int = int(input(f"Input number of skill points to input: "))
+
+    # cost vector for objective function
+    scalings_floats = _get_scales_list(grades)
+    cost_vector : list[float] = [1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0]
+
+    # find the correct piece-wise section of damage rating functions
+    cost_vector = _get_cost_vector(skills)
+
+    # multiply correctly according to mathematical formulation
+    for i, scalar in enumerate(scalings_floats):
         if i < 2:
-            if skill_vector_copy[i] <= 10:
-                skill_vector_copy[i]*=0.005
-            elif skill_vector_copy[i] <= 20:
-                skill_vector_copy[i] *= 0.035
-            elif skill_vector_copy[i] <= 40:
-                skill_vector_copy[i] *= 0.0225
-            else:
-                skill_vector_copy[i] *= 0.0025
-        # magical skills
+            cost_vector[i] *= scalar * base_physical
+        elif i < 4:
+            cost_vector[i] *= scalar * base_magical
         else:
-            if skill_vector_copy[i] <= 10:
-                skill_vector_copy[i]*=0.005
-            elif skill_vector_copy[i] <= 30:
-                skill_vector_copy[i] *= 0.0225
-            elif skill_vector_copy[i] <= 50:
-                skill_vector_copy[i] *= 0.015
-            else:
-                skill_vector_copy[i] *= 0.0041
-    return skill_vector_copy + [0 for i in range(8)]
-
-# input weapon details
-grades : list[str]= [input(f"Input grade for skill {1+i}: ").upper() for i in range(4)]
-requirements : list[int] = [int(input(f"Input requirement for skill {i+1}: ")) for i in range(4)]
-
-# input default class skills
-skills : list[float] = [int(input(f"Input default skill level {1 + i}: ")) for i in range(4)]
-
-#input base phy + magic damage 
-base_physical : int = int(input(f"Input base physical damage of weapon: "))
-base_magical : int = int(input(f"Input base magical damage of weapon: "))
-
-# levels to optimize with
-level : int = int(input(f"Input number of skill points to input: "))
-
-# cost vector for objective function
-scalings_floats = _get_scales_list(grades)
-cost_vector : list[float] = [1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0]
-
-# find the correct piece-wise section of damage rating functions
-cost_vector = _get_cost_vector(skills)
-
-# multiply correctly according to mathematical formulation
-for i, scalar in enumerate(scalings_floats):
-    if i < 2:
-        cost_vector[i] *= scalar * base_physical
-    elif i < 4:
-        cost_vector[i] *= scalar * base_magical
-    else:
-        break
-# now the cost_vector is fully constructed
-
-# matrix representing constraints
-# vector encoding RHS of constraints
-constraint_matrix = []
-constraint_vector : list[int] = []
-
-# construct constraints
-# constraint set 1:
-for i in range(4):
-    row_i = np.zeros(4*3)
-    row_i[i] = 1
-    row_i[i+4] = 1
-    constraint_matrix.append(row_i)
-    constraint_vector.append(99)
+            break
+    # now the cost_vector is fully constructed
+
+    # matrix representing constraints
+    # vector encoding RHS of constraints
+    constraint_matrix = []
+    constraint_vector : list[int] = []
+
+    # construct constraints
+    # constraint set 1:
+    for i in range(4):
+        row_i = np.zeros(4*3)
+        row_i[i] = 1
+        row_i[i+4] = 1
+        constraint_matrix.append(row_i)
+        constraint_vector.append(99)
+
+    #constraint set 2:
+    for i in range(4):
+        row_i = np.zeros(4*3)
+        row_i[i] = 1
+        row_i[i+4*2] = -1
+        constraint_matrix.append(row_i)
+        constraint_vector.append(max(requirements[i], int(skills[i])))
 
-#constraint set 2:
-for i in range(4):
+    # constraint 3:
     row_i = np.zeros(4*3)
-    row_i[i] = 1
-    row_i[i+4*2] = -1
+    row_i[0:4] = 1
     constraint_matrix.append(row_i)
-    constraint_vector.append(max(requirements[i], int(skills[i])))
+    constraint_vector.append(level + int(sum(skills)))
 
-# constraint 3:
-row_i = np.zeros(4*3)
-row_i[0:4] = 1
-constraint_matrix.append(row_i)
-constraint_vector.append(level + int(sum(skills)))
+    problem_solver = LinearPieceWiseTwoPhaseSimplex(constraint_matrix, constraint_vector, cost_vector, scalings_floats, base_physical, base_magical)
 
-problem_solver = LinearPieceWiseTwoPhaseSimplex(constraint_matrix, constraint_vector, cost_vector, scalings_floats, base_physical, base_magical)
+    problem_solver.solve_program()
 
-problem_solver.solve_program()
+    print(problem_solver.get_solution())
 
-print(problem_solver.get_solution())
 
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,32 @@
-from two_phase_simplex import LinearPieceWiseTwoPhaseSimplex
+from two_phase_simplex import LinearPieceWiseTwoPhaseSimplex, BatchedLinearPieceWiseTwoPhaseSimplex
+from damage_optimisation_script_approximation_function import _get_constraints_batch, _get_scales_list, _get_weights_batch
 import numpy as np
+import game_profiles
+from solve_cache import get_problem_key
 
-def _get_scales_list(scalings : list[str]) -> list[float]:
-    """Gets the list of float damage scales for the weapon given"""
-    scalings_copy = []
-    # translate scalings to floats
-    scaling_dict = {"S" : 1.7, "A" : 1.195, "B" : 0.87, "C": 0.62, "D" : 0.37, "E" : 0.125, "F" : 0}
-    for letter_scale in scalings:
-        scalings_copy.append(scaling_dict[letter_scale])
-    return scalings_copy
+def _get_cost_vector(skill_vector : list[float], profile = None) -> list[float]:
+    skill_vector_copy = np.array(skill_vector, dtype=float)
+    # slope of the piece every skill lies on
+    skill_vector_copy *= game_profiles.get_profile(profile).get_lp_slopes(skill_vector_copy)
+    return list(skill_vector_copy) + [0 for i in range(8)]
 
-def _get_cost_vector(skill_vector : list[float]) -> list[float]:
-    skill_vector_copy = skill_vector.copy()
-    for i in range(4):
-        # physical skills
-        if i < 2:
-            if skill_vector_copy[i] <= 10:
-                skill_vector_copy[i]*=0.05
-            elif skill_vector_copy[i] <= 20:
-                skill_vector_copy[i] *= 0.025
-            elif skill_vector_copy[i] <= 40:
-                skill_vector_copy[i] *= 0.00625
-            else:
-                skill_vector_copy[i] *= 0.125/59
-        # magical skills
-        else:
-            if skill_vector_copy[i] <= 10:
-                skill_vector_copy[i]*=0.005
-            elif skill_vector_copy[i] <= 30:
-                skill_vector_copy[i] *= 0.0125
-            elif skill_vector_copy[i] <= 50:
-                skill_vector_copy[i] *= 0.00625
-            else:
-                skill_vector_copy[i] *= 0.125/49
-    return skill_vector_copy + [0 for i in range(8)]
-
-def optimise_iteratively(grades, requirements, skills, base_physical, base_magical, level):
-    scalings_floats = _get_scales_list(grades)
+def optimise_iteratively(grades, requirements, skills, base_physical, base_magical, level, profile = None, cache = None):
+    profile = game_profiles.get_profile(profile)
+    # problems solved before (up to scaling the base damages) are looked up in the SolveCache
+    if cache is not None:
+        key = get_problem_key("iterative", grades, requirements, skills, (base_physical, base_magical), level, profile)
+        return cache.get_or_solve(key, lambda: optimise_iteratively(grades, requirements, skills, base_physical, base_magical, level, profile))
+    scalings_floats = _get_scales_list(grades, profile)
 
     cost_vector : list[float] = [-1, -1, -1, -1, 0, 0, 0, 0, 0, 0, 0, 0]
 
     # find the correct piece-wise section of damage rating functions
-    cost_vector = _get_cost_vector(skills)
+    cost_vector = _get_cost_vector(skills, profile)
 
     # multiply correctly according to mathematical formulation
+    weapon = (base_physical, base_magical)
     for i, scalar in enumerate(scalings_floats):
-        if i < 2:
-            cost_vector[i] *= scalar * base_physical
-        elif i < 4:
-            cost_vector[i] *= scalar * base_magical
-        else:
-            break
+        cost_vector[i] *= scalar * weapon[profile.damage_types[i]]
     # now the cost_vector is fully constructed
 
     # matrix representing constraints
@@ -65,7 +41,7 @@ def optimise_iteratively(grades, requirements, skills, base_physical, base_magic
         row_i[i] = 1
         row_i[i+4] = 1
         constraint_matrix.append(row_i)
-        constraint_vector.append(99)
+        constraint_vector.append(profile.max_skill)
 
     #constraint set 2:
     for i in range(4):
@@ -81,8 +57,28 @@ def optimise_iteratively(grades, requirements, skills, base_physical, base_magic
     constraint_matrix.append(row_i)
     constraint_vector.append(level + int(sum(skills)))
 
-    problem_solver = LinearPieceWiseTwoPhaseSimplex(constraint_matrix, constraint_vector, cost_vector, scalings_floats, base_physical, base_magical)
+    problem_solver = LinearPieceWiseTwoPhaseSimplex(constraint_matrix, constraint_vector, cost_vector, scalings_floats, base_physical, base_magical, profile=profile)
 
     problem_solver.solve_program()
 
     return problem_solver.get_solution()
+
+
+def optimise_iteratively_batch(grades, requirements, skills, base_physical, base_magical, level, profile = None):
+    """
+    Solves K problems through one batched simplex, every argument is the batch of the
+    respective argument of optimise_iteratively.
+    Returns the (K, 4) array of solutions, rows of infeasible problems are 0.
+    """
+    profile = game_profiles.get_profile(profile)
+    scalings_floats, weights = _get_weights_batch(grades, base_physical, base_magical, profile)
+    skills = np.array(skills, ndmin=2)
+    # find the correct piece-wise section of damage rating functions
+    cost_vectors = np.zeros((len(skills), 4*3))
+    cost_vectors[:, 0:4] = skills
+    cost_vectors[:, 0:4] *= profile.get_lp_slopes(skills)
+    cost_vectors[:, 0:4] *= weights
+    constraint_matrix, constraint_vectors = _get_constraints_batch(requirements, skills, level, profile)
+    problem_solver = BatchedLinearPieceWiseTwoPhaseSimplex(constraint_matrix, constraint_vectors, cost_vectors, scalings_floats, base_physical, base_magical, profile)
+    problem_solver.solve_programs()
+    return problem_solver.get_solutions()
@@ -0,0 +1,220 @@
+"""
+This module solves the integer skill allocation problem exactly by dynamic programming.
+The damage of a build is separable per skill once the physical and magic skills are grouped, so the
+optimal build is found by a knapsack over (skill, points spent) in O(skills * levels * 99).
+"""
+
+import numpy as np
+import game_profiles
+from objective_fn import get_total_damage_ratings
+
+
+def _solve_allocation_tables(
+    values: np.ndarray, lower_bounds: np.ndarray, budget: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fills the dynamic programming tables of the allocation problem.
+    best[b] is the greatest value reachable by spending exactly b points over all the skills
+    (-inf when no build spends exactly b points) and choices[i, b] is the number of points the
+    optimum spending b points over skills 0,...,i puts into skill i.
+    """
+    k: int = len(lower_bounds)
+    spend: np.ndarray = np.arange(budget + 1)
+    best: np.ndarray = np.full(budget + 1, -np.inf)
+    best[0] = 0
+    choices: np.ndarray = np.zeros((k, budget + 1), dtype=np.intp)
+    for i in range(k):
+        # value of skill i for every number of points t spent above its lower bound
+        gains: np.ndarray = values[i, lower_bounds[i] :]
+        remaining: np.ndarray = spend[:, None] - np.arange(len(gains))[None, :]
+        # one vectorized row per budget, budgets which can't afford t points are -inf
+        candidates: np.ndarray = np.where(
+            remaining >= 0, best[np.maximum(remaining, 0)], -np.inf
+        ) + gains[None, :]
+        choices[i] = candidates.argmax(axis=1)
+        best = candidates[spend, choices[i]]
+    return best, choices
+
+
+def _backtrack(choices: np.ndarray, lower_bounds: np.ndarray, spent: np.ndarray) -> np.ndarray:
+    """
+    Recovers the optimal builds from the choice table for every budget in spent at once.
+    """
+    spent = np.array(spent, dtype=np.intp)
+    builds: np.ndarray = np.empty(spent.shape + (len(lower_bounds),), dtype=np.intp)
+    for i in reversed(range(len(lower_bounds))):
+        t = choices[i, spent]
+        builds[..., i] = lower_bounds[i] + t
+        spent -= t
+    return builds
+
+
+def allocate(values: np.ndarray, lower_bounds: list, budget: int) -> np.ndarray:
+    """
+    Finds the provably optimal integer build.
+
+    Parameters
+    ==========
+        values - (skills, max_skill + 1) array where values[i, x] is the damage skill i
+            contributes at x
+        lower_bounds - minimum level of every skill (max of requirement and default skill)
+        budget - number of points to spend above the lower bounds
+    Returns
+    =======
+        Array of skill levels maximising the total value, every skill lies between its lower
+        bound and the skill cap and exactly budget points are spent above the lower bounds.
+    """
+    lower_bounds = np.asarray(lower_bounds, dtype=np.intp)
+    values = np.asarray(values, dtype=float)
+    max_skill: int = values.shape[1] - 1
+    capacity: int = int(np.sum(max_skill - lower_bounds))
+    if budget < 0 or np.any(lower_bounds > max_skill) or budget > capacity:
+        raise InfeasibleBuildException("Build is not feasible!")
+    _, choices = _solve_allocation_tables(values, lower_bounds, budget)
+    return _backtrack(choices, lower_bounds, budget)
+
+
+def sweep(values: np.ndarray, lower_bounds: list, max_budget: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the optimal build for every budget 0,...,max_budget from a single pass of the dynamic
+    program, the choice table of the largest budget already holds the optimum of every smaller one.
+    Returns the (max_budget + 1, skills) uint8 array of builds and the (max_budget + 1,) array of
+    their total values, budgets no build can spend exactly have a row of 0s and a value of -inf.
+    """
+    lower_bounds = np.asarray(lower_bounds, dtype=np.intp)
+    values = np.asarray(values, dtype=float)
+    budgets: np.ndarray = np.arange(max(max_budget, -1) + 1)
+    builds: np.ndarray = np.zeros((len(budgets), len(lower_bounds)), dtype=np.uint8)
+    if np.any(lower_bounds > values.shape[1] - 1):
+        return builds, np.full(len(budgets), -np.inf)
+    best, choices = _solve_allocation_tables(values, lower_bounds, len(budgets) - 1)
+    feasible: np.ndarray = best > -np.inf
+    builds[feasible] = _backtrack(choices, lower_bounds, budgets[feasible])
+    return builds, best
+
+
+def _solve_allocation_tables_batch(
+    values: np.ndarray, lower_bounds: np.ndarray, budget: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    _solve_allocation_tables for K problems at once, values is (K, skills, max_skill + 1) and
+    lower_bounds is (K, skills). Every problem is filled up to the same budget so best is
+    (K, budget + 1) and choices is (K, skills, budget + 1), each row matching the single table.
+    """
+    k, skills, width = values.shape
+    spend: np.ndarray = np.arange(budget + 1)
+    points: np.ndarray = np.arange(width)
+    best: np.ndarray = np.full((k, budget + 1), -np.inf)
+    best[:, 0] = 0
+    choices: np.ndarray = np.zeros((k, skills, budget + 1), dtype=np.intp)
+    remaining: np.ndarray = spend[:, None] - points[None, :]
+    affordable: np.ndarray = remaining >= 0
+    remaining = np.maximum(remaining, 0)
+    for i in range(skills):
+        # gains past the skill cap are -inf so the lower bounds of the problems can differ
+        levels: np.ndarray = lower_bounds[:, i, None] + points[None, :]
+        gains: np.ndarray = np.where(
+            levels < width, np.take_along_axis(values[:, i], np.minimum(levels, width - 1), axis=1), -np.inf
+        )
+        candidates: np.ndarray = np.where(affordable, best[:, remaining], -np.inf) + gains[:, None, :]
+        choices[:, i] = candidates.argmax(axis=2)
+        best = np.take_along_axis(candidates, choices[:, i, :, None], axis=2)[..., 0]
+    return best, choices
+
+
+def allocate_batch(
+    values: np.ndarray, lower_bounds: np.ndarray, budgets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solves K allocation problems in one vectorized dynamic program, row k is the problem
+    allocate(values[k], lower_bounds[k], budgets[k]).
+    Returns the (K, skills) array of builds and the (K,) array of their total values, problems
+    without a feasible build have a row of 0s and a value of -inf.
+    """
+    values = np.asarray(values, dtype=float)
+    lower_bounds = np.asarray(lower_bounds, dtype=np.intp)
+    budgets = np.asarray(budgets, dtype=np.intp)
+    max_skill: int = values.shape[2] - 1
+    capacities: np.ndarray = np.sum(max_skill - lower_bounds, axis=1)
+    feasible: np.ndarray = (budgets >= 0) & (budgets <= capacities) & np.all(lower_bounds <= max_skill, axis=1)
+    builds: np.ndarray = np.zeros(lower_bounds.shape, dtype=np.intp)
+    totals: np.ndarray = np.full(len(budgets), -np.inf)
+    if not feasible.any():
+        return builds, totals
+    best, choices = _solve_allocation_tables_batch(
+        values[feasible], lower_bounds[feasible], int(budgets[feasible].max())
+    )
+    rows: np.ndarray = np.arange(len(best))
+    spent: np.ndarray = budgets[feasible].copy()
+    totals[feasible] = best[rows, spent]
+    for i in reversed(range(lower_bounds.shape[1])):
+        t: np.ndarray = choices[rows, i, spent]
+        builds[feasible, i] = lower_bounds[feasible, i] + t
+        spent -= t
+    return builds, totals
+
+
+def get_attack_rating_values(
+    grades: list, base_physical: float, base_magical: float, profile=None
+) -> np.ndarray:
+    """
+    Gets the (skills, max_skill + 1) table of the attack rating every skill contributes at every
+    level, the total attack rating of a build is base_physical + base_magical plus one entry per skill.
+    """
+    profile = game_profiles.get_profile(profile)
+    weights: np.ndarray = profile.get_weights(profile.get_scales(grades), [base_physical, base_magical])
+    return weights[:, None] * profile.rating
+
+
+def _get_lower_bounds(requirements: list, skills: list) -> tuple[np.ndarray, int]:
+    """
+    Gets the lower bound of every skill and the number of levels it takes to meet them
+    """
+    lower_bounds: np.ndarray = np.maximum(requirements, skills).astype(np.intp)
+    return lower_bounds, int(lower_bounds.sum() - np.sum(skills))
+
+
+def optimise_exactly(
+    grades, requirements, skills, base_physical, base_magical, level, profile=None
+) -> list:
+    """
+    Finds the build with the greatest attack rating under the same constraints as the linear
+    programs (max(requirement, skill) <= x <= 99 and sum(x) = level + sum(skills)).
+    """
+    lower_bounds, shortfall = _get_lower_bounds(requirements, skills)
+    values: np.ndarray = get_attack_rating_values(grades, base_physical, base_magical, profile)
+    return [int(x) for x in allocate(values, lower_bounds, level - shortfall)]
+
+
+def sweep_levels(
+    grades, requirements, skills, base_physical, base_magical, max_level, profile=None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the optimal build for every level 0,...,max_level in one pass, row l holds what
+    optimise_exactly would return for level l.
+    Returns the (max_level + 1, skills) uint8 array of builds and the (max_level + 1,) array of
+    their attack ratings, levels without a feasible build have a row of 0s and an attack rating of nan.
+    """
+    lower_bounds, shortfall = _get_lower_bounds(requirements, skills)
+    values: np.ndarray = get_attack_rating_values(grades, base_physical, base_magical, profile)
+    builds: np.ndarray = np.zeros((max_level + 1, len(lower_bounds)), dtype=np.uint8)
+    damages: np.ndarray = np.full(max_level + 1, np.nan)
+    if max_level < shortfall:
+        return builds, damages
+    spent_builds, best = sweep(values, lower_bounds, max_level - shortfall)
+    feasible: np.ndarray = best > -np.inf
+    builds[shortfall:] = spent_builds
+    damages[shortfall:][feasible] = get_total_damage_ratings(
+        spent_builds[feasible], grades, [base_physical, base_magical], profile=profile
+    )
+    return builds, damages
+
+
+class InfeasibleBuildException(Exception):
+    """
+    Exception which is raised when no build meets the weapon requirements
+    and the skill cap with the number of levels given.
+    """
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
@@ -0,0 +1,254 @@
+"""
+This module holds the registry of game profiles, the data which describes the damage model of a game
+(its skills, their rating curves, soft caps, grade multipliers and the skill cap).
+Every profile is compiled into (skills, max_skill + 1) lookup arrays once when it is built so
+any number of games can be solved side by side by passing their profile to the solvers.
+"""
+
+import numpy as np
+import rating_tables
+from rating_tables import CurveTable
+
+
+class GameProfile:
+    """
+    The damage model of a single game, skills belong to a damage type (physical or magic) which
+    decides the rating curve and soft caps they follow and the base damage they scale.
+
+    Parameters
+    ==========
+        name - key the profile is registered under
+        skill_names - names of the skills in the order builds list them
+        damage_types - index into damage_names of every skill
+        grade_multipliers - float damage scale of every letter grade
+        soft_caps - soft cap locations of every damage type
+        rating_segments - breakpoint tables of the attack rating of every damage type,
+            None derives them from the soft caps and saturates them past the last cap
+        lp_segments - breakpoint tables whose slopes build the simplex cost vectors,
+            None derives them from the soft caps
+        approximation_costs - cost of every damage type in the linear approximation
+        damage_names - names of the damage types, weapons store them as <name>_damage
+        max_skill - level cap of every skill
+        starting_classes - starting skills of every class of the game, keyed by class name
+    """
+
+    def __init__(
+        self,
+        name: str,
+        skill_names: tuple,
+        damage_types: tuple,
+        grade_multipliers: dict,
+        soft_caps: tuple,
+        rating_segments: tuple = None,
+        lp_segments: tuple = None,
+        approximation_costs: tuple = (0.612, 0.642),
+        damage_names: tuple = ("physical", "magic"),
+        max_skill: int = rating_tables.MAX_SKILL,
+        starting_classes: dict = None,
+    ) -> None:
+        self.name: str = name
+        self.skill_names: tuple = tuple(skill_names)
+        self.stat_count: int = len(self.skill_names)
+        self.damage_names: tuple = tuple(damage_names)
+        self.damage_types: np.ndarray = rating_tables.freeze(np.array(damage_types, dtype=np.intp))
+        self.max_skill: int = max_skill
+        self.starting_classes: dict = {name: tuple(skills) for name, skills in (starting_classes or {}).items()}
+        self.grade_multipliers: dict = dict(grade_multipliers)
+        self.soft_caps: tuple = tuple(tuple(caps) for caps in soft_caps)
+        if rating_segments is None:
+            rating_segments = [
+                rating_tables.segments_from_soft_caps(caps, saturate=True) for caps in soft_caps
+            ]
+        if lp_segments is None:
+            lp_segments = [rating_tables.segments_from_soft_caps(caps) for caps in soft_caps]
+        self.rating_segments: tuple = tuple(np.asarray(segments, dtype=float) for segments in rating_segments)
+        # one curve per damage type
+        self.rating_curves: tuple = tuple(
+            CurveTable.from_segments(segments, max_skill) for segments in self.rating_segments
+        )
+        self.lp_curves: tuple = tuple(
+            CurveTable.from_segments(np.asarray(segments, dtype=float), max_skill)
+            for segments in lp_segments
+        )
+        self.soft_cap_curves: tuple = tuple(
+            CurveTable.from_soft_caps(caps, max_skill) for caps in self.soft_caps
+        )
+        # one row per skill so a whole build is looked up with a single fancy index
+        self.rating: np.ndarray = self._stack([curve.rating for curve in self.rating_curves])
+        self.lp_slope: np.ndarray = self._stack([curve.slope for curve in self.lp_curves])
+        self.soft_cap_rating: np.ndarray = self._stack([curve.rating for curve in self.soft_cap_curves])
+        self.soft_cap_gain: np.ndarray = self._stack([curve.gain for curve in self.soft_cap_curves])
+        self.soft_cap_segment_end: np.ndarray = rating_tables.freeze(self._get_segment_ends(self.soft_cap_gain))
+        self.approximation_costs: np.ndarray = rating_tables.freeze(
+            np.asarray(approximation_costs, dtype=float)[self.damage_types]
+        )
+        # letters sorted so whole arrays of grades translate with a single np.searchsorted
+        letters: list = sorted(self.grade_multipliers)
+        self._grade_letters: np.ndarray = np.array(letters)
+        self._grade_scales: np.ndarray = np.array([self.grade_multipliers[letter] for letter in letters])
+        self._skills: np.ndarray = np.arange(self.stat_count)
+
+    def _stack(self, tables: list) -> np.ndarray:
+        """Stacks the tables of every damage type into the read only table of every skill"""
+        return rating_tables.freeze(np.array(tables)[self.damage_types])
+
+    def _get_segment_ends(self, tables: np.ndarray) -> np.ndarray:
+        """
+        Gets the first level above x at which every table changes value, levels whose value
+        doesn't change again before the skill cap end at the skill cap.
+        """
+        ends: np.ndarray = np.full(tables.shape, self.max_skill, dtype=np.intp)
+        for x in range(self.max_skill - 2, -1, -1):
+            ends[:, x] = np.where(tables[:, x + 1] != tables[:, x], x + 1, ends[:, x + 1])
+        return ends
+
+    def get_scales(self, grades: np.ndarray) -> np.ndarray:
+        """
+        Gets the float damage scales for an array of letter grades of any shape,
+        float scales are returned as they are.
+        """
+        grades = np.asarray(grades)
+        if grades.dtype.kind in "biuf":
+            return grades.astype(float)
+        return self._grade_scales[np.searchsorted(self._grade_letters, grades)]
+
+    def get_ratings(self, points: np.ndarray) -> np.ndarray:
+        """
+        Gets the attack ratings of an array of skill points whose last axis indexes the skills,
+        integer skill levels are a table lookup and anything else (two handing) is evaluated.
+        """
+        points = np.asarray(points)
+        if points.dtype.kind in "iu":
+            if points.min(initial=0) >= 0 and points.max(initial=0) <= self.max_skill:
+                return self.rating[self._skills, points]
+        points = points.astype(float)
+        ratings = np.empty_like(points)
+        for damage_type, segments in enumerate(self.rating_segments):
+            skills = self.damage_types == damage_type
+            ratings[..., skills] = rating_tables.evaluate_segments(points[..., skills], segments)
+        return ratings
+
+    def get_lp_slopes(self, points: np.ndarray) -> np.ndarray:
+        """
+        Slopes of the linear approximation at real valued skill levels, the last axis of points
+        indexes the skills.
+        """
+        levels = np.clip(np.ceil(points), 0, self.max_skill).astype(int)
+        return self.lp_slope[self._skills, levels]
+
+    def get_weights(self, scalings: np.ndarray, weapon: np.ndarray) -> np.ndarray:
+        """
+        Gets the multiplier of every skill, its float scale times the base damage of its damage
+        type, for (..., skills) scalings and (..., damage types) weapons.
+        """
+        return scalings * np.asarray(weapon, dtype=float)[..., self.damage_types]
+
+
+class UnknownProfileException(Exception):
+    """
+    Exception which is raised when no game profile is registered under the name given.
+    """
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+_PROFILES: dict = {}
+
+
+def register_profile(profile: GameProfile) -> GameProfile:
+    """Registers a profile under its name, replacing any profile already registered there"""
+    _PROFILES[profile.name] = profile
+    return profile
+
+
+def get_profile(profile=None) -> GameProfile:
+    """
+    Gets a profile from its name, profiles are returned as they are and None gives Dark Souls
+    """
+    if profile is None:
+        return DARK_SOULS
+    if isinstance(profile, GameProfile):
+        return profile
+    if profile not in _PROFILES:
+        raise UnknownProfileException(f"No game profile named {profile}!")
+    return _PROFILES[profile]
+
+
+def get_profile_names() -> list:
+    """Names of every registered profile"""
+    return list(_PROFILES)
+
+
+# letter grades translated to their float damage scale
+GRADE_MULTIPLIERS: dict = {"S" : 1.7, "A" : 1.195, "B" : 0.87, "C": 0.62, "D" : 0.37, "E" : 0.125, "F" : 0}
+
+# attack rating functions of Dark Souls, the last bound is the largest float below 99 so that it
+# behaves as the strict x < 99 check and anything past it is fully rated (1)
+DS1_PHYSICAL_SEGMENTS: np.ndarray = np.array([
+    # bound, intercept, slope, offset
+    [10, 0, 0.005, 0],
+    [20, 0.05, 0.035, 10],
+    [50, 0.4, 0.0225, 20],
+    [np.nextafter(99, 0), 0.85, 0.0025, 40],
+    [np.inf, 1, 0, 0],
+])
+DS1_MAGIC_SEGMENTS: np.ndarray = np.array([
+    [10, 0, 0.005, 0],
+    [30, 0.05, 0.0225, 10],
+    [50, 0.5, 0.015, 30],
+    [np.nextafter(99, 0), 0.8, 0.0041, 50],
+    [np.inf, 1, 0, 0],
+])
+
+# soft cap locations of the base 2 "logarithmic-like" curves used by the incremental algorithm
+DS1_PHYSICAL_SOFT_CAPS: tuple = (1, 10, 20, 40, 99)
+DS1_MAGIC_SOFT_CAPS: tuple = (1, 10, 30, 50, 99)
+ER_PHYSICAL_SOFT_CAPS: tuple = (1, 60, 80, 99)
+ER_MAGIC_SOFT_CAPS: tuple = (1, 50, 60, 80, 99)
+
+# starting strength, dexterity, intelligence and faith of every class
+DS1_STARTING_CLASSES: dict = {
+    "warrior": (13, 13, 9, 11),
+    "knight": (11, 11, 9, 11),
+    "wanderer": (10, 14, 11, 8),
+    "thief": (9, 15, 12, 11),
+    "bandit": (14, 9, 8, 10),
+    "hunter": (12, 14, 9, 9),
+    "sorcerer": (9, 11, 15, 8),
+    "pyromancer": (12, 9, 10, 8),
+    "cleric": (12, 8, 7, 16),
+    "deprived": (11, 11, 11, 11),
+}
+ER_STARTING_CLASSES: dict = {
+    "vagabond": (14, 13, 9, 9),
+    "warrior": (10, 16, 10, 8),
+    "hero": (16, 9, 7, 8),
+    "bandit": (9, 13, 9, 8),
+    "astrologer": (8, 12, 16, 7),
+    "prophet": (11, 10, 7, 16),
+    "samurai": (12, 15, 9, 8),
+    "prisoner": (11, 14, 14, 6),
+    "confessor": (12, 12, 9, 14),
+    "wretch": (10, 10, 10, 10),
+}
+
+DARK_SOULS: GameProfile = register_profile(GameProfile(
+    "dark_souls",
+    ("strength", "dexterity", "intelligence", "faith"),
+    (0, 0, 1, 1),
+    GRADE_MULTIPLIERS,
+    (DS1_PHYSICAL_SOFT_CAPS, DS1_MAGIC_SOFT_CAPS),
+    rating_segments=(DS1_PHYSICAL_SEGMENTS, DS1_MAGIC_SEGMENTS),
+    starting_classes=DS1_STARTING_CLASSES,
+))
+
+# the attack rating of Elden Ring isn't tabulated so it follows the linear approximation of its soft caps
+ELDEN_RING: GameProfile = register_profile(GameProfile(
+    "elden_ring",
+    ("strength", "dexterity", "intelligence", "faith"),
+    (0, 0, 1, 1),
+    GRADE_MULTIPLIERS,
+    (ER_PHYSICAL_SOFT_CAPS, ER_MAGIC_SOFT_CAPS),
+    starting_classes=ER_STARTING_CLASSES,
+))
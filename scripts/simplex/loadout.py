@@ -0,0 +1,113 @@
+"""
+This module optimises a single build for a loadout of several weapons, the build has to meet the
+requirements of every weapon and either maximises a weighted sum of their attack ratings or the
+attack rating of the weakest weapon (max-min).
+The attack rating tables of every weapon are built in one vectorized pass, the weighted sum is then
+one more table for the exact allocator while the max-min is found by enumerating the builds of the
+most promising strength values first and stopping once no strength value can do better.
+"""
+
+import numpy as np
+import game_profiles
+from exact_allocation import InfeasibleBuildException, _get_lower_bounds, _solve_allocation_tables, allocate
+from objective_fn import get_total_damage_ratings
+
+
+def _get_loadout_problem(weapons: list, skills: list, level: int, profile) -> tuple:
+    """
+    Gets the float scales (weapons, skills) and base damages (weapons, damage types) of every
+    weapon, the (weapons, skills, max_skill + 1) table of the attack rating every skill adds to
+    every weapon, the lower bound of every skill over all the requirements and the budget left
+    once they are met.
+    """
+    scalings: np.ndarray = profile.get_scales([weapon["grades"] for weapon in weapons])
+    bases: np.ndarray = np.array(
+        [[weapon[name + "_damage"] for name in profile.damage_names] for weapon in weapons], dtype=float
+    )
+    values: np.ndarray = profile.get_weights(scalings, bases)[:, :, None] * profile.rating
+    requirements: np.ndarray = np.max([weapon["requirements"] for weapon in weapons], axis=0)
+    lower_bounds, shortfall = _get_lower_bounds(requirements, skills)
+    return scalings, bases, values, lower_bounds, level - shortfall
+
+
+def _get_damages(build: list, scalings: np.ndarray, bases: np.ndarray, profile) -> np.ndarray:
+    """Attack rating of every weapon of the loadout with the given build"""
+    return get_total_damage_ratings(np.tile(build, (len(bases), 1)), scalings, bases, profile=profile)
+
+
+def optimise_loadout(weapons: list, skills: list, level: int, weights: list = None, profile=None) -> tuple:
+    """
+    Finds the build maximising the weighted sum of the attack ratings of every weapon.
+
+    Parameters
+    ==========
+        weapons - weapons in the form maximise_damage takes them
+            {grades, requirements, physical_damage, magic_damage}
+        skills - default skills of the character
+        level - number of levels to spend, meeting requirements costs the difference in points
+        weights - non-negative weight of every weapon, all 1 by default
+        profile - game profile (or its name), dark souls by default
+    Returns
+    =======
+        The optimal build and the (weapons,) array of the attack rating of every weapon with it.
+        Raises InfeasibleBuildException if no build meets every requirement.
+    """
+    profile = game_profiles.get_profile(profile)
+    scalings, bases, values, lower_bounds, budget = _get_loadout_problem(weapons, skills, level, profile)
+    weights = np.ones(len(weapons)) if weights is None else np.asarray(weights, dtype=float)
+    # the weighted sum is separable per skill just like a single weapon
+    build: list = [int(x) for x in allocate(np.tensordot(weights, values, axes=1), lower_bounds, budget)]
+    return build, _get_damages(build, scalings, bases, profile)
+
+
+def optimise_loadout_max_min(weapons: list, skills: list, level: int, profile=None) -> tuple:
+    """
+    Finds the build maximising the smallest attack rating of the weapons, so that every weapon
+    of the loadout stays as strong as possible. Arguments are as in optimise_loadout and the
+    profile must have four skills.
+
+    Every strength value is bounded above by the worst weapon's optimum with that strength,
+    which is one dynamic program per weapon. Strength values are enumerated in order of their
+    bound, every (dexterity, intelligence) pair with faith fixed by the total is scored for all
+    the weapons at once, and the search stops once no bound beats the best build found.
+    Returns the optimal build and the (weapons,) array of the attack rating of every weapon.
+    Raises InfeasibleBuildException if no build meets every requirement.
+    """
+    profile = game_profiles.get_profile(profile)
+    if profile.stat_count != 4:
+        raise ValueError("optimise_loadout_max_min needs a profile with four skills")
+    scalings, bases, values, lower_bounds, budget = _get_loadout_problem(weapons, skills, level, profile)
+    max_skill: int = profile.max_skill
+    if budget < 0 or np.any(lower_bounds > max_skill) or budget > np.sum(max_skill - lower_bounds):
+        raise InfeasibleBuildException("Build is not feasible!")
+    base_totals: np.ndarray = bases.sum(axis=1)
+    # tails[w, b] is the best value of the last three skills for weapon w spending exactly b points
+    tails: np.ndarray = np.array([
+        _solve_allocation_tables(weapon_values[1:], lower_bounds[1:], budget)[0] for weapon_values in values
+    ])
+    strengths: np.ndarray = np.arange(lower_bounds[0], min(max_skill, lower_bounds[0] + budget) + 1)
+    remaining: np.ndarray = budget - (strengths - lower_bounds[0])
+    bounds: np.ndarray = (base_totals[:, None] + values[:, 0, strengths] + tails[:, remaining]).min(axis=0)
+    # (skills, max_skill + 1, weapons) so a build gathers a row of every weapon at once
+    table: np.ndarray = values.transpose(1, 2, 0)
+    dexterity, intelligence = np.meshgrid(
+        np.arange(lower_bounds[1], max_skill + 1), np.arange(lower_bounds[2], max_skill + 1), indexing="ij"
+    )
+    dexterity, intelligence = dexterity.ravel(), intelligence.ravel()
+    total: int = int(lower_bounds.sum()) + budget
+    best_value: float = -np.inf
+    best_build: list = None
+    for k in np.argsort(-bounds, kind="stable"):
+        if bounds[k] <= best_value:
+            break
+        strength: int = int(strengths[k])
+        faith: np.ndarray = total - strength - dexterity - intelligence
+        feasible: np.ndarray = (faith >= lower_bounds[3]) & (faith <= max_skill)
+        d, i, f = dexterity[feasible], intelligence[feasible], faith[feasible]
+        damages: np.ndarray = base_totals + table[0, strength] + table[1, d] + table[2, i] + table[3, f]
+        worst: np.ndarray = damages.min(axis=1)
+        j: int = int(worst.argmax())
+        if worst[j] > best_value:
+            best_value = worst[j]
+            best_build = [strength, int(d[j]), int(i[j]), int(f[j])]
+    return best_build, _get_damages(best_build, scalings, bases, profile)
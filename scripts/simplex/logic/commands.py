@@ -28,23 +28,100 @@ class Command:
 
     def execute_command(self, *args) -> str:
         return self._command_function(*args)
+
+    def get_edit(self, line : str, *args) -> tuple[int, int, str]:
+        """
+        Describes the command as an edit of the line (a string or list of characters),
+        (index, number of characters removed, text inserted), commands which don't know
+        their edit replace the whole line.
+        """
+        return 0, len(line), self.execute_command("".join(line), *args)
+
+    def apply(self, table, line : int, *args) -> tuple[int, str, str]:
+        """
+        Applies the command to a line of a piece table, commands which don't know the splice
+        they make rewrite the whole line with execute_command.
+        Returns the splice made as (offset, removed text, inserted text)
+        """
+        start, end = table.get_line_span(line)
+        return table.splice(start, end - start, self.execute_command(table.read(start, end).decode(), *args))
     
 class Delete(Command):
     def __init__(self):
         super().__init__(_delete)
 
+    def get_edit(self, line : str, index : int) -> tuple[int, int, str]:
+        if index < 0:
+            return super().get_edit(line, index)
+        return min(index, len(line)), int(index < len(line)), ""
+
+    def apply(self, table, line : int, index : int) -> tuple[int, str, str]:
+        if index < 0:
+            return super().apply(table, line, index)
+        return table.splice_line(line, index, 1)
+
 class Change(Command):
     def __init__(self):
         super().__init__(_change)
 
+    def get_edit(self, line : str, index : int, newchar : str) -> tuple[int, int, str]:
+        if index < 0:
+            return super().get_edit(line, index, newchar)
+        return min(index, len(line)), int(index < len(line)), newchar
+
+    def apply(self, table, line : int, index : int, newchar : str) -> tuple[int, str, str]:
+        if index < 0:
+            return super().apply(table, line, index, newchar)
+        return table.splice_line(line, index, 1, newchar)
+
 class Insert(Command):
     def __init__(self):
         super().__init__(_insert)
 
+    def get_edit(self, line : str, index : int, newchar : str) -> tuple[int, int, str]:
+        if index < 0:
+            return super().get_edit(line, index, newchar)
+        return min(index, len(line)), 0, newchar
+
+    def apply(self, table, line : int, index : int, newchar : str) -> tuple[int, str, str]:
+        if index < 0:
+            return super().apply(table, line, index, newchar)
+        return table.splice_line(line, index, 0, newchar)
+
 class Append(Command):
     def __init__(self):
         super().__init__(_append)
 
+    def get_edit(self, line : str, newchar : str) -> tuple[int, int, str]:
+        return len(line), 0, "\n" + newchar
+
+    def apply(self, table, line : int, newchar : str) -> tuple[int, str, str]:
+        return table.splice_line(line, None, 0, "\n" + newchar)
+
 class NewLine(Command):
     def __init__(self):
         super().__init__(_new_line)
+
+    def get_edit(self, line : str) -> tuple[int, int, str]:
+        return len(line), 0, "\n"
+
+    def apply(self, table, line : int) -> tuple[int, str, str]:
+        return table.splice_line(line, None, 0, "\n")
+
+class CommandBatch:
+    """
+    Collection of commands applied to a file together, commands on the same line are applied
+    in the order they were added in a single pass over the line.
+    """
+    def __init__(self):
+        self._commands : list[tuple] = []
+
+    def add(self, command : Command, line : int, *args) -> "CommandBatch":
+        self._commands.append((command, line, args))
+        return self
+
+    def get_commands(self) -> list[tuple]:
+        return self._commands
+
+    def __len__(self) -> int:
+        return len(self._commands)
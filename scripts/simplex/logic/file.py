@@ -1,11 +1,16 @@
-from logic.commands import Command
+from logic.commands import Command, CommandBatch
+from logic.journal import Journal
+from logic.piece_table import PieceTable
+import os
 
 class File:
     """Class representing the abstraction of a file in the text editor"""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, max_undo : int = 0):
+        """max_undo bounds the number of entries kept by the undo journal, 0 (the default) disables it"""
         self._path : str = file_path
         self._contents : list[str] = self._fetch_file_contents()
+        self._journal : Journal = Journal(max_undo)
 
     def _fetch_file_contents(self) -> list[str]:
         """Returns the contents of the file represented in object as a list of strings"""
@@ -32,10 +37,134 @@ class File:
         """
         Modifies the contents of the file given a line number and string index
         """
-        self._contents[line]=command.execute_command(self._contents[line], *args)
+        line = self._get_line_number(line)
+        old_line : str = self._contents[line]
+        index, length, inserted = command.get_edit(old_line, *args)
+        self._contents[line] = old_line[:index] + inserted + old_line[index+length:]
+        self._journal.record([(line, index, old_line[index:index+length], inserted)])
+
+    def _get_line_number(self, line : int) -> int:
+        """Translates negative line numbers to the line they count back to from the end"""
+        if not -len(self._contents) <= line < len(self._contents):
+            raise IndexError("list index out of range")
+        return line % len(self._contents)
+
+    def apply_batch(self, batch : CommandBatch) -> None:
+        """
+        Applies every command of the batch, each line is edited as a list of characters and
+        joined back into a string once however many commands it has.
+        The batch is a single entry of the undo journal.
+        """
+        commands_by_line : dict[int, list] = {}
+        for command, line, args in batch.get_commands():
+            commands_by_line.setdefault(self._get_line_number(line), []).append((command, args))
+        edits : list[tuple] = []
+        for line, commands in commands_by_line.items():
+            characters : list[str] = list(self._contents[line])
+            for command, args in commands:
+                index, length, inserted = command.get_edit(characters, *args)
+                edits.append((line, index, "".join(characters[index:index+length]), inserted))
+                characters[index:index+length] = inserted
+            self._contents[line] = "".join(characters)
+        self._journal.record(edits)
+
+    def _splice_line(self, line : int, index : int, removed : str, inserted : str) -> None:
+        old_line : str = self._contents[line]
+        self._contents[line] = old_line[:index] + inserted + old_line[index+len(removed):]
+
+    def undo(self) -> bool:
+        """Reverses the last modification, returns False if there was nothing to undo"""
+        edits : tuple = self._journal.undo()
+        if edits is None:
+            return False
+        for line, index, removed, inserted in reversed(edits):
+            self._splice_line(line, index, inserted, removed)
+        return True
+
+    def redo(self) -> bool:
+        """Makes the last undone modification again, returns False if there was nothing to redo"""
+        edits : tuple = self._journal.redo()
+        if edits is None:
+            return False
+        for line, index, removed, inserted in edits:
+            self._splice_line(line, index, removed, inserted)
+        return True
 
     def get_line(self, line : int) -> str:
         return self._contents[line]
 
     def get_file_contents(self) -> list[str]:
         return self._contents
+
+
+class PieceTableFile:
+    """
+    File backed by a piece table, the file on disk is memory mapped rather than read and
+    commands splice the table instead of rebuilding line strings.
+    Lines are the lines of the text (split after every newline) where File indexes the lines
+    it read, which only differ once an edit adds a newline in the middle of the file.
+    """
+
+    def __init__(self, file_path: str, max_undo : int = 0):
+        """max_undo bounds the number of entries kept by the undo journal, 0 (the default) disables it"""
+        self._path : str = file_path
+        self._journal : Journal = Journal(max_undo)
+        if not os.path.exists(self._path):
+            # same as File, a missing file is created holding a single newline
+            with open(self._path, "x") as file:
+                file.write("\n")
+        self._table : PieceTable = PieceTable(self._path)
+        # prevents IndexError when file has nothing inside of it
+        if len(self._table) == 0:
+            self._table.insert(0, "\n")
+
+    def write_to_file(self) -> None:
+        """
+        Writes current contents to file on disk, through a temporary file as the original
+        is still mapped
+        """
+        temporary_path : str = self._path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            for chunk in self._table.iter_chunks():
+                file.write(chunk)
+        os.replace(temporary_path, self._path)
+
+    def modify_contents(self, command : Command, line : int , *args) -> None:
+        """
+        Modifies the contents of the file given a line number and string index
+        """
+        self._journal.record([command.apply(self._table, line, *args)])
+
+    def apply_batch(self, batch : CommandBatch) -> None:
+        """
+        Applies every command of the batch in order, each is a single splice of the table.
+        The batch is a single entry of the undo journal.
+        """
+        self._journal.record([command.apply(self._table, line, *args) for command, line, args in batch.get_commands()])
+
+    def undo(self) -> bool:
+        """Reverses the last modification, returns False if there was nothing to undo"""
+        edits : tuple = self._journal.undo()
+        if edits is None:
+            return False
+        for offset, removed, inserted in reversed(edits):
+            self._table.splice(offset, len(inserted.encode()), removed)
+        return True
+
+    def redo(self) -> bool:
+        """Makes the last undone modification again, returns False if there was nothing to redo"""
+        edits : tuple = self._journal.redo()
+        if edits is None:
+            return False
+        for offset, removed, inserted in edits:
+            self._table.splice(offset, len(removed.encode()), inserted)
+        return True
+
+    def get_line(self, line : int) -> str:
+        return self._table.get_line(line)
+
+    def get_file_contents(self) -> list[str]:
+        return self._table.get_lines()
+
+    def close(self) -> None:
+        self._table.close()
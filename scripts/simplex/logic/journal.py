@@ -0,0 +1,41 @@
+from collections import deque
+
+class Journal:
+    """
+    Undo and redo history of a file, every entry is the tuple of edits one batch of commands
+    made and an edit only keeps where it happened with the text it removed and inserted
+    rather than a copy of the line.
+    """
+
+    def __init__(self, max_entries : int = None):
+        # the oldest entries are dropped once there are max_entries of them, 0 keeps none
+        self._undo : deque = deque(maxlen=max_entries)
+        self._redo : list[tuple] = []
+
+    def record(self, edits : list) -> None:
+        """Records a new entry, which can't follow anything undone so the redo history is cleared"""
+        if edits:
+            self._undo.append(tuple(edits))
+            self._redo.clear()
+
+    def undo(self) -> tuple:
+        """Returns the edits of the last entry to reverse (None if there are none)"""
+        if not self._undo:
+            return None
+        edits : tuple = self._undo.pop()
+        self._redo.append(edits)
+        return edits
+
+    def redo(self) -> tuple:
+        """Returns the edits of the last undone entry to make again (None if there are none)"""
+        if not self._redo:
+            return None
+        edits : tuple = self._redo.pop()
+        self._undo.append(edits)
+        return edits
+
+    def can_undo(self) -> bool:
+        return len(self._undo) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo) > 0
@@ -0,0 +1,248 @@
+import bisect
+import mmap
+import random
+import numpy as np
+
+# bytes scanned at a time when indexing the newlines of the original file
+_SCAN_SIZE : int = 1 << 24
+# bytes written at a time when saving, so large pieces are never copied whole
+_WRITE_SIZE : int = 1 << 20
+_ORIGINAL : int = 0
+_ADDED : int = 1
+
+class _Piece:
+    """Node of the treap of pieces, a span of one of the two buffers"""
+    __slots__ = ("buffer", "start", "length", "lines", "priority", "left", "right", "size", "newlines")
+
+    def __init__(self, buffer : int, start : int, length : int, lines : int):
+        self.buffer : int = buffer
+        self.start : int = start
+        self.length : int = length
+        # number of newlines inside this piece
+        self.lines : int = lines
+        self.priority : float = random.random()
+        self.left : "_Piece" = None
+        self.right : "_Piece" = None
+        # totals over the subtree rooted at this piece
+        self.size : int = length
+        self.newlines : int = lines
+
+    def update(self) -> "_Piece":
+        self.size = self.length
+        self.newlines = self.lines
+        for child in (self.left, self.right):
+            if child is not None:
+                self.size += child.size
+                self.newlines += child.newlines
+        return self
+
+def _size(piece : _Piece) -> int:
+    return 0 if piece is None else piece.size
+
+def _newlines(piece : _Piece) -> int:
+    return 0 if piece is None else piece.newlines
+
+def _merge(left : _Piece, right : _Piece) -> _Piece:
+    """Joins two treaps, every byte of left coming before every byte of right"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return left.update()
+    right.left = _merge(left, right.left)
+    return right.update()
+
+class PieceTable:
+    """
+    Text buffer made of pieces of the original (memory mapped, never copied) file and of an
+    append only buffer holding every inserted string.
+    The pieces are kept in a treap ordered by their position in the text which also tracks the
+    length and newline count of every subtree, so finding a line and splicing text take
+    O(log pieces) rather than the O(file size) of rebuilding strings.
+    Offsets are in bytes of the utf-8 encoded text, lines keep their terminating newline.
+    """
+
+    def __init__(self, file_path : str = None, text : str = ""):
+        self._mmap : mmap.mmap = None
+        original : bytes = text.encode()
+        if file_path is not None:
+            with open(file_path, "rb") as file:
+                # empty files can't be mapped
+                if file.seek(0, 2) > 0:
+                    self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    original = self._mmap
+        self._buffers : list = [original, bytearray()]
+        self._original_newlines : np.ndarray = self._index_newlines(original)
+        self._added_newlines : list[int] = []
+        self._root : _Piece = None
+        if len(original) > 0:
+            self._root = _Piece(_ORIGINAL, 0, len(original), len(self._original_newlines))
+
+    def _index_newlines(self, data) -> np.ndarray:
+        """Offsets of every newline of the original buffer, scanned in chunks"""
+        view : np.ndarray = np.frombuffer(data, dtype=np.uint8) if len(data) > 0 else np.zeros(0, dtype=np.uint8)
+        chunks : list = [np.flatnonzero(view[i:i + _SCAN_SIZE] == 10) + i for i in range(0, len(view), _SCAN_SIZE)]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.intp)
+
+    def _count_newlines(self, buffer : int, start : int, end : int) -> int:
+        if buffer == _ORIGINAL:
+            return int(np.searchsorted(self._original_newlines, end) - np.searchsorted(self._original_newlines, start))
+        return bisect.bisect_left(self._added_newlines, end) - bisect.bisect_left(self._added_newlines, start)
+
+    def _nth_newline(self, buffer : int, start : int, n : int) -> int:
+        """Offset in the buffer of the nth (0 based) newline at or after start"""
+        if buffer == _ORIGINAL:
+            return int(self._original_newlines[np.searchsorted(self._original_newlines, start) + n])
+        return self._added_newlines[bisect.bisect_left(self._added_newlines, start) + n]
+
+    def _new_piece(self, buffer : int, start : int, length : int) -> _Piece:
+        return _Piece(buffer, start, length, self._count_newlines(buffer, start, start + length))
+
+    def _split(self, piece : _Piece, offset : int) -> tuple:
+        """Splits a treap into the pieces before and after offset, cutting a piece if needed"""
+        if piece is None:
+            return None, None
+        left_size : int = _size(piece.left)
+        if offset <= left_size:
+            left, piece.left = self._split(piece.left, offset)
+            return left, piece.update()
+        if offset >= left_size + piece.length:
+            piece.right, right = self._split(piece.right, offset - left_size - piece.length)
+            return piece.update(), right
+        # the offset falls inside this piece
+        cut : int = offset - left_size
+        tail : _Piece = self._new_piece(piece.buffer, piece.start + cut, piece.length - cut)
+        # sharing the priority keeps the heap order with the children tail takes over
+        tail.priority = piece.priority
+        tail.right, piece.right = piece.right, None
+        piece.length = cut
+        piece.lines -= tail.lines
+        return piece.update(), tail.update()
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def get_line_count(self) -> int:
+        """Number of lines, a final newline doesn't start another line"""
+        size : int = len(self)
+        if size == 0:
+            return 0
+        return _newlines(self._root) + (0 if self.read(size - 1, size) == b"\n" else 1)
+
+    def _offset_after_newline(self, k : int) -> int:
+        """Offset just after the kth newline of the text, 0 for k = 0"""
+        if k <= 0:
+            return 0
+        piece : _Piece = self._root
+        base : int = 0
+        while piece is not None:
+            left_newlines : int = _newlines(piece.left)
+            if k <= left_newlines:
+                piece = piece.left
+                continue
+            k -= left_newlines
+            base += _size(piece.left)
+            if k <= piece.lines:
+                return base + self._nth_newline(piece.buffer, piece.start, k - 1) - piece.start + 1
+            k -= piece.lines
+            base += piece.length
+            piece = piece.right
+        return base
+
+    def get_line_span(self, line : int) -> tuple[int, int]:
+        """Start and end offsets of a line (negative lines count from the end like a list)"""
+        count : int = self.get_line_count()
+        if line < 0:
+            line += count
+        if not 0 <= line < count:
+            raise IndexError("line index out of range")
+        return self._offset_after_newline(line), min(self._offset_after_newline(line + 1), len(self))
+
+    def read(self, start : int, end : int) -> bytes:
+        """Bytes of the text between two offsets"""
+        out : list = []
+        self._collect(self._root, 0, max(start, 0), min(end, len(self)), out)
+        return b"".join(out)
+
+    def _collect(self, piece : _Piece, base : int, start : int, end : int, out : list) -> None:
+        if piece is None or start >= end or end <= base or start >= base + piece.size:
+            return
+        self._collect(piece.left, base, start, end, out)
+        piece_base : int = base + _size(piece.left)
+        lower : int = max(start, piece_base)
+        upper : int = min(end, piece_base + piece.length)
+        if lower < upper:
+            offset : int = piece.start + lower - piece_base
+            out.append(bytes(self._buffers[piece.buffer][offset:offset + upper - lower]))
+        self._collect(piece.right, piece_base + piece.length, start, end, out)
+
+    def get_line(self, line : int) -> str:
+        return self.read(*self.get_line_span(line)).decode()
+
+    def get_lines(self) -> list[str]:
+        return [self.get_line(i) for i in range(self.get_line_count())]
+
+    def splice(self, offset : int, length : int, text : str = "") -> tuple[int, str, str]:
+        """
+        Deletes length bytes at offset and inserts text in their place,
+        returns the offset with the removed and inserted text so the splice can be undone
+        """
+        data : bytes = text.encode()
+        left, rest = self._split(self._root, offset)
+        removed, right = self._split(rest, length)
+        removed_bytes : list = []
+        self._collect(removed, 0, 0, _size(removed), removed_bytes)
+        if data:
+            added : bytearray = self._buffers[_ADDED]
+            start : int = len(added)
+            added.extend(data)
+            self._added_newlines.extend(start + i for i, byte in enumerate(data) if byte == 10)
+            left = _merge(left, self._new_piece(_ADDED, start, len(data)))
+        self._root = _merge(left, right)
+        return offset, b"".join(removed_bytes).decode(), text
+
+    def insert(self, offset : int, text : str) -> None:
+        self.splice(offset, 0, text)
+
+    def delete(self, offset : int, length : int) -> None:
+        self.splice(offset, length)
+
+    def _char_offset(self, start : int, end : int, index : int) -> int:
+        """
+        Offset of the index-th character of the text between start and end, only the first
+        index characters (at most 4 bytes each) are decoded. Indices past the end give end.
+        """
+        if index <= 0:
+            return start
+        prefix : bytes = self.read(start, min(end, start + 4*index))
+        return start + len(prefix.decode(errors="ignore")[:index].encode())
+
+    def splice_line(self, line : int, index : int, length : int, text : str = "") -> tuple[int, str, str]:
+        """
+        Replaces length characters of a line starting from character index with text,
+        an index of None splices at the end of the line (after its newline).
+        """
+        start, end = self.get_line_span(line)
+        lower : int = end if index is None else self._char_offset(start, end, index)
+        upper : int = lower if length == 0 else self._char_offset(lower, end, length)
+        return self.splice(lower, upper - lower, text)
+
+    def iter_chunks(self):
+        """Yields the text in pieces of at most _WRITE_SIZE bytes without joining it"""
+        stack : list = []
+        piece : _Piece = self._root
+        while stack or piece is not None:
+            while piece is not None:
+                stack.append(piece)
+                piece = piece.left
+            piece = stack.pop()
+            with memoryview(self._buffers[piece.buffer]) as view:
+                for i in range(piece.start, piece.start + piece.length, _WRITE_SIZE):
+                    yield bytes(view[i:min(i + _WRITE_SIZE, piece.start + piece.length)])
+            piece = piece.right
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
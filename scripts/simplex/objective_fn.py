@@ -1,39 +1,34 @@
 import numpy as np
+import rating_tables
+import game_profiles
+
+# the single build functions follow the dark souls game engine
+_DARK_SOULS = game_profiles.DARK_SOULS
+
+def _is_skill_level(x) -> bool:
+    """whether x can be looked up directly in the precomputed rating tables"""
+    return isinstance(x, (int, np.integer)) and 0 <= x <= _DARK_SOULS.max_skill
 
 def get_scales_list(scalings : np.ndarray) -> np.ndarray:
     """Gets the list of float damage scales for the weapon given"""
     scalings_copy = scalings.copy()
     # translate scalings to floats
-    scaling_dict = {"S" : 1.7, "A" : 1.195, "B" : 0.87, "C": 0.62, "D" : 0.37, "E" : 0.125, "F" : 0}
+    scaling_dict = _DARK_SOULS.grade_multipliers
     for i, letter_scale in enumerate(scalings):
         scalings_copy[i] = scaling_dict[letter_scale]
     return scalings_copy
 
 def rating_physical(x : int) -> float:
     """piecewise continous linear function depicting the physical rating of a character"""
-    if x <= 10:
-        return 0.005*x
-    elif x <= 20:
-        return 0.05 + 0.035*(x-10)
-    elif x <= 50:
-        return 0.4 + 0.0225*(x-20)
-    elif x < 99:
-        return 0.85 + 0.0025*(x-40)
-    else:
-        return 1
+    if _is_skill_level(x):
+        return _DARK_SOULS.rating_curves[0].rating[x]
+    return rating_tables.evaluate_segments(x, _DARK_SOULS.rating_segments[0])
     
 def rating_magic(x : int) -> float:
     """piecewise continous linear function depicting the magic rating of a character"""
-    if x <= 10:
-        return 0.005*x
-    elif x <= 30:
-        return 0.05 + 0.0225*(x-10)
-    elif x <= 50:
-        return 0.5 + 0.015*(x-30)
-    elif x < 99:
-        return 0.8 + 0.0041*(x-50)
-    else:
-        return 1
+    if _is_skill_level(x):
+        return _DARK_SOULS.rating_curves[1].rating[x]
+    return rating_tables.evaluate_segments(x, _DARK_SOULS.rating_segments[1])
     
 def get_rating(i : int, x : int) -> float:
     """
@@ -50,6 +45,32 @@ def get_ratings_list(points : list) -> list:
         ratings_copy[i] = get_rating(i, point)
     return ratings_copy
 
+def get_total_damage_ratings(points : np.ndarray, scalings : np.ndarray, weapon : np.ndarray, two_handing : bool = False, profile = None) -> np.ndarray:
+    """
+    Batched version of get_total_damage_rating scoring many builds at once,
+    points = (N, 4) array of [STR, DEX, INT, FAITH] skill points
+    scalings = (4,) or (N, 4) array of letter grades or float scales
+    weapon = (2,) or (N, 2) array of [base_physical, base_magic]
+    profile = game profile or its name, dark souls by default
+    Returns the (N,) array of total attack ratings, points is left untouched.
+    """
+    profile = game_profiles.get_profile(profile)
+    points = np.array(points, ndmin=2)
+    if two_handing:
+        points = points.astype(float)
+        points[:, 0] *= 1.5
+    scalings = profile.get_scales(scalings)
+    ratings = profile.get_ratings(points)
+    damage_count = len(profile.damage_names)
+    weapon = np.broadcast_to(np.asarray(weapon, dtype=float), (len(points), damage_count))
+    # the same entry wise products as the single build version, just along the rows
+    products = ratings*np.broadcast_to(scalings, ratings.shape)
+    decision_variates = np.empty((len(points), damage_count))
+    for damage_type in range(damage_count):
+        decision_variates[:, damage_type] = 1 + products[:, profile.damage_types == damage_type].sum(axis=1)
+    # row wise dot product of weapon and decision_variates
+    return np.matmul(weapon[:, None, :], decision_variates[:, :, None])[:, 0, 0]
+
 def get_total_damage_rating(points : list, scalings : list, weapon : list, two_handing : bool = False):
     """
     The total attack rating of the dark souls game engine,
@@ -60,6 +81,7 @@ def get_total_damage_rating(points : list, scalings : list, weapon : list, two_h
     """
     # two handing a weapon causes a 1.5x increase in strength skill
     if (two_handing):
+        points = list(points)
         points[0] *= 1.5
     # translate letter scales to float multipliers
     scalings = np.array(get_scales_list(scalings))
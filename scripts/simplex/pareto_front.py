@@ -0,0 +1,100 @@
+"""
+This module computes the Pareto front of (levels spent, attack rating) for a weapon and a starting
+build, every level at which spending one more level first reaches a higher attack rating.
+The optimum of every level comes from a single pass of the exact dynamic program over the rating
+tables (exact_allocation.sweep_levels) and the front is held as sorted arrays, so questions such as
+the fewest levels reaching a target attack rating are a binary search rather than repeated solves.
+"""
+
+import numpy as np
+import game_profiles
+from exact_allocation import sweep_levels
+
+
+class ParetoFront:
+    """
+    Pareto optimal (levels, attack rating, build) triples in increasing order of levels, the
+    attack ratings are strictly increasing along the front.
+    """
+
+    def __init__(self, levels: np.ndarray, ratings: np.ndarray, builds: np.ndarray) -> None:
+        self.levels: np.ndarray = np.asarray(levels, dtype=np.intp)
+        self.ratings: np.ndarray = np.asarray(ratings, dtype=float)
+        self.builds: np.ndarray = np.asarray(builds, dtype=np.uint8)
+
+    @classmethod
+    def from_sweep(cls, builds: np.ndarray, ratings: np.ndarray) -> "ParetoFront":
+        """
+        Builds the front from the optimum of every level 0,...,max_level (as returned by
+        sweep_levels), levels without a feasible build have an attack rating of nan.
+        """
+        ratings = np.where(np.isnan(ratings), -np.inf, ratings)
+        # a level is on the front when it beats every cheaper level
+        previous_best: np.ndarray = np.concatenate(([-np.inf], np.maximum.accumulate(ratings)[:-1]))
+        on_front: np.ndarray = np.flatnonzero(ratings > previous_best)
+        return cls(on_front, ratings[on_front], builds[on_front])
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def get_max_rating(self) -> float:
+        """Greatest attack rating reachable, nan for an empty front"""
+        return float(self.ratings[-1]) if len(self) else np.nan
+
+    def get_min_levels(self, target):
+        """
+        Fewest levels reaching an attack rating of at least target, None if it is never reached.
+        An array of targets gives an array of levels with -1 for the unreachable ones.
+        """
+        targets: np.ndarray = np.asarray(target, dtype=float)
+        if len(self) == 0:
+            return None if targets.ndim == 0 else np.full(targets.shape, -1)
+        indices: np.ndarray = np.searchsorted(self.ratings, targets, side="left")
+        reached: np.ndarray = indices < len(self)
+        levels: np.ndarray = np.where(reached, self.levels[np.minimum(indices, len(self) - 1)], -1)
+        if targets.ndim == 0:
+            return int(levels) if reached else None
+        return levels
+
+    def get_min_levels_for_fraction(self, fraction):
+        """Fewest levels reaching the given fraction (or array of fractions) of the greatest attack rating"""
+        return self.get_min_levels(np.asarray(fraction, dtype=float) * self.get_max_rating())
+
+    def get_best_within(self, level: int) -> tuple:
+        """
+        Best build spending at most level levels and its attack rating,
+        (None, nan) if no build is feasible with that many levels.
+        """
+        index: int = int(np.searchsorted(self.levels, level, side="right")) - 1
+        if index < 0:
+            return None, np.nan
+        return self.builds[index], float(self.ratings[index])
+
+
+def get_pareto_front(
+    grades, requirements, skills, base_physical, base_magical, max_level: int = None, profile=None
+) -> ParetoFront:
+    """
+    Pareto front of levels spent against attack rating for a weapon starting from skills, the
+    constraints are those of optimise_exactly. max_level defaults to the levels it takes to cap
+    every skill, past which the attack rating can't grow.
+    """
+    profile = game_profiles.get_profile(profile)
+    if max_level is None:
+        max_level = profile.stat_count * profile.max_skill - int(np.sum(skills))
+    builds, ratings = sweep_levels(
+        grades, requirements, skills, base_physical, base_magical, max_level, profile
+    )
+    return ParetoFront.from_sweep(builds, ratings)
+
+
+def get_class_pareto_front(weapon: dict, class_name: str, profile=None) -> ParetoFront:
+    """
+    Pareto front of a weapon (in the form maximise_damage takes it) for a starting class of the profile
+    """
+    profile = game_profiles.get_profile(profile)
+    base_damages: list = [weapon[name + "_damage"] for name in profile.damage_names]
+    return get_pareto_front(
+        weapon["grades"], weapon["requirements"], profile.starting_classes[class_name],
+        *base_damages, profile=profile
+    )
@@ -0,0 +1,90 @@
+"""
+This module precomputes lookup tables for the piece-wise linear curves used by the damage model.
+Skill levels only ever take the integer values 0,...,99 so every curve is tabulated once when its
+game profile is built and a rating, marginal gain or slope becomes a single array index.
+"""
+
+import numpy as np
+
+MAX_SKILL: int = 99
+
+# breakpoint tables give segment k covering bounds[k-1] < x <= bounds[k] which evaluates to
+# intercept + slope*(x - offset), the columns are [bound, intercept, slope, offset]
+def evaluate_segments(x: np.ndarray, segments: np.ndarray) -> np.ndarray:
+    """
+    Evaluates a piece-wise linear breakpoint table at every entry of x, x may be any real values.
+    """
+    k = np.searchsorted(segments[:, 0], x)
+    return segments[k, 1] + segments[k, 2] * (x - segments[k, 3])
+
+
+def segments_from_soft_caps(soft_caps_locations: tuple, saturate: bool = False) -> np.ndarray:
+    """
+    Builds the breakpoint table of a linear approximation to a soft cap curve, reaching a rating
+    of 1 at the last cap. Each soft cap segment contributes 0.5, 0.25, ... of the full rating over
+    its length with the last segment taking whatever is left.
+    saturate keeps the rating at 1 past the last cap instead of extending the last segment.
+    """
+    caps: tuple = tuple(soft_caps_locations)
+    segments: np.ndarray = np.zeros((len(caps) - 1, 4))
+    start: float = 0
+    intercept: float = 0
+    for i in range(len(caps) - 1):
+        share: float = 0.5 ** (i + 1) if i < len(caps) - 2 else 0.5 ** i
+        segments[i] = [caps[i + 1], intercept, share / (caps[i + 1] - start), start]
+        start = caps[i + 1]
+        intercept += share
+    if saturate:
+        return np.vstack((segments, [np.inf, 1, 0, 0]))
+    segments[-1, 0] = np.inf
+    return segments
+
+
+def freeze(array: np.ndarray) -> np.ndarray:
+    """Marks the array as read only so shared tables can't be changed by accident"""
+    array.flags.writeable = False
+    return array
+
+
+class CurveTable:
+    """
+    Immutable lookup tables of a single curve over the skill levels 0,...,max_skill.
+        rating[x] - value of the curve at x
+        gain[x] - marginal gain of levelling from x to x + 1 (0 at the cap)
+        slope[x] - slope of the linear piece the curve is on at x
+    """
+
+    def __init__(self, rating: np.ndarray, gain: np.ndarray, slope: np.ndarray) -> None:
+        self.rating: np.ndarray = freeze(np.asarray(rating, dtype=float))
+        self.gain: np.ndarray = freeze(np.asarray(gain, dtype=float))
+        self.slope: np.ndarray = freeze(np.asarray(slope, dtype=float))
+
+    @classmethod
+    def from_segments(cls, segments: np.ndarray, max_skill: int = MAX_SKILL) -> "CurveTable":
+        """Tabulates a breakpoint table of the form used by evaluate_segments"""
+        levels: np.ndarray = np.arange(max_skill + 1)
+        rating = evaluate_segments(levels, segments)
+        gain = np.append(np.diff(rating), 0)
+        slope = segments[np.searchsorted(segments[:, 0], levels), 2]
+        return cls(rating, gain, slope)
+
+    @classmethod
+    def from_soft_caps(cls, soft_caps_locations: tuple, max_skill: int = MAX_SKILL) -> "CurveTable":
+        """
+        Tabulates a curve whose gradient halves past every soft cap, this encodes the partial
+        differentiation explained in the LaTeX doc.
+        """
+        gain = np.zeros(max_skill + 1)
+        for i in range(len(soft_caps_locations) - 1):
+            gain[soft_caps_locations[i] : soft_caps_locations[i + 1]] = 0.5 ** (i + 1)
+        gain[max_skill:] = 0
+        rating = np.concatenate(([0], np.cumsum(gain)[:-1]))
+        return cls(rating, gain, gain)
+
+    def slope_at(self, x: np.ndarray) -> np.ndarray:
+        """
+        Slope of the curve at real valued skill levels, a real x lies on the same piece as its
+        ceiling as every breakpoint is an integer.
+        """
+        return self.slope[np.clip(np.ceil(x), 0, len(self.slope) - 1).astype(int)]
+
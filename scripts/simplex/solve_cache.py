@@ -0,0 +1,142 @@
+"""
+This module memoizes the solutions of damage maximisation problems. Problems are keyed on a
+canonical signature in which the base damages are divided by their sum: scaling every base
+damage by a positive scalar scales the objective function by that scalar, which leaves the
+optimal build unchanged, so such problems share a single entry.
+Entries live in an in memory LRU cache, optionally backed by a persistent sqlite file which
+survives between runs and can be shared by processes.
+"""
+
+from collections import OrderedDict
+from fractions import Fraction
+import json
+import sqlite3
+import game_profiles
+
+
+def _normalise_base_damages(base_damages) -> tuple:
+    """Divides the base damages by their sum, exactly, so scaled weapons give the same ratios"""
+    fractions : list = [Fraction(damage) for damage in base_damages]
+    total : Fraction = sum(fractions)
+    if total > 0:
+        fractions = [fraction / total for fraction in fractions]
+    return tuple(str(fraction) for fraction in fractions)
+
+
+def get_problem_key(
+    solver : str, grades, requirements, skills, base_damages, levels : int, profile=None, options : tuple = ()
+) -> tuple:
+    """
+    Canonical signature of a problem solved by solver (any name telling the solvers apart).
+    Letter grades are replaced by their float scales, numbers by floats and the base damages
+    (one per damage type of the profile) by their share of the total, options holds anything
+    else the solution depends on.
+    """
+    profile = game_profiles.get_profile(profile)
+    return (
+        solver,
+        profile.name,
+        tuple(float(scale) for scale in profile.get_scales(grades)),
+        tuple(float(requirement) for requirement in requirements),
+        tuple(float(skill) for skill in skills),
+        _normalise_base_damages(base_damages),
+        float(levels),
+        tuple(options),
+    )
+
+
+def to_python(build) -> list:
+    """Converts the numpy scalars of a build to python numbers so it can be stored as JSON"""
+    return [value.item() if hasattr(value, "item") else value for value in build]
+
+
+class SolveCache:
+    """
+    LRU cache of the builds solved for problem keys, holding at most max_entries builds in memory.
+    When path is given every build is also written to a sqlite database there, builds evicted
+    from memory (or solved by earlier runs) are then read back from disk instead of re-solved.
+    Builds are returned as new lists so callers can't change the cached copy.
+    """
+
+    def __init__(self, max_entries : int = 4096, path : str = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self._max_entries : int = max_entries
+        self._entries : OrderedDict = OrderedDict()
+        self._database : sqlite3.Connection = None
+        if path is not None:
+            self._database = sqlite3.connect(path)
+            self._database.execute("PRAGMA journal_mode=WAL")
+            self._database.execute("PRAGMA synchronous=NORMAL")
+            self._database.execute("CREATE TABLE IF NOT EXISTS builds (key TEXT PRIMARY KEY, build TEXT NOT NULL)")
+            self._database.commit()
+        self.hits : int = 0
+        self.disk_hits : int = 0
+        self.misses : int = 0
+
+    def _remember(self, key : tuple, build : list) -> None:
+        self._entries[key] = build
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key : tuple) -> list:
+        """Cached build of a problem key, None if it has never been solved"""
+        build : list = self._entries.get(key)
+        if build is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(build)
+        if self._database is not None:
+            row = self._database.execute("SELECT build FROM builds WHERE key = ?", (repr(key),)).fetchone()
+            if row is not None:
+                build = json.loads(row[0])
+                self._remember(key, build)
+                self.disk_hits += 1
+                return list(build)
+        self.misses += 1
+        return None
+
+    def put(self, key : tuple, build) -> None:
+        build = to_python(build)
+        self._remember(key, build)
+        if self._database is not None:
+            self._database.execute("INSERT OR REPLACE INTO builds VALUES (?, ?)", (repr(key), json.dumps(build)))
+            self._database.commit()
+
+    def get_or_solve(self, key : tuple, solve) -> list:
+        """Cached build of a problem key, calling solve() and caching its build on a miss"""
+        build : list = self.get(key)
+        if build is None:
+            build = to_python(solve())
+            self.put(key, build)
+        return list(build)
+
+    def __contains__(self, key : tuple) -> bool:
+        if key in self._entries:
+            return True
+        if self._database is None:
+            return False
+        return self._database.execute("SELECT 1 FROM builds WHERE key = ?", (repr(key),)).fetchone() is not None
+
+    def __len__(self) -> int:
+        """Number of builds held in memory"""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forgets every build, including those on disk"""
+        self._entries.clear()
+        if self._database is not None:
+            self._database.execute("DELETE FROM builds")
+            self._database.commit()
+
+    def close(self) -> None:
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,8 +1,14 @@
 from damage_optimisation_script_iterative_function import optimise_iteratively
 from damage_optimisation_script_approximation_function import optimise_damage_approximately
-from utility.logger import Logger
+from utility.results_store import ResultsWriter
 import random as rnd
 from objective_fn import get_total_damage_rating
+from brute_force import brute_force_optimum
+from exact_allocation import InfeasibleBuildException
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+import numpy as np
+import os
 import time
 import json
 
@@ -27,12 +33,13 @@ def _generate_random_feasible_test_case():
     test_case["levels"] = rnd.randint(lower_bound_levels, upper_bound_levels)
     return test_case
 
-def generate_random_feasible_test_cases(n : int):
-    test_cases = []
+def iterate_random_feasible_test_cases(n : int):
+    """Generates n random feasible test cases lazily, one at a time"""
     for i in range(n):
-        test_case = _generate_random_feasible_test_case()
-        test_cases.append(test_case)
-    return test_cases
+        yield _generate_random_feasible_test_case()
+
+def generate_random_feasible_test_cases(n : int):
+    return list(iterate_random_feasible_test_cases(n))
 
 def read_problem_from_json():
     problem = {}
@@ -40,7 +47,19 @@ def read_problem_from_json():
         problem = json.load(f)
     return problem
 
-def run_test_case(test_case):
+def _run_oracle(test_case):
+    """Finds the ground truth build and its damage, both None for infeasible test cases"""
+    try:
+        optimal_builds, optimal_damages = brute_force_optimum(test_case["grades"], test_case["requirements"], test_case["skills"], test_case["base_physical"], test_case["base_magical"], test_case["levels"], top_k=1)
+        return optimal_builds[0].tolist(), optimal_damages[0]
+    except InfeasibleBuildException:
+        return None, None
+
+def run_test_case(test_case, oracle : bool = False):
+    """
+    Runs both solvers on a test case, the brute force ground truth they can be compared against
+    is only found when oracle is set, otherwise its results are None
+    """
     start_it = time.time()
     iterative_solution = optimise_iteratively(test_case["grades"], test_case["requirements"], test_case["skills"], test_case["base_physical"], test_case["base_magical"], test_case["levels"])
     obj_fn_it_soln = get_total_damage_rating(iterative_solution, test_case["grades"],[test_case["base_physical"], test_case["base_magical"]])   
@@ -49,26 +68,82 @@ def run_test_case(test_case):
     approximate_solution = optimise_damage_approximately(test_case["grades"], test_case["requirements"], test_case["skills"], test_case["base_physical"], test_case["base_magical"], test_case["levels"])
     obj_fn_app_soln = get_total_damage_rating(approximate_solution, test_case["grades"],[test_case["base_physical"], test_case["base_magical"]]) 
     runtime_app = time.time() - start_app
-    results = {"runtime_it" : runtime_it, "soln_it" : iterative_solution, "obj_fun_it_soln" : obj_fn_it_soln, "runtime_app" : runtime_app, "soln_app": approximate_solution, "obj_fn_app_soln" : obj_fn_app_soln}
+    optimal_solution, obj_fn_opt_soln, runtime_opt = None, None, None
+    if oracle:
+        start_opt = time.time()
+        optimal_solution, obj_fn_opt_soln = _run_oracle(test_case)
+        runtime_opt = time.time() - start_opt
+    results = {"runtime_it" : runtime_it, "soln_it" : iterative_solution, "obj_fun_it_soln" : obj_fn_it_soln, "runtime_app" : runtime_app, "soln_app": approximate_solution, "obj_fn_app_soln" : obj_fn_app_soln, "runtime_opt" : runtime_opt, "soln_opt" : optimal_solution, "obj_fn_opt_soln" : obj_fn_opt_soln}
     return results, test_case
 
-def run_test_cases(test_cases):
+def run_test_cases(test_cases, oracle : bool = False):
     results = []
     for case in test_cases:
-        results.append(run_test_case(case))
+        results.append(run_test_case(case, oracle))
     return results
 
+def _run_test_case_chunk(test_cases : list, oracle : bool = False) -> list:
+    """Runs a chunk of test cases inside a worker process"""
+    return [run_test_case(case, oracle) for case in test_cases]
+
+def _to_json(value):
+    """Converts the numpy values found in results to their python equivalents"""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _write_results(sink, results : list) -> None:
+    for result, test_case in results:
+        if isinstance(sink, ResultsWriter):
+            sink.append(result, test_case)
+        else:
+            sink.write(json.dumps({"test_case" : test_case, "results" : result}, default=_to_json) + "\n")
+
+def run_test_cases_parallel(test_cases, output_path : str, workers : int = None, chunk_size : int = 64, max_pending : int = None, oracle : bool = False) -> int:
+    """
+    Runs test cases over a process pool and streams every result to the JSON Lines file at
+    output_path as soon as its chunk finishes, one {"test_case", "results"} object per line.
+    Paths ending in .npy get a columnar results store instead (see utility.results_store).
+    test_cases may be any iterable (such as iterate_random_feasible_test_cases) and is consumed
+    lazily, at most max_pending chunks (2 per worker by default) are in flight so memory use
+    stays constant however many cases are run. Lines are in order of completion.
+    oracle also finds the brute force ground truth of every case (see run_test_case).
+    Returns the number of test cases run
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    test_cases = iter(test_cases)
+    count = 0
+    sink = ResultsWriter(output_path) if output_path.endswith(".npy") else open(output_path, "w")
+    with ProcessPoolExecutor(max_workers=workers) as executor, sink:
+        pending = set()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(test_cases, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(_run_test_case_chunk, chunk, oracle))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results = future.result()
+                _write_results(sink, results)
+                count += len(results)
+            sink.flush()
+    return count
+
 def main():
     preset_problem = read_problem_from_json()
-    results_preset = run_test_cases([preset_problem])
+    results_preset = run_test_cases([preset_problem], oracle=True)
    # test_cases = generate_random_feasible_test_cases(1)
    # results = run_test_cases(test_cases)
-    logger = Logger("results.txt")
-   # for result in results:
-   #     logger.log(str(result[0]) + "\n")
-   #     logger.log(str(result[1]) + "\n")
-    logger.log(str(results_preset))
-    logger.write_log()
+    with ResultsWriter("results.npy") as writer:
+       # for result in results:
+       #     writer.append(*result)
+        for result in results_preset:
+            writer.append(*result)
 
 
-main()    
+if __name__ == "__main__":
+    main()    
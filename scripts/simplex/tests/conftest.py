@@ -0,0 +1,79 @@
+import os
+import random
+import sys
+import numpy as np
+import pytest
+
+# the scripts import each other as top level modules, the greedy solvers live alongside them
+_SCRIPTS : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, os.path.join(_SCRIPTS, "simplex"))
+sys.path.insert(1, os.path.join(_SCRIPTS, "non_simplex"))
+
+from objective_fn import get_total_damage_ratings
+from testing_scripts import generate_random_feasible_test_cases
+
+
+def _get_test_cases(n : int, seed : int) -> list:
+    """n random feasible test cases, the same ones for the same seed"""
+    random.seed(seed)
+    return generate_random_feasible_test_cases(n)
+
+
+def _get_arguments(test_case : dict) -> tuple:
+    """Positional arguments of the solvers (grades, ..., levels) for a test case"""
+    return (
+        test_case["grades"], test_case["requirements"], test_case["skills"],
+        test_case["base_physical"], test_case["base_magical"], test_case["levels"],
+    )
+
+
+def _get_damage(build, test_case : dict, profile=None) -> float:
+    """Attack rating of a build for the weapon of a test case"""
+    return get_total_damage_ratings(
+        np.array(build, dtype=float), test_case["grades"],
+        [test_case["base_physical"], test_case["base_magical"]], profile=profile
+    )[0]
+
+
+def _get_weapon(test_case : dict) -> dict:
+    """Weapon of a test case in the form maximise_damage takes it"""
+    return {
+        "grades": list(test_case["grades"]),
+        "requirements": list(test_case["requirements"]),
+        "physical_damage": test_case["base_physical"],
+        "magic_damage": test_case["base_magical"],
+    }
+
+
+def _get_all_builds(lower_bounds, total : int, max_skill : int = 99) -> np.ndarray:
+    """Every build of four skills between the lower bounds and max_skill which spends total points"""
+    ranges = [np.arange(lower_bound, max_skill + 1) for lower_bound in lower_bounds[:3]]
+    strength, dexterity, intelligence = (axis.ravel() for axis in np.meshgrid(*ranges, indexing="ij"))
+    faith = total - strength - dexterity - intelligence
+    builds = np.stack((strength, dexterity, intelligence, faith), axis=1)
+    return builds[(faith >= lower_bounds[3]) & (faith <= max_skill)]
+
+
+@pytest.fixture
+def get_test_cases():
+    return _get_test_cases
+
+
+@pytest.fixture
+def get_arguments():
+    return _get_arguments
+
+
+@pytest.fixture
+def get_damage():
+    return _get_damage
+
+
+@pytest.fixture
+def get_weapon():
+    return _get_weapon
+
+
+@pytest.fixture
+def get_all_builds():
+    return _get_all_builds
@@ -0,0 +1,19 @@
+import pytest
+import game_profiles
+import benchmark
+
+
+@pytest.mark.parametrize("solver", ["linear_piecewise", "maximise_damage", "maximise_damage_exactly"])
+def test_solvers_use_the_profile_of_the_program(solver, monkeypatch, get_test_cases):
+    program = benchmark._Program(get_test_cases(1, 0)[0], game_profiles.get_profile("elden_ring"))
+    profiles : list = []
+    get_profile = game_profiles.get_profile
+
+    def record_profile(profile=None):
+        profiles.append(profile)
+        return get_profile(profile)
+
+    monkeypatch.setattr(game_profiles, "get_profile", record_profile)
+    benchmark.SOLVERS[solver](program)
+    assert profiles
+    assert all(profile is program.profile for profile in profiles)
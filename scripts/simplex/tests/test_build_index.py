@@ -0,0 +1,63 @@
+import random
+import numpy as np
+import pytest
+import game_profiles
+from build_index import BuildIndex, build_index
+from exact_allocation import InfeasibleBuildException, optimise_exactly
+
+PROFILE = game_profiles.DARK_SOULS
+
+
+def _get_weapons(get_test_cases, get_weapon) -> list:
+    return [dict(get_weapon(test_case), name=f"weapon {i}") for i, test_case in enumerate(get_test_cases(3, 20))]
+
+
+def _get_optimum(weapon : dict, class_name : str, level : int) -> list:
+    try:
+        return optimise_exactly(
+            weapon["grades"], weapon["requirements"], PROFILE.starting_classes[class_name],
+            weapon["physical_damage"], weapon["magic_damage"], level
+        )
+    except InfeasibleBuildException:
+        return None
+
+
+def test_index_round_trips_optimise_exactly(tmp_path, get_test_cases, get_weapon):
+    weapons = _get_weapons(get_test_cases, get_weapon)
+    build_index(weapons, str(tmp_path))
+    index = BuildIndex(str(tmp_path))
+    assert index.get_weapon_names() == [weapon["name"] for weapon in weapons]
+    assert index.get_class_names() == list(PROFILE.starting_classes)
+    generator = random.Random(20)
+    for weapon in weapons:
+        for class_name in index.get_class_names():
+            capacity = PROFILE.stat_count * PROFILE.max_skill - sum(PROFILE.starting_classes[class_name])
+            levels = [0, 1, capacity - 1, capacity] + [generator.randint(0, capacity) for _ in range(5)]
+            for level in levels:
+                build = index.get_build(weapon["name"], class_name, level)
+                expected = _get_optimum(weapon, class_name, level)
+                assert (build is None) == (expected is None)
+                if expected is not None:
+                    assert build.tolist() == expected
+            # levels past what the class can spend give the fully capped build
+            for level in (capacity + 1, index.max_level + 50):
+                assert index.get_build(weapon["name"], class_name, level).tolist() == [PROFILE.max_skill] * 4
+    with pytest.raises(KeyError):
+        index.get_build("no weapon", "knight", 10)
+
+
+def test_levels_outside_the_index_raise(tmp_path, get_test_cases, get_weapon):
+    weapons = _get_weapons(get_test_cases, get_weapon)[:1]
+    build_index(weapons, str(tmp_path), classes=["knight", "thief"], max_level=30)
+    index = BuildIndex(str(tmp_path))
+    name = weapons[0]["name"]
+    assert index.get_builds(name, "thief").shape == (31, PROFILE.stat_count)
+    # infeasible levels are rows of 0s
+    for level, build in enumerate(index.get_builds(name, "thief")):
+        expected = _get_optimum(weapons[0], "thief", level)
+        assert np.array_equal(build, [0] * PROFILE.stat_count if expected is None else expected)
+    for level in (-1, 31, 200):
+        with pytest.raises(ValueError):
+            index.get_build(name, "knight", level)
+    with pytest.raises(KeyError):
+        index.get_build(name, "pyromancer", 10)
@@ -0,0 +1,23 @@
+import io
+import json
+import pytest
+from cli import SOLVERS, run_batch
+
+_FEASIBLE: dict = {
+    "grades": ["C", "D", "B", "E"], "requirements": [14, 12, 0, 0], "skills": [10, 10, 10, 10],
+    "base_physical": 120, "base_magical": 0, "levels": 40,
+}
+_INFEASIBLE: dict = {
+    "grades": ["S", "S", "S", "S"], "requirements": [99, 99, 99, 99], "skills": [10, 10, 10, 10],
+    "base_physical": 1, "base_magical": 1, "levels": 5,
+}
+
+
+@pytest.mark.parametrize("solver", list(SOLVERS))
+def test_infeasible_problems_get_the_same_error_from_every_solver(solver):
+    output = io.StringIO()
+    run_batch([json.dumps(_FEASIBLE), json.dumps(_INFEASIBLE)], output, solver)
+    feasible, infeasible = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert "error" not in feasible
+    assert "build" not in infeasible
+    assert infeasible["error"] == "InfeasibleBuildException: Build is not feasible!"
@@ -0,0 +1,48 @@
+import random
+import pytest
+import game_profiles
+import damage_maximisation
+
+
+def _allocate_one_point_at_a_time(grades : list, base_damages : list, x : list, levels : int, profile) -> list:
+    """Reference greedy spending every level on the skill with the greatest gain, ties going to the first"""
+    x = list(x)
+    for _ in range(levels):
+        gains = [
+            grade * profile.soft_cap_gain[i][min(x[i], profile.soft_cap_gain.shape[1] - 1)]
+            * base_damages[profile.damage_types[i]]
+            for i, grade in enumerate(grades)
+        ]
+        x[gains.index(max(gains))] += 1
+    return x
+
+
+@pytest.mark.parametrize("profile_name", game_profiles.get_profile_names())
+def test_segment_jumps_allocate_like_one_point_at_a_time(profile_name):
+    profile = game_profiles.get_profile(profile_name)
+    generator = random.Random(16)
+    grades = list(profile.grade_multipliers)
+    for _ in range(200):
+        scales = [profile.grade_multipliers[generator.choice(grades)] for _ in range(profile.stat_count)]
+        # equal base damages make ties between skills common
+        base_damages = [generator.choice([0, 100, 100, generator.randint(1, 500)]) for _ in profile.damage_names]
+        x = [generator.randint(1, 99) for _ in range(profile.stat_count)]
+        levels = generator.randint(0, 400)
+        expected = _allocate_one_point_at_a_time(scales, base_damages, x, levels, profile)
+        assert damage_maximisation._allocate_greedily(scales, base_damages, list(x), levels, profile) == expected
+
+
+def test_maximise_damage_spends_the_levels_left_after_the_requirements(get_test_cases, get_weapon):
+    profile = game_profiles.DARK_SOULS
+    for test_case in get_test_cases(50, 17):
+        weapon = get_weapon(test_case)
+        x = [max(skill, requirement) for skill, requirement in zip(test_case["skills"], weapon["requirements"])]
+        # the greedy solver charges the whole requirement of every skill it raises
+        levels = test_case["levels"] - sum(
+            requirement for skill, requirement in zip(test_case["skills"], weapon["requirements"]) if requirement > skill
+        )
+        scales = [profile.grade_multipliers[grade] for grade in weapon["grades"]]
+        expected = _allocate_one_point_at_a_time(
+            scales, [weapon["physical_damage"], weapon["magic_damage"]], x, levels, profile
+        )
+        assert damage_maximisation.maximise_damage(weapon, list(test_case["skills"]), test_case["levels"]) == expected
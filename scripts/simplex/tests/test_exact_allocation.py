@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from brute_force import brute_force_optimum
+from exact_allocation import InfeasibleBuildException, optimise_exactly, sweep_levels
+
+
+def test_allocate_finds_the_brute_force_optimum(get_test_cases, get_arguments, get_damage):
+    for test_case in get_test_cases(60, 7):
+        _, damages = brute_force_optimum(*get_arguments(test_case), top_k=1)
+        build = optimise_exactly(*get_arguments(test_case))
+        lower_bounds = np.maximum(test_case["requirements"], test_case["skills"])
+        assert np.all(np.array(build) >= lower_bounds)
+        assert sum(build) == test_case["levels"] + sum(test_case["skills"])
+        # ties may be broken differently so only the damage has to match
+        assert get_damage(build, test_case) == pytest.approx(damages[0])
+
+
+@pytest.mark.parametrize("levels", [-1, 4 * 99 - 40 + 1])
+def test_allocate_and_brute_force_agree_on_infeasible_levels(levels, get_arguments):
+    test_case = {
+        "grades": ["C", "D", "B", "E"], "requirements": [14, 12, 0, 0], "skills": [10, 10, 10, 10],
+        "base_physical": 120, "base_magical": 0, "levels": levels,
+    }
+    with pytest.raises(InfeasibleBuildException):
+        brute_force_optimum(*get_arguments(test_case))
+    with pytest.raises(InfeasibleBuildException):
+        optimise_exactly(*get_arguments(test_case))
+
+
+def test_sweep_levels_matches_optimise_exactly_at_every_level(get_test_cases, get_arguments, get_damage):
+    for test_case in get_test_cases(5, 8):
+        arguments = get_arguments(test_case)[:-1]
+        max_level = 4 * 99 - sum(test_case["skills"]) + 1
+        builds, damages = sweep_levels(*arguments, max_level)
+        for level in range(max_level + 1):
+            try:
+                build = optimise_exactly(*arguments, level)
+            except InfeasibleBuildException:
+                assert not builds[level].any()
+                assert np.isnan(damages[level])
+                continue
+            assert builds[level].tolist() == build
+            assert damages[level] == pytest.approx(get_damage(build, test_case))
@@ -0,0 +1,90 @@
+import pytest
+from logic.commands import Append, Change, CommandBatch, Delete, Insert
+from logic.file import File, PieceTableFile
+from logic.journal import Journal
+
+_TEXT : str = "alpha\nbeta\ngamma\n"
+
+
+@pytest.fixture(params=[File, PieceTableFile])
+def open_file(request, tmp_path):
+    def open_file(max_undo=None):
+        path = tmp_path / "text.txt"
+        path.write_text(_TEXT)
+        return request.param(str(path), max_undo=max_undo)
+    return open_file
+
+
+def _get_batch() -> CommandBatch:
+    return CommandBatch().add(Change(), 0, 0, "A").add(Delete(), 1, 0).add(Insert(), 2, 5, "!").add(Insert(), 0, 1, "-")
+
+
+def test_undo_and_redo_of_a_batch_round_trip(open_file):
+    file = open_file()
+    before = list(file.get_file_contents())
+    file.apply_batch(_get_batch())
+    after = list(file.get_file_contents())
+    assert after != before
+    assert file.undo()
+    assert file.get_file_contents() == before
+    assert file.redo()
+    assert file.get_file_contents() == after
+    # the batch is a single entry
+    assert file.undo()
+    assert not file.undo()
+    assert file.get_file_contents() == before
+
+
+def test_a_new_edit_clears_the_redo_history(open_file):
+    file = open_file()
+    file.modify_contents(Change(), 0, 0, "A")
+    assert file.undo()
+    file.modify_contents(Change(), 1, 0, "B")
+    assert not file.redo()
+    assert file.get_file_contents()[1].startswith("B")
+    assert file.get_file_contents()[0] == "alpha\n"
+
+
+def test_max_undo_keeps_only_the_latest_entries(open_file):
+    file = open_file(max_undo=2)
+    for character in "xyz":
+        file.modify_contents(Append(), -1, character)
+    contents = list(file.get_file_contents())
+    assert file.undo()
+    assert file.undo()
+    assert not file.undo()
+    # the first append fell out of the journal so it stays
+    assert "x" in "".join(file.get_file_contents())
+    assert "y" not in "".join(file.get_file_contents())
+    assert file.redo() and file.redo()
+    assert file.get_file_contents() == contents
+
+
+@pytest.mark.parametrize("max_undo", [None, 0, 3])
+def test_undo_and_redo_of_an_empty_journal_do_nothing(open_file, max_undo):
+    file = open_file(max_undo=max_undo)
+    assert not file.undo()
+    assert not file.redo()
+    assert file.get_file_contents() == ["alpha\n", "beta\n", "gamma\n"]
+
+
+def test_a_journal_of_0_entries_records_nothing(open_file):
+    file = open_file(max_undo=0)
+    file.modify_contents(Change(), 0, 0, "A")
+    assert not file.undo()
+    assert file.get_file_contents()[0] == "Alpha\n"
+
+
+def test_journal_entries_move_between_undo_and_redo():
+    journal = Journal(max_entries=2)
+    assert journal.undo() is None and journal.redo() is None
+    journal.record([])
+    assert not journal.can_undo()
+    for edit in ("a", "b", "c"):
+        journal.record([edit])
+    assert journal.undo() == ("c",)
+    assert journal.undo() == ("b",)
+    assert journal.undo() is None
+    assert journal.redo() == ("b",)
+    journal.record(["d"])
+    assert not journal.can_redo()
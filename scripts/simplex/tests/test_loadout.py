@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from exact_allocation import InfeasibleBuildException
+from loadout import optimise_loadout, optimise_loadout_max_min
+from objective_fn import get_total_damage_ratings
+
+# levels past those needed to meet the requirements, -1 can't meet them
+_EXTRA_LEVELS : tuple = (-1, 0, 7, 30, 90)
+
+
+def _get_loadouts(get_test_cases, get_weapon) -> list:
+    """Pairs and triples of random weapons with the default skills of their first test case"""
+    test_cases = get_test_cases(9, 12)
+    return [
+        ([get_weapon(test_case) for test_case in test_cases[i:i + size]], test_cases[i]["skills"])
+        for i, size in ((0, 2), (2, 3), (5, 2), (7, 2))
+    ]
+
+
+def _get_lower_bounds(weapons : list, skills : list) -> np.ndarray:
+    return np.maximum(np.max([weapon["requirements"] for weapon in weapons], axis=0), skills)
+
+
+def _get_levels(weapons : list, skills : list) -> list:
+    lower_bounds = _get_lower_bounds(weapons, skills)
+    return [int(lower_bounds.sum() - sum(skills)) + extra for extra in _EXTRA_LEVELS]
+
+
+def _get_all_damages(weapons : list, skills : list, level : int, get_all_builds) -> tuple:
+    """Every feasible build of a loadout and the (builds, weapons) array of their attack ratings"""
+    lower_bounds = _get_lower_bounds(weapons, skills)
+    builds = get_all_builds(lower_bounds, level + sum(skills))
+    damages = np.stack([
+        get_total_damage_ratings(builds, weapon["grades"], [weapon["physical_damage"], weapon["magic_damage"]])
+        for weapon in weapons
+    ], axis=1)
+    return builds, damages
+
+
+def _assert_build(build : list, weapons : list, skills : list, level : int) -> None:
+    lower_bounds = _get_lower_bounds(weapons, skills)
+    assert np.all(np.array(build) >= lower_bounds)
+    assert np.all(np.array(build) <= 99)
+    assert sum(build) == level + sum(skills)
+
+
+def test_weighted_sum_matches_brute_force(get_test_cases, get_weapon, get_all_builds):
+    for weapons, skills in _get_loadouts(get_test_cases, get_weapon):
+        weights = np.arange(1, len(weapons) + 1, dtype=float)
+        for level in _get_levels(weapons, skills):
+            builds, damages = _get_all_damages(weapons, skills, level, get_all_builds)
+            if len(builds) == 0:
+                with pytest.raises(InfeasibleBuildException):
+                    optimise_loadout(weapons, skills, level, weights)
+                continue
+            build, build_damages = optimise_loadout(weapons, skills, level, weights)
+            _assert_build(build, weapons, skills, level)
+            assert weights @ build_damages == pytest.approx((damages @ weights).max())
+
+
+def test_max_min_matches_brute_force(get_test_cases, get_weapon, get_all_builds):
+    for weapons, skills in _get_loadouts(get_test_cases, get_weapon):
+        for level in _get_levels(weapons, skills):
+            builds, damages = _get_all_damages(weapons, skills, level, get_all_builds)
+            if len(builds) == 0:
+                with pytest.raises(InfeasibleBuildException):
+                    optimise_loadout_max_min(weapons, skills, level)
+                continue
+            build, build_damages = optimise_loadout_max_min(weapons, skills, level)
+            _assert_build(build, weapons, skills, level)
+            assert build_damages.min() == pytest.approx(damages.min(axis=1).max())
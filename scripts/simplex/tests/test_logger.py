@@ -0,0 +1,71 @@
+import pytest
+from logic.commands import Append
+from logic.file import File
+from utility import logger as logger_module
+from utility.logger import Logger
+
+
+def _read(path) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+def _get_messages(text : str) -> list:
+    return [line.split(" :", 1)[1] for line in text.split("\n") if line]
+
+
+def test_buffered_lines_are_all_on_disk_after_flush_and_close(tmp_path):
+    path = tmp_path / "log.txt"
+    messages = [f"message {i}" for i in range(100)]
+    logger = Logger(str(path), buffer_size=1 << 20, flush_interval=3600)
+    for message in messages[:50]:
+        logger.log(message)
+    assert _read(path) == ""
+    logger.flush()
+    text = _read(path)
+    # a new file starts with an empty line
+    assert text.startswith("\n\n<Info> ")
+    assert _get_messages(text) == messages[:50]
+    for message in messages[50:]:
+        logger.log(message)
+    logger.close()
+    assert _get_messages(_read(path)) == messages
+    assert _read(path).count("\n") == len(messages) + 1
+
+
+def test_full_buffer_is_flushed_without_being_asked(tmp_path):
+    path = tmp_path / "log.txt"
+    with Logger(str(path), buffer_size=100, flush_interval=3600) as logger:
+        for i in range(20):
+            logger.log(f"message {i}")
+        # every flush empties the buffer so at most the last 100 characters are held back
+        assert len(_get_messages(_read(path))) >= 17
+    assert _get_messages(_read(path)) == [f"message {i}" for i in range(20)]
+
+
+def test_existing_content_is_kept(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("\n<Info> 01/01/2020 00:00:00 :first")
+    with Logger(str(path)) as logger:
+        logger.log("second")
+    text = _read(path)
+    assert text.startswith("\n<Info> 01/01/2020 00:00:00 :first\n<Info> ")
+    assert _get_messages(text) == ["first", "second"]
+
+
+@pytest.mark.parametrize("existing", [None, "", "\nfirst"])
+def test_file_ends_up_as_appending_through_file(tmp_path, monkeypatch, existing):
+    # without timestamps the lines can be compared exactly
+    monkeypatch.setattr(logger_module, "_format_message", lambda to_log: to_log)
+    paths = [tmp_path / "logger.txt", tmp_path / "file.txt"]
+    if existing is not None:
+        for path in paths:
+            path.write_text(existing)
+    with Logger(str(paths[0]), buffer_size=10) as logger:
+        for i in range(5):
+            logger.log(f"message {i}")
+    file = File(str(paths[1]))
+    for i in range(5):
+        file.modify_contents(Append(), -1, f"message {i}")
+    file.write_to_file()
+    assert _read(paths[0]) == _read(paths[1])
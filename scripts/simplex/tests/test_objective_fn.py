@@ -0,0 +1,62 @@
+import random
+import numpy as np
+import pytest
+import game_profiles
+from objective_fn import get_total_damage_rating, get_total_damage_ratings
+
+_GRADES : list = list(game_profiles.DARK_SOULS.grade_multipliers)
+
+
+def _get_random_builds(n : int, seed : int) -> tuple:
+    """n random builds, up to skill 99, with their letter grades and base damages"""
+    generator = random.Random(seed)
+    points = [[generator.randint(0, 99) for _ in range(4)] for _ in range(n)]
+    # skill 99 and the lowest skills sit at the ends of the rating tables
+    points[0] = [99, 99, 99, 99]
+    points[1] = [0, 1, 99, 0]
+    scalings = [[generator.choice(_GRADES) for _ in range(4)] for _ in range(n)]
+    weapons = [[generator.randint(0, 400), generator.randint(0, 400)] for _ in range(n)]
+    return points, scalings, weapons
+
+
+def _get_expected(points : list, scalings : list, weapons : list, two_handing : bool) -> np.ndarray:
+    return np.array([
+        get_total_damage_rating(build, scaling, weapon, two_handing)
+        for build, scaling, weapon in zip(points, scalings, weapons)
+    ])
+
+
+def _get_float_scales(scalings : list) -> np.ndarray:
+    return np.array([[game_profiles.DARK_SOULS.grade_multipliers[grade] for grade in row] for row in scalings])
+
+
+@pytest.mark.parametrize("two_handing", [False, True])
+def test_batch_matches_single_builds_row_by_row(two_handing):
+    points, scalings, weapons = _get_random_builds(200, 1)
+    expected = _get_expected(points, scalings, weapons, two_handing)
+    assert np.array_equal(get_total_damage_ratings(np.array(points), np.array(scalings), weapons, two_handing), expected)
+    # float scales give the same ratings as their letter grades
+    assert np.array_equal(get_total_damage_ratings(points, _get_float_scales(scalings), weapons, two_handing), expected)
+
+
+@pytest.mark.parametrize("two_handing", [False, True])
+def test_batch_broadcasts_shared_scalings_and_weapon(two_handing):
+    points, scalings, weapons = _get_random_builds(200, 2)
+    n = len(points)
+    expected = _get_expected(points, [scalings[0]] * n, [weapons[0]] * n, two_handing)
+    assert np.array_equal(get_total_damage_ratings(points, scalings[0], weapons[0], two_handing), expected)
+    assert np.array_equal(
+        get_total_damage_ratings(points, _get_float_scales(scalings)[0], weapons[0], two_handing), expected
+    )
+    # a single build is a batch of one
+    assert np.array_equal(get_total_damage_ratings(points[0], scalings[0], weapons[0], two_handing), expected[:1])
+
+
+@pytest.mark.parametrize("two_handing", [False, True])
+def test_callers_points_are_left_untouched(two_handing):
+    points = [10, 12, 99, 3]
+    get_total_damage_rating(points, ["C", "C", "B", "E"], [100, 50], two_handing)
+    assert points == [10, 12, 99, 3]
+    batch = np.array([points, [40, 40, 40, 40]])
+    get_total_damage_ratings(batch, ["C", "C", "B", "E"], [100, 50], two_handing)
+    assert batch.tolist() == [[10, 12, 99, 3], [40, 40, 40, 40]]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import game_profiles
+from exact_allocation import InfeasibleBuildException, optimise_exactly
+from pareto_front import get_class_pareto_front, get_pareto_front
+
+
+def _assert_front(front, get_optimum) -> None:
+    """
+    The front must be sorted and non-dominated, every point must be the optimum of its level
+    and every level must be dominated by the front
+    """
+    assert len(front) > 0
+    assert np.all(np.diff(front.levels) > 0)
+    assert np.all(np.diff(front.ratings) > 0)
+    for level, rating, build in zip(front.levels, front.ratings, front.builds):
+        optimum, optimal_rating = get_optimum(int(level))
+        assert build.tolist() == optimum
+        assert rating == pytest.approx(optimal_rating)
+    # levels past the skill cap are infeasible but the front still holds the best of fewer levels
+    best = -np.inf
+    for level in range(int(front.levels[-1]) + 10):
+        try:
+            best = max(best, get_optimum(level)[1])
+        except InfeasibleBuildException:
+            pass
+        if best == -np.inf:
+            assert front.get_best_within(level)[0] is None
+        else:
+            assert front.get_best_within(level)[1] == pytest.approx(best)
+
+
+def test_front_is_sorted_non_dominated_and_optimal(get_test_cases, get_arguments, get_damage):
+    for test_case in get_test_cases(4, 14):
+        arguments = get_arguments(test_case)[:-1]
+
+        def get_optimum(level):
+            build = optimise_exactly(*arguments, level)
+            return build, get_damage(build, test_case)
+
+        _assert_front(get_pareto_front(*arguments), get_optimum)
+
+
+@pytest.mark.parametrize("profile_name", game_profiles.get_profile_names())
+def test_class_front_starts_from_the_class_skills(profile_name, get_test_cases, get_weapon, get_damage):
+    profile = game_profiles.get_profile(profile_name)
+    test_case = get_test_cases(1, 15)[0]
+    weapon = get_weapon(test_case)
+    for class_name, skills in list(profile.starting_classes.items())[:3]:
+
+        def get_optimum(level):
+            build = optimise_exactly(
+                weapon["grades"], weapon["requirements"], skills, weapon["physical_damage"], weapon["magic_damage"],
+                level, profile
+            )
+            return build, get_damage(build, test_case, profile)
+
+        _assert_front(get_class_pareto_front(weapon, class_name, profile), get_optimum)
@@ -0,0 +1,66 @@
+import random
+import pytest
+from logic.commands import Insert
+from logic.file import File, PieceTableFile
+from logic.piece_table import PieceTable
+
+_ALPHABET : str = "ab\n"
+
+
+def _get_text(generator : random.Random, length : int) -> str:
+    return "".join(generator.choice(_ALPHABET) for _ in range(length))
+
+
+def _assert_matches(table : PieceTable, model : bytearray, generator : random.Random) -> None:
+    assert len(table) == len(model)
+    assert table.get_lines() == model.decode().splitlines(keepends=True)
+    assert table.get_line_count() == len(model.decode().splitlines())
+    assert b"".join(table.iter_chunks()) == bytes(model)
+    start = generator.randint(0, len(model))
+    end = generator.randint(start, len(model))
+    assert table.read(start, end) == bytes(model[start:end])
+
+
+@pytest.mark.parametrize("from_file", [False, True])
+def test_random_splices_match_a_bytearray(from_file, tmp_path):
+    generator = random.Random(11)
+    text = _get_text(generator, 200)
+    if from_file:
+        path = tmp_path / "text.txt"
+        path.write_bytes(text.encode())
+        table = PieceTable(str(path))
+    else:
+        table = PieceTable(text=text)
+    model = bytearray(text.encode())
+    for _ in range(500):
+        offset = generator.randint(0, len(model))
+        operation = generator.choice(["insert", "delete", "replace"])
+        length = 0 if operation == "insert" else generator.randint(0, min(8, len(model) - offset))
+        inserted = "" if operation == "delete" else _get_text(generator, generator.randint(1, 8))
+        _, removed, _ = table.splice(offset, length, inserted)
+        assert removed.encode() == bytes(model[offset:offset + length])
+        model[offset:offset + length] = inserted.encode()
+        _assert_matches(table, model, generator)
+    table.close()
+
+
+def test_lines_are_split_after_every_newline_unlike_file(tmp_path):
+    """
+    File keeps indexing the lines it read so a newline inserted mid line stays inside that line,
+    PieceTableFile splits its lines after every newline. Both save the same text.
+    """
+    paths = [tmp_path / "file.txt", tmp_path / "piece_table.txt"]
+    files = []
+    for path, file_class in zip(paths, (File, PieceTableFile)):
+        path.write_text("ab\ncd\n")
+        files.append(file_class(str(path)))
+        files[-1].modify_contents(Insert(), 0, 1, "\n")
+    assert files[0].get_file_contents() == ["a\nb\n", "cd\n"]
+    assert files[1].get_file_contents() == ["a\n", "b\n", "cd\n"]
+    # so the same line number can name different text after such an edit
+    assert files[0].get_line(1) == "cd\n"
+    assert files[1].get_line(1) == "b\n"
+    for file in files:
+        file.write_to_file()
+    files[1].close()
+    assert paths[0].read_text() == paths[1].read_text() == "a\nb\ncd\n"
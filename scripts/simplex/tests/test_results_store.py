@@ -0,0 +1,70 @@
+import numpy as np
+from utility.results_store import RESULTS_DTYPE, ResultsWriter, read_results, to_row
+
+_HEADER_SIZE : int = 1024
+
+
+def _get_pair(i : int) -> tuple:
+    """A (results, test case) pair as run_test_case returns them, odd ones without a ground truth"""
+    test_case = {
+        "grades": ["A", "B", "C", "D"], "requirements": [i, 1, 2, 3], "skills": [10, 11, 12, 13],
+        "base_physical": 100.0 + i, "base_magical": 50.0, "levels": i,
+    }
+    results = {
+        "runtime_it": 0.5 * i, "soln_it": [i, i + 1, i + 2, i + 3], "obj_fun_it_soln": 200.0 + i,
+        "runtime_app": 0.25, "soln_app": [1, 2, 3, 4], "obj_fn_app_soln": 150.0,
+        "runtime_opt": 1.0, "soln_opt": None if i % 2 else [4, 3, 2, 1], "obj_fn_opt_soln": None if i % 2 else 210.0,
+    }
+    return results, test_case
+
+
+def test_rows_round_trip(tmp_path):
+    path = str(tmp_path / "results.npy")
+    pairs = [_get_pair(i) for i in range(10)]
+    with ResultsWriter(path, buffer_rows=4) as writer:
+        for results, test_case in pairs:
+            writer.append(results, test_case)
+        assert len(writer) == 10
+    rows = read_results(path)
+    assert rows.dtype == RESULTS_DTYPE and len(rows) == 10
+    for row, (results, test_case) in zip(rows, pairs):
+        assert row["grades"].tolist() == test_case["grades"]
+        assert row["levels"] == test_case["levels"]
+        assert row["soln_it"].tolist() == results["soln_it"]
+        assert row["obj_fun_it_soln"] == results["obj_fun_it_soln"]
+        if results["soln_opt"] is None:
+            assert np.all(np.isnan(row["soln_opt"])) and np.isnan(row["obj_fn_opt_soln"])
+        else:
+            assert row["soln_opt"].tolist() == results["soln_opt"]
+    # nan never equals itself so the rows are compared byte for byte
+    assert rows.tobytes() == np.array([to_row(*pair) for pair in pairs]).tobytes()
+
+
+def test_file_is_valid_while_it_is_written(tmp_path):
+    path = str(tmp_path / "results.npy")
+    pairs = [_get_pair(i) for i in range(7)]
+    with ResultsWriter(path, buffer_rows=3) as writer:
+        assert len(np.load(path)) == 0
+        for results, test_case in pairs[:5]:
+            writer.append(results, test_case)
+        # only the flushed buffer is on disk, the rest is still buffered
+        assert np.load(path).tobytes() == np.array([to_row(*pair) for pair in pairs[:3]]).tobytes()
+        writer.append_rows(np.array([to_row(*pair) for pair in pairs[5:]]))
+        assert len(np.load(path)) == 7
+    assert np.load(path).tobytes() == np.array([to_row(*pair) for pair in pairs]).tobytes()
+
+
+def test_header_keeps_its_size_as_the_file_grows(tmp_path):
+    path = str(tmp_path / "results.npy")
+    dtype = np.dtype([("value", np.int64)])
+    rows = np.zeros(1, dtype=dtype)
+    with ResultsWriter(path, dtype=dtype, buffer_rows=1) as writer:
+        for size in (1, 9, 99, 999, 99999):
+            writer.append_rows(np.arange(len(writer), size).astype(np.int64).view(dtype))
+            with open(path, "rb") as file:
+                assert np.lib.format.read_magic(file) == (1, 0)
+                shape, _, _ = np.lib.format.read_array_header_1_0(file)
+                assert shape == (size,) and file.tell() == _HEADER_SIZE
+            assert read_results(path)["value"].tolist() == list(range(size))
+        writer.append_row(rows[0])
+    assert len(read_results(path)) == 100000
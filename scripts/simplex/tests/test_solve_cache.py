@@ -0,0 +1,74 @@
+from solve_cache import SolveCache, get_problem_key
+
+_PROBLEM : dict = {
+    "grades": ["C", "D", "B", "E"], "requirements": [14, 12, 0, 0], "skills": [10, 10, 10, 10],
+    "base_damages": (120, 40), "levels": 40,
+}
+
+
+def _get_key(**changes) -> tuple:
+    problem = dict(_PROBLEM, **changes)
+    return get_problem_key(
+        "exact", problem["grades"], problem["requirements"], problem["skills"], problem["base_damages"], problem["levels"]
+    )
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity():
+    cache = SolveCache(max_entries=2)
+    keys = [_get_key(levels=levels) for levels in (1, 2, 3)]
+    cache.put(keys[0], [1])
+    cache.put(keys[1], [2])
+    # using the first entry leaves the second as the least recently used
+    assert cache.get(keys[0]) == [1]
+    cache.put(keys[2], [3])
+    assert len(cache) == 2
+    assert keys[1] not in cache
+    assert cache.get(keys[0]) == [1]
+    assert cache.get(keys[2]) == [3]
+    assert cache.get(keys[1]) is None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_evicted_entries_are_read_back_from_disk(tmp_path):
+    path = str(tmp_path / "builds.db")
+    keys = [_get_key(levels=levels) for levels in (1, 2)]
+    with SolveCache(max_entries=1, path=path) as cache:
+        cache.put(keys[0], [1, 2, 3, 4])
+        cache.put(keys[1], [5, 6, 7, 8])
+        assert len(cache) == 1
+        assert cache.get(keys[0]) == [1, 2, 3, 4]
+        assert cache.disk_hits == 1
+    # and survive between runs
+    with SolveCache(path=path) as cache:
+        assert cache.get(keys[1]) == [5, 6, 7, 8]
+        assert cache.disk_hits == 1
+
+
+def test_scaled_base_damages_share_an_entry():
+    cache = SolveCache()
+    cache.put(_get_key(), [1, 2, 3, 4])
+    assert _get_key(base_damages=(360, 120)) == _get_key()
+    assert _get_key(base_damages=(1.5, 0.5)) == _get_key()
+    assert cache.get(_get_key(base_damages=(60, 20))) == [1, 2, 3, 4]
+
+
+def test_other_grades_or_levels_miss():
+    cache = SolveCache()
+    cache.put(_get_key(), [1, 2, 3, 4])
+    assert cache.get(_get_key(grades=["C", "D", "B", "D"])) is None
+    assert cache.get(_get_key(levels=41)) is None
+    assert cache.get(_get_key(base_damages=(120, 41))) is None
+    assert cache.misses == 3
+
+
+def test_get_or_solve_only_solves_on_a_miss():
+    cache = SolveCache()
+    calls = []
+
+    def solve():
+        calls.append(None)
+        return [1, 2, 3, 4]
+
+    assert cache.get_or_solve(_get_key(), solve) == [1, 2, 3, 4]
+    assert cache.get_or_solve(_get_key(base_damages=(240, 80)), solve) == [1, 2, 3, 4]
+    assert len(calls) == 1
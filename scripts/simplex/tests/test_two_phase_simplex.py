@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+import game_profiles
+from damage_optimisation_script_approximation_function import _get_constraints_batch, _get_weights_batch
+from two_phase_simplex import (
+    BatchedLinearPieceWiseTwoPhaseSimplex, BatchedTwoPhaseSimplex, LinearPieceWiseTwoPhaseSimplex,
+    IterationLimitException, PivotInstrumentation, RevisedTwoPhaseSimplex, TwoPhaseSimplex,
+)
+
+PROFILE = game_profiles.DARK_SOULS
+
+
+def _get_piecewise_problem(test_case : dict) -> tuple:
+    """(a, b, c, scalings) of the linear piece-wise program of a test case"""
+    a, b = _get_constraints_batch(test_case["requirements"], test_case["skills"], test_case["levels"], PROFILE)
+    scalings, weights = _get_weights_batch(test_case["grades"], test_case["base_physical"], test_case["base_magical"], PROFILE)
+    skills = np.array(test_case["skills"], dtype=float)
+    c = np.zeros(a.shape[1])
+    c[0:4] = skills * PROFILE.get_lp_slopes(skills) * weights[0]
+    return a, b[0], c, list(scalings[0])
+
+
+def _get_approximate_problem(test_case : dict) -> tuple:
+    """(a, b, c) of the fixed linear approximation program of a test case"""
+    a, b = _get_constraints_batch(test_case["requirements"], test_case["skills"], test_case["levels"], PROFILE)
+    _, weights = _get_weights_batch(test_case["grades"], test_case["base_physical"], test_case["base_magical"], PROFILE)
+    c = np.zeros(a.shape[1])
+    c[0:4] = -PROFILE.approximation_costs * weights[0]
+    return a, b[0], c
+
+
+def _get_piecewise_solver(test_case : dict, **kwargs) -> LinearPieceWiseTwoPhaseSimplex:
+    a, b, c, scalings = _get_piecewise_problem(test_case)
+    return LinearPieceWiseTwoPhaseSimplex(a, b, c, scalings, test_case["base_physical"], test_case["base_magical"], **kwargs)
+
+
+def _assert_feasible(solution : list, test_case : dict) -> None:
+    solution = np.array(solution)
+    lower_bounds = np.maximum(test_case["requirements"], test_case["skills"])
+    assert np.all(solution >= lower_bounds - 1e-6)
+    assert np.all(solution <= PROFILE.max_skill + 1e-6)
+    assert solution.sum() == pytest.approx(test_case["levels"] + sum(test_case["skills"]))
+
+
+def test_resolve_needs_incremental_mode(get_test_cases):
+    test_case = get_test_cases(1, 0)[0]
+    solver = _get_piecewise_solver(test_case)
+    solver.solve_program()
+    with pytest.raises(ValueError):
+        solver.resolve(_get_piecewise_problem(test_case)[1])
+
+
+def test_warm_resolve_of_a_bumped_level_is_feasible_and_close_to_a_cold_solve(get_test_cases, get_damage):
+    for test_case in get_test_cases(100, 2):
+        if test_case["levels"] + sum(test_case["skills"]) >= 4 * PROFILE.max_skill:
+            continue
+        # a cycling resolve raises rather than hanging the test run
+        instrumentation = PivotInstrumentation(max_iterations=1000)
+        warm = _get_piecewise_solver(test_case, incremental=True, instrumentation=instrumentation)
+        warm.solve_program()
+        b = _get_piecewise_problem(test_case)[1].copy()
+        b[-1] += 1
+        assert warm.resolve(b)
+        bumped = dict(test_case, levels=test_case["levels"] + 1)
+        _assert_feasible(warm.get_solution(), bumped)
+        cold = _get_piecewise_solver(bumped, incremental=True)
+        assert cold.solve_program()
+        _assert_feasible(cold.get_solution(), bumped)
+        # the builds can differ as the result depends on the starting basis, but not by much
+        assert get_damage(warm.get_solution(), test_case) >= 0.99 * get_damage(cold.get_solution(), test_case)
+
+
+def test_revised_simplex_reaches_the_minimum_of_the_program(get_test_cases):
+    linprog = pytest.importorskip("scipy.optimize").linprog
+    for test_case in get_test_cases(50, 3):
+        a, b, c, _ = _get_piecewise_problem(test_case)
+        solver = RevisedTwoPhaseSimplex(a, b, c)
+        assert solver.solve_program()
+        solution = solver.get_solution()
+        _assert_feasible(solution, test_case)
+        assert c[0:4] @ solution == pytest.approx(linprog(c, A_eq=a, b_eq=b, method="highs").fun)
+
+
+@pytest.mark.parametrize("get_problem", [_get_approximate_problem, lambda test_case: _get_piecewise_problem(test_case)[:3]])
+def test_vectorised_and_row_by_row_pivots_give_the_same_tableau(get_problem, get_test_cases):
+    for test_case in get_test_cases(100, 4):
+        a, b, c = get_problem(test_case)
+        vectorised = TwoPhaseSimplex(a, b, c, vectorised=True)
+        row_by_row = TwoPhaseSimplex(a, b, c, vectorised=False)
+        assert vectorised.solve_program() == row_by_row.solve_program()
+        assert np.array_equal(vectorised.get_tableau(), row_by_row.get_tableau())
+        assert np.array_equal(vectorised.get_solution(), row_by_row.get_solution())
+
+
+def test_batched_simplex_matches_the_single_solver(get_test_cases):
+    test_cases = get_test_cases(100, 5)
+    problems = [_get_approximate_problem(test_case) for test_case in test_cases]
+    batched = BatchedTwoPhaseSimplex(
+        np.stack([a for a, _, _ in problems]), np.stack([b for _, b, _ in problems]), np.stack([c for _, _, c in problems])
+    )
+    valid = batched.solve_programs()
+    for k, (a, b, c) in enumerate(problems):
+        single = TwoPhaseSimplex(a, b, c)
+        assert valid[k] == single.solve_program()
+        if valid[k]:
+            assert np.array_equal(batched.get_solutions()[k], single.get_solution())
+
+
+def test_batched_linear_piecewise_simplex_matches_the_single_solver(get_test_cases):
+    test_cases = get_test_cases(100, 6)
+    problems = [_get_piecewise_problem(test_case) for test_case in test_cases]
+    batched = BatchedLinearPieceWiseTwoPhaseSimplex(
+        problems[0][0], np.stack([b for _, b, _, _ in problems]), np.stack([c for _, _, c, _ in problems]),
+        [scalings for _, _, _, scalings in problems],
+        [test_case["base_physical"] for test_case in test_cases], [test_case["base_magical"] for test_case in test_cases],
+    )
+    valid = batched.solve_programs()
+    for k, test_case in enumerate(test_cases):
+        single = _get_piecewise_solver(test_case)
+        assert valid[k] == single.solve_program()
+        if valid[k]:
+            assert np.array_equal(batched.get_solutions()[k], single.get_solution())
+
+
+def test_tiny_iteration_limit_raises(get_test_cases):
+    test_case = get_test_cases(1, 3)[0]
+    with pytest.raises(IterationLimitException) as error:
+        _get_piecewise_solver(test_case, instrumentation=PivotInstrumentation(max_iterations=1)).solve_program()
+    assert error.value.phase == "phase_one"
+    assert error.value.iterations == 1
+
+
+def test_pivots_are_counted_per_instrumented_solver(get_test_cases):
+    test_cases = get_test_cases(2, 4)
+    calls = []
+    instrumentations = [PivotInstrumentation(callback=lambda *pivot: calls.append(pivot)) for _ in test_cases]
+    solvers = [
+        _get_piecewise_solver(test_case, instrumentation=instrumentation)
+        for test_case, instrumentation in zip(test_cases, instrumentations)
+    ]
+    solvers[0].solve_program()
+    first_pivots = dict(instrumentations[0].pivots)
+    assert instrumentations[0].get_total_pivots() > 0
+    assert instrumentations[1].get_total_pivots() == 0
+    # neither a second instrumented solver nor an uninstrumented one adds to the first count
+    solvers[1].solve_program()
+    _get_piecewise_solver(test_cases[0]).solve_program()
+    assert instrumentations[0].pivots == first_pivots
+    assert instrumentations[1].get_total_pivots() > 0
+    assert instrumentations[0].pivots["phase_one"] > 0 and instrumentations[1].pivots["phase_one"] > 0
+    assert len(calls) == sum(instrumentation.get_total_pivots() for instrumentation in instrumentations)
+    # the instrumentation only watches the pivots, the solution is unchanged
+    uninstrumented = _get_piecewise_solver(test_cases[1])
+    uninstrumented.solve_program()
+    assert np.array_equal(solvers[1].get_solution(), uninstrumented.get_solution())
@@ -0,0 +1,74 @@
+import math
+import numpy as np
+import pytest
+from objective_fn import get_total_damage_ratings
+from variants import expand_variants, optimise_best_variant, optimise_variants
+
+_INFUSIONS : dict = {
+    "heavy": {"grades": ["S", "E", "E", "E"], "physical_damage": 140},
+    "magic": {"grades": ["E", "E", "A", "E"], "physical_damage": 60, "magic_damage": 90},
+}
+
+
+@pytest.mark.parametrize("requirement, two_handed_requirement", [(10, 7), (11, 8), (12, 8)])
+def test_two_handing_needs_two_thirds_of_the_strength_rounded_up(requirement, two_handed_requirement):
+    weapon = {"grades": ["C", "C", "E", "E"], "requirements": [requirement, 1, 1, 1], "physical_damage": 100, "magic_damage": 0}
+    variants = expand_variants(weapon)
+    skills = [1, 1, 1, 1]
+    for level in (two_handed_requirement - 2, two_handed_requirement - 1):
+        builds, damages = optimise_variants(variants, skills, level)
+        one_handed, two_handed = (variant["two_handing"] for variant in variants)
+        assert not one_handed and two_handed
+        # one handing still needs the whole requirement
+        assert np.isnan(damages[0])
+        if level < two_handed_requirement - 1:
+            assert np.isnan(damages[1])
+        else:
+            assert builds[1].tolist() == [two_handed_requirement, 1, 1, 1]
+
+
+def test_expand_variants_lists_every_infusion_held_both_ways():
+    weapon = {"grades": ["C", "C", "E", "E"], "requirements": [10, 10, 0, 0], "physical_damage": 100,
+              "magic_damage": 0, "infusions": _INFUSIONS}
+    variants = expand_variants(weapon)
+    assert [(variant["infusion"], variant["two_handing"]) for variant in variants] == [
+        ("normal", False), ("normal", True), ("heavy", False), ("heavy", True), ("magic", False), ("magic", True)
+    ]
+    assert variants[3]["grades"] == ["S", "E", "E", "E"] and variants[3]["magic_damage"] == 0
+    assert all("infusions" not in variant for variant in variants)
+
+
+def _get_best_variant_by_brute_force(variants : list, skills : list, level : int, get_all_builds) -> float:
+    best = np.nan
+    for variant in variants:
+        requirements = list(variant["requirements"])
+        if variant["two_handing"]:
+            requirements[0] = math.ceil(requirements[0] / 1.5)
+        builds = get_all_builds(np.maximum(requirements, skills), level + sum(skills))
+        if len(builds) > 0:
+            damages = get_total_damage_ratings(
+                builds, variant["grades"], [variant["physical_damage"], variant["magic_damage"]],
+                two_handing=variant["two_handing"]
+            )
+            best = np.fmax(best, damages.max())
+    return best
+
+
+def test_best_variant_matches_brute_force(get_test_cases, get_weapon, get_all_builds):
+    for test_case in get_test_cases(4, 13):
+        weapon = get_weapon(test_case)
+        skills = test_case["skills"]
+        variants = expand_variants(weapon, infusions=_INFUSIONS)
+        shortfall = int(np.maximum(weapon["requirements"], skills).sum() - sum(skills))
+        for level in (shortfall - 10, shortfall, shortfall + 25):
+            expected = _get_best_variant_by_brute_force(variants, skills, level, get_all_builds)
+            variant, build, damage = optimise_best_variant(weapon, skills, level, infusions=_INFUSIONS)
+            if np.isnan(expected):
+                assert variant is None and build is None and np.isnan(damage)
+                continue
+            assert damage == pytest.approx(expected)
+            assert sum(build) == level + sum(skills)
+            assert damage == pytest.approx(get_total_damage_ratings(
+                np.array(build, dtype=float), variant["grades"], [variant["physical_damage"], variant["magic_damage"]],
+                two_handing=variant["two_handing"]
+            )[0])
@@ -0,0 +1,74 @@
+import csv
+import json
+import os
+import random
+import numpy as np
+import pytest
+import game_profiles
+from weapon_catalogue import WeaponCatalogue, open_catalogue, read_weapons
+
+
+def _get_random_weapons(profile, n : int, seed : int) -> list:
+    generator = random.Random(seed)
+    grades = list(profile.grade_multipliers)
+    return [{
+        "name": f"weapon {i}",
+        "grades": [generator.choice(grades) for _ in profile.skill_names],
+        "requirements": [generator.randint(0, profile.max_skill) for _ in profile.skill_names],
+        **{name + "_damage": float(generator.randint(0, 400)) for name in profile.damage_names},
+    } for i in range(n)]
+
+
+def _write_csv(weapons : list, path : str, profile) -> None:
+    fields = (["name"] + [skill + "_grade" for skill in profile.skill_names]
+              + [skill + "_requirement" for skill in profile.skill_names]
+              + [name + "_damage" for name in profile.damage_names])
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for weapon in weapons:
+            row = {key: value for key, value in weapon.items() if key.endswith("_damage") or key == "name"}
+            for skill, grade, requirement in zip(profile.skill_names, weapon["grades"], weapon["requirements"]):
+                # grades are read case and whitespace insensitively
+                row[skill + "_grade"] = f" {grade.lower()}"
+                row[skill + "_requirement"] = requirement
+            writer.writerow(row)
+
+
+@pytest.mark.parametrize("profile_name", game_profiles.get_profile_names())
+@pytest.mark.parametrize("extension", [".csv", ".json"])
+def test_catalogue_round_trips_read_weapons(tmp_path, profile_name, extension):
+    profile = game_profiles.get_profile(profile_name)
+    weapons = _get_random_weapons(profile, 25, 24)
+    source_path = str(tmp_path / ("weapons" + extension))
+    if extension == ".csv":
+        _write_csv(weapons, source_path, profile)
+    else:
+        with open(source_path, "w") as file:
+            json.dump(weapons, file)
+    assert read_weapons(source_path, profile_name) == weapons
+    catalogue = open_catalogue(source_path, str(tmp_path / "catalogue"), profile_name)
+    assert catalogue.profile == profile.name and len(catalogue) == len(weapons)
+    assert catalogue.get_weapons() == weapons
+    assert catalogue.get_weapon("weapon 7") == weapons[7]
+    assert catalogue.get_index("weapon 7") == 7
+    assert np.array_equal(catalogue.scales, profile.get_scales(np.array([weapon["grades"] for weapon in weapons])))
+
+
+def test_catalogue_is_rebuilt_only_when_the_source_is_newer(tmp_path):
+    profile = game_profiles.DARK_SOULS
+    source_path = str(tmp_path / "weapons.json")
+    catalogue_path = str(tmp_path / "catalogue")
+    weapons = _get_random_weapons(profile, 5, 25)
+    with open(source_path, "w") as file:
+        json.dump(weapons, file)
+    open_catalogue(source_path, catalogue_path)
+    with open(source_path, "w") as file:
+        json.dump(weapons[:2], file)
+    meta_time = os.path.getmtime(os.path.join(catalogue_path, "catalogue.json"))
+    # an older source keeps the catalogue as it is
+    os.utime(source_path, (meta_time - 10, meta_time - 10))
+    assert open_catalogue(source_path, catalogue_path).get_weapons() == weapons
+    os.utime(source_path, (meta_time + 10, meta_time + 10))
+    assert open_catalogue(source_path, catalogue_path).get_weapons() == weapons[:2]
+    assert WeaponCatalogue(catalogue_path).get_weapons() == weapons[:2]
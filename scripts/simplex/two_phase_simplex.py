@@ -3,8 +3,97 @@ This module allows the implementation of the two phase simplex method and can be
 a given linear program provided it is in the correct form.
 """
 
-from typing import Sequence
+from typing import Callable, Sequence
+import time
 import numpy as np
+import game_profiles
+
+
+class PivotInstrumentation:
+    """
+    Optional instrumentation of the pivots of a TwoPhaseSimplex solver, passed to its constructor.
+    Pivots and the nanoseconds spent in them are counted per phase ("phase_one", "drive" for
+    driving auxillary variables out of the basis, and "phase_two"), callback(phase, r, s) is
+    called after every pivot and an IterationLimitException is raised once a phase runs more
+    than max_iterations iterations of its pivoting loop, which stops cycling problems from
+    looping forever.
+    Only the solver instances it is attached to are wrapped, an uninstrumented solver runs
+    exactly the same code as before.
+    """
+
+    PHASES: tuple = ("phase_one", "drive", "phase_two")
+
+    def __init__(self, callback: Callable = None, max_iterations: int = None) -> None:
+        self.callback: Callable = callback
+        self.max_iterations: int = max_iterations
+        self.phase: str = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Zeroes every counter"""
+        self.pivots: dict = {phase: 0 for phase in self.PHASES}
+        self.pivot_time_ns: dict = {phase: 0 for phase in self.PHASES}
+        self._iterations: int = 0
+
+    def get_total_pivots(self) -> int:
+        return sum(self.pivots.values())
+
+    def get_mean_pivot_time_ns(self) -> float:
+        """Mean time of a pivot over every phase, 0 before any pivot"""
+        total: int = self.get_total_pivots()
+        return sum(self.pivot_time_ns.values()) / total if total else 0.0
+
+    def get_report(self) -> dict:
+        """Pivot counts and times of every phase along with the totals"""
+        return {
+            "pivots": dict(self.pivots),
+            "pivot_time_ns": dict(self.pivot_time_ns),
+            "total_pivots": self.get_total_pivots(),
+            "mean_pivot_time_ns": self.get_mean_pivot_time_ns(),
+        }
+
+    def attach(self, solver: "TwoPhaseSimplex") -> None:
+        """Wraps the pivoting methods of one solver instance with the instrumentation"""
+        find_pivot = solver._find_pivot
+        pivot = solver._pivot
+
+        def instrumented_find_pivot() -> tuple[int, int]:
+            # every iteration of a pivoting loop looks for exactly one pivot
+            self._iterations += 1
+            if self.max_iterations is not None and self._iterations > self.max_iterations:
+                raise IterationLimitException(
+                    f"{self.phase} exceeded {self.max_iterations} iterations, "
+                    "the problem may be cycling",
+                    self.phase,
+                    self._iterations - 1,
+                )
+            return find_pivot()
+
+        def instrumented_pivot(r: int, s: int) -> None:
+            start: int = time.perf_counter_ns()
+            pivot(r, s)
+            self.pivot_time_ns[self.phase] += time.perf_counter_ns() - start
+            self.pivots[self.phase] += 1
+            if self.callback is not None:
+                self.callback(self.phase, r, s)
+
+        solver._find_pivot = instrumented_find_pivot
+        solver._pivot = instrumented_pivot
+        solver._solve_auxillary_problem = self._in_phase("phase_one", solver._solve_auxillary_problem)
+        solver._drive_auxillary_variables_from_basis = self._in_phase(
+            "drive", solver._drive_auxillary_variables_from_basis
+        )
+        solver._complete_phase_two = self._in_phase("phase_two", solver._complete_phase_two)
+
+    def _in_phase(self, phase: str, method: Callable) -> Callable:
+        """Wraps a method so the pivots made inside it are attributed to phase"""
+
+        def instrumented_method(*args):
+            self.phase = phase
+            self._iterations = 0
+            return method(*args)
+
+        return instrumented_method
 
 class TwoPhaseSimplex:
     """
@@ -14,12 +103,20 @@ class TwoPhaseSimplex:
     """
 
     def __init__(
-        self, a: Sequence[Sequence[float]], b: Sequence[float], c: Sequence[float]
+        self,
+        a: Sequence[Sequence[float]],
+        b: Sequence[float],
+        c: Sequence[float],
+        vectorised: bool = True,
+        instrumentation: PivotInstrumentation = None,
     ) -> None:
         """
         Initializes the TwoPhaseSimplex solver object in terms of it's distinguishing components
         The problem to be solved is of the form: min c*x, s.t. Ax=b.
         Assumes that the problem must be translated to auxillary form.
+        vectorised selects the whole array pivot and ratio test, otherwise the tableau is
+        updated row by row. Both follow exactly the same pivot sequence.
+        instrumentation optionally counts, times and limits the pivots of the solver.
         """
         valid, message = self._check_validity_of_arguments(a, b, c)
         if not valid:
@@ -31,6 +128,9 @@ class TwoPhaseSimplex:
         self._c: np.ndarray = np.array(c)
         self._tableau: np.ndarray = np.zeros((len(a) + 1, len(a) + len(a[0]) + 1))
         self._solution: np.ndarray = np.zeros(len(c))
+        self._vectorised: bool = vectorised
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def _check_validity_of_arguments(
         self, a: Sequence[Sequence[float]], b: Sequence[float], c: Sequence[float]
@@ -78,6 +178,26 @@ class TwoPhaseSimplex:
         """
         Find the pivot (r,s) on the tableau using Bland's rule.
         """
+        if not self._vectorised:
+            return self._find_pivot_rowwise()
+        # first column with a negative reduced cost
+        s: int = int(np.argmax(~(self._tableau[0, 1:] >= 0))) + 1
+        column: np.ndarray = self._tableau[1:, s]
+        positive: np.ndarray = column > 0
+        ratios: np.ndarray = np.full(len(column), np.inf)
+        ratios[positive] = self._tableau[1:, 0][positive] / column[positive]
+        # ratios which could never be strictly smaller than the running minimum are not candidates
+        ratios[~(ratios < np.inf)] = np.inf
+        # argmin returns the first minimum, the same row as the strict comparison of the rowwise test
+        r: int = int(ratios.argmin()) + 1
+        if ratios[r - 1] == np.inf:
+            r = 0
+        return (r, s)
+
+    def _find_pivot_rowwise(self) -> tuple[int, int]:
+        """
+        Find the pivot (r,s) on the tableau using Bland's rule, one row at a time.
+        """
         m: int = self._tableau.shape[0]
         s = 1
         while self._tableau[0, s] >= 0:
@@ -98,8 +218,20 @@ class TwoPhaseSimplex:
         this causes the rth row to be divide by tableau[r,s] and then all entries
         on the sth column to become 0 other than where the row is r.
         """
-        m: int = self._tableau.shape[0]
         self._tableau[r] /= self._tableau[r, s]
+        if not self._vectorised:
+            self._eliminate_rowwise(r, s)
+            return
+        # every other row loses its multiple of row r as one rank 1 update
+        column: np.ndarray = self._tableau[:, s].copy()
+        column[r] = 0
+        self._tableau -= np.outer(column, self._tableau[r])
+
+    def _eliminate_rowwise(self, r: int, s: int) -> None:
+        """
+        Eliminates the sth column from every row other than r, one row at a time.
+        """
+        m: int = self._tableau.shape[0]
         for i in range(m):
             if i != r:
                 self._tableau[i] -= self._tableau[r] * self._tableau[i, s]
@@ -246,59 +378,505 @@ class LinearPieceWiseTwoPhaseSimplex(TwoPhaseSimplex):
     An extension of the basic two phase simplex method class which allows for iterative
     solving of a problem with a  linear piece-wise objective function
     """
-    def __init__(self, a, b, c, scalings_floats, base_physical, base_magical):
-        super().__init__(a , b, c)
+
+    # reduced costs above this are treated as non-negative by the incremental mode
+    _TOLERANCE: float = 1e-9
+
+    def __init__(self, a, b, c, scalings_floats, base_physical, base_magical, vectorised=True, incremental=False, profile=None, instrumentation=None):
+        """
+        incremental keeps the phase 2 tableau between pivots and only reprices its objective
+        row when a skill moves onto a new piece, the slack variables then cost nothing.
+        Otherwise the objective row is rebuilt from the solution after every pivot.
+        profile is the game profile (or its name) whose slopes are used, dark souls by default.
+        """
+        super().__init__(a , b, c, vectorised, instrumentation)
         self._scalings_floats = scalings_floats
         self._base_physical = base_physical
         self._base_magical = base_magical
+        self._incremental = incremental
+        self._profile = game_profiles.get_profile(profile)
+        self._initial_c = self._c.copy()
+        # optimal basis of the last solve, used to warm start resolve
+        self._basis = None
 
     def _get_cost_vector(self, cost_vector) -> np.ndarray:
         # only use slopes of linear functions as we allowed to do that using the 
         # properties derived from solution equivalency
         cost_vector_copy = cost_vector.copy()
-        for i in range(4):
-            # physical skills
-            if i < 2:
-                if cost_vector_copy[i] <= 10:
-                    cost_vector_copy[i] = -0.05
-                elif cost_vector_copy[i] <= 20:
-                    cost_vector_copy[i] = - 0.025
-                elif cost_vector_copy[i] <= 40:
-                    cost_vector_copy[i] = -0.00625
-                else:
-                    cost_vector_copy[i] = -0.125/59
-            # magical skills
-            else:
-                if cost_vector_copy[i] <= 10:
-                    cost_vector_copy[i] = -0.05
-                elif cost_vector_copy[i] <= 30:
-                    cost_vector_copy[i] = -0.0125
-                elif cost_vector_copy[i] <= 50:
-                    cost_vector_copy[i] = -0.00625
-                else:
-                    cost_vector_copy[i] = -0.125/49
+        skills = self._profile.stat_count
+        cost_vector_copy[0:skills] = -self._profile.get_lp_slopes(cost_vector_copy[0:skills])
         return cost_vector_copy
 
+    def _get_phase_two_cost_vector(self, basis: np.ndarray) -> np.ndarray:
+        """
+        Gets the cost vector of the pieces the current solution lies on
+        """
+        cost_vector = self._get_cost_vector(self._get_solution(basis))
+        if self._incremental:
+            cost_vector[self._profile.stat_count:] = 0
+        weapon = (self._base_physical, self._base_magical)
+        for i, scalar in enumerate(self._scalings_floats):
+            cost_vector[i] *= scalar * weapon[self._profile.damage_types[i]]
+        return cost_vector
+
+    def _price_objective_row(self, basis: np.ndarray) -> None:
+        """
+        Writes the reduced costs of the cost vector against the basis into the objective row
+        in place, leaving the rest of the tableau untouched.
+        """
+        basic_costs: np.ndarray = self._c[basis - 1]
+        self._tableau[0, 0] = -np.dot(basic_costs, self._tableau[1:, 0])
+        self._tableau[0, 1:] = self._c - np.matmul(basic_costs, self._tableau[1:, 1:])
+
     def _complete_phase_two(self, basis: np.ndarray) -> np.ndarray:
         """
         Solves the phase 2 simplex by applying the phase 1 simplex onto the
         new tableau.
         """
+        if self._incremental:
+            return self._complete_phase_two_incrementally(basis)
         while self._tableau[0, 1:].min() < 0:
             r, s = self._find_pivot()
             self._pivot(r, s)
             basis[r - 1] = s
             # after pivoting change to new cost_vector and reformulate the phase two tableau
-            cost_vector = self._get_cost_vector(self._get_solution(basis))
-            for i, scalar in enumerate(self._scalings_floats):
-                if i < 2:
-                    cost_vector[i] *= scalar * self._base_physical
-                else:
-                    cost_vector[i] *= scalar * self._base_magical
-            self._c = cost_vector
+            self._c = self._get_phase_two_cost_vector(basis)
             self._change_tableau_to_phase_two(basis)
         return basis
 
+    def _complete_phase_two_incrementally(self, basis: np.ndarray) -> np.ndarray:
+        """
+        Solves the phase 2 simplex keeping the current basis and tableau, the objective row is
+        only repriced when a pivot moves a skill onto a new piece of its rating function.
+        Bland's rule can't revisit a basis while the cost vector is fixed, so a revisited basis
+        means the pieces are oscillating and the search stops there.
+        """
+        self._price_objective_row(basis)
+        visited: set = {tuple(basis)}
+        while self._tableau[0, 1:].min() < -self._TOLERANCE:
+            r, s = self._find_pivot()
+            self._pivot(r, s)
+            basis[r - 1] = s
+            if tuple(basis) in visited:
+                break
+            visited.add(tuple(basis))
+            cost_vector = self._get_phase_two_cost_vector(basis)
+            if not np.array_equal(cost_vector, self._c):
+                self._c = cost_vector
+                self._price_objective_row(basis)
+        return basis
+
+    def _store_solution(self, basis: np.ndarray) -> None:
+        """
+        Writes the solution into the solution property and keeps the basis for warm starts
+        """
+        super()._store_solution(basis)
+        self._basis = basis.copy()
+
+    def resolve(self, b: Sequence[float]) -> bool:
+        """
+        Solves the problem again for a new right hand side b (such as the same character with
+        a bumped level) starting from the optimal basis of the last solve.
+        Phase 1 is skipped entirely whenever that basis is still feasible for b, otherwise
+        the problem is solved from scratch.
+        The piece-wise search stops at the first basis whose pieces are locally optimal, so a warm
+        resolve depends on the basis it starts from and can end on a different (better or worse)
+        build than a cold solve_program on b would. Only the incremental mode reprices the
+        objective row against a warm basis, so resolve needs incremental=True.
+        Returns True if the problem is bounded
+        """
+        if not self._incremental:
+            raise ValueError("resolve needs a solver constructed with incremental=True")
+        self._b = np.array(b)
+        m, n = self._a.shape
+        if self._basis is not None:
+            basis: np.ndarray = self._basis.copy()
+            try:
+                body: np.ndarray = np.linalg.solve(
+                    self._a[:, basis - 1], np.column_stack((self._b, self._a))
+                )
+            except np.linalg.LinAlgError:
+                body = None
+            if body is not None and body[:, 0].min() >= -self._TOLERANCE:
+                self._tableau = np.zeros((m + 1, n + 1))
+                self._tableau[1:] = body
+                self._c = self._get_phase_two_cost_vector(basis)
+                self._change_tableau_to_phase_two(basis)
+                basis = self._complete_phase_two(basis)
+                self._store_solution(basis)
+                return True
+        # cold start from the original tableau and cost vector
+        self._tableau = np.zeros((m + 1, m + n + 1))
+        self._c = self._initial_c.copy()
+        return self.solve_program()
+
+
+class RevisedTwoPhaseSimplex(TwoPhaseSimplex):
+    """
+    Revised implementation of the two phase simplex method which never forms the tableau.
+    Only the basis inverse is kept, it is updated in product form (a rank one eta update) after
+    every pivot and the columns are priced with vectorized reduced costs, so each pivot is a
+    handful of BLAS calls rather than a Python loop over the rows of the tableau.
+    Pivots follow the same Bland's rule as TwoPhaseSimplex.
+    Its answers can differ from those of TwoPhaseSimplex, whose phase 2 writes the raw cost
+    vector into the objective row without pricing out the basic columns. That can stop it at a
+    vertex which isn't optimal, whereas this solver prices every column against the basis and
+    reaches the true minimum.
+    """
+
+    # entries smaller than this are treated as 0 to stop round off error causing extra pivots
+    _TOLERANCE: float = 1e-9
+
+    def __init__(
+        self,
+        a: Sequence[Sequence[float]],
+        b: Sequence[float],
+        c: Sequence[float],
+        refactor_frequency: int = 50,
+    ) -> None:
+        """
+        Initializes the solver for the problem min c*x, s.t. Ax=b without allocating a tableau.
+        The basis inverse is recomputed from scratch every refactor_frequency pivots to stop
+        round off error building up through the product form updates.
+        """
+        valid, message = self._check_validity_of_arguments(a, b, c)
+        if not valid:
+            raise InvalidProblemException(
+                "Invalid linear programming problem described: " + message
+            )
+        self._a: np.ndarray = np.array(a, dtype=float)
+        self._b: np.ndarray = np.array(b, dtype=float)
+        self._c: np.ndarray = np.array(c, dtype=float)
+        self._solution: np.ndarray = np.zeros(len(c))
+        self._refactor_frequency: int = refactor_frequency
+        m, n = self._a.shape
+        # original columns followed by the auxillary variables
+        self._columns: np.ndarray = np.hstack((self._a, np.identity(m)))
+        # basis holds 0 indexed column numbers
+        self._basis: np.ndarray = np.arange(n, n + m)
+        self._basis_inverse: np.ndarray = np.identity(m)
+        self._basic_solution: np.ndarray = self._b.copy()
+        self._costs: np.ndarray = np.concatenate((np.zeros(n), np.ones(m)))
+        self._pivots: int = 0
+
+    def _get_reduced_costs(self) -> np.ndarray:
+        """Prices every column against the current basis"""
+        y: np.ndarray = self._costs[self._basis] @ self._basis_inverse
+        return self._costs - y @ self._columns
+
+    def _refactor(self) -> None:
+        """Recomputes the basis inverse and basic solution from the basis"""
+        self._basis_inverse = np.linalg.inv(self._columns[:, self._basis])
+        self._basic_solution = self._basis_inverse @ self._b
+
+    def _pivot_column(self, r: int, s: int, d: np.ndarray) -> None:
+        """
+        Brings column s into the basis in place of the rth basic variable, d is column s
+        expressed in terms of the current basis (basis inverse times column s).
+        """
+        d = d.copy()
+        pivot: float = d[r]
+        d[r] = 0
+        self._basis_inverse[r] /= pivot
+        self._basis_inverse -= np.outer(d, self._basis_inverse[r])
+        self._basic_solution[r] /= pivot
+        self._basic_solution -= d * self._basic_solution[r]
+        self._basis[r] = s
+        self._pivots += 1
+        if self._pivots % self._refactor_frequency == 0:
+            self._refactor()
+
+    def _iterate(self) -> bool:
+        """
+        Pivots until no reduced cost is negative.
+        Returns False if the objective is unbounded along an entering column.
+        """
+        while True:
+            reduced_costs: np.ndarray = self._get_reduced_costs()
+            entering: np.ndarray = np.flatnonzero(reduced_costs < -self._TOLERANCE)
+            if len(entering) == 0:
+                return True
+            # Bland's rule, the first column with a negative reduced cost enters
+            s: int = entering[0]
+            d: np.ndarray = self._basis_inverse @ self._columns[:, s]
+            positive: np.ndarray = d > self._TOLERANCE
+            if not positive.any():
+                return False
+            ratios: np.ndarray = np.full(len(d), np.inf)
+            ratios[positive] = self._basic_solution[positive] / d[positive]
+            # the first row attaining the minimum ratio leaves
+            self._pivot_column(int(ratios.argmin()), s, d)
+
+    def _drive_auxillary_variables_from_basis(self, basis: np.ndarray) -> np.ndarray:
+        """
+        Removes auxillary variables from the basis by pivoting on any non-zero entry of their
+        row over the original columns.
+        """
+        n: int = self._a.shape[1]
+        for r in np.flatnonzero(self._basis >= n):
+            row: np.ndarray = self._basis_inverse[r] @ self._a
+            non_zero: np.ndarray = np.flatnonzero(np.abs(row) > self._TOLERANCE)
+            if len(non_zero) > 0:
+                s: int = non_zero[0]
+                self._pivot_column(r, s, self._basis_inverse @ self._columns[:, s])
+        return self._basis
+
+    def solve_program(self) -> bool:
+        """
+        Induces the solving of the phase 2 simplex problem prescribed by the object
+        Returns True if the problem is bounded
+        Returns False if the problem is unbounded or infeasible
+        """
+        m, n = self._a.shape
+        self._iterate()
+        if self._basic_solution[self._basis >= n].sum() > self._TOLERANCE:
+            return False
+        self._drive_auxillary_variables_from_basis(self._basis)
+        if np.any(self._basis >= n):
+            return False
+        # phase 2 only prices the original columns
+        self._columns = self._columns[:, :n]
+        self._costs = self._c
+        bounded: bool = self._iterate()
+        solution: np.ndarray = np.zeros(n)
+        solution[self._basis] = self._basic_solution
+        self._solution = solution
+        return bounded
+
+    def get_pivot_count(self) -> int:
+        """Number of pivots made over both phases"""
+        return self._pivots
+
+    def get_tableau(self) -> np.ndarray:
+        """Returns the tableau implied by the current basis"""
+        tableau: np.ndarray = np.empty((len(self._b) + 1, self._columns.shape[1] + 1))
+        tableau[1:, 0] = self._basic_solution
+        tableau[1:, 1:] = self._basis_inverse @ self._columns
+        tableau[0, 0] = -self._costs[self._basis] @ self._basic_solution
+        tableau[0, 1:] = self._get_reduced_costs()
+        return tableau
+
+
+class BatchedTwoPhaseSimplex:
+    """
+    Solves K linear programs of the same shape at once, each in the form min c*x, s.t. Ax=b.
+    The K tableaux are stacked into a (K, m+1, n+m+1) array and pivoted in lockstep with the
+    programs that have finished masked out, every program follows exactly the same pivots as
+    TwoPhaseSimplex would take on it alone.
+    """
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> None:
+        """
+        a is either a (K, m, n) array or a single (m, n) matrix shared by every program,
+        b is (K, m) and c is (K, n).
+        """
+        b = np.array(b, dtype=float, ndmin=2)
+        c = np.array(c, dtype=float, ndmin=2)
+        a = np.array(a, dtype=float)
+        if a.ndim == 2:
+            a = np.broadcast_to(a, (len(b),) + a.shape)
+        valid, message = self._check_validity_of_arguments(a, b, c)
+        if not valid:
+            raise InvalidProblemException(
+                "Invalid linear programming problem described: " + message
+            )
+        k, m, n = a.shape
+        self._a: np.ndarray = a
+        self._b: np.ndarray = b
+        self._c: np.ndarray = c.copy()
+        self._tableau: np.ndarray = np.zeros((k, m + 1, m + n + 1))
+        self._basis: np.ndarray = np.zeros((k, m), dtype=np.intp)
+        # programs which are still bounded and feasible
+        self._valid: np.ndarray = np.ones(k, dtype=bool)
+        self._solution: np.ndarray = np.zeros((k, n))
+
+    def _check_validity_of_arguments(
+        self, a: np.ndarray, b: np.ndarray, c: np.ndarray
+    ) -> tuple[bool, str]:
+        """
+        Returns a bool referring to whether the input makes any sense as a batch of linear
+        programs, if false it contains a meaningful error message as to why.
+        """
+        if a.ndim != 3 or a.shape[1] <= 0 or a.shape[2] <= 0:
+            return False, "A should be a batch of matrices with a positive number of rows and columns"
+        if b.shape != a.shape[0:2]:
+            return False, "b should have a vector per program as long as A has rows"
+        if c.shape != (a.shape[0], a.shape[2]):
+            return False, "c should have a vector per program as long as A has columns"
+        return True, ""
+
+    def _construct_tableau(self) -> None:
+        """
+        Constructs the two phase simplex tableau of every program
+        """
+        k, m, n = self._a.shape
+        e: np.ndarray = np.ones(m)
+        self._tableau[:, 0, 0] = -np.matmul(self._b[:, None, :], e)[:, 0]
+        self._tableau[:, 0, 1 : n + 1] = -np.matmul(e, self._a)
+        self._tableau[:, 1 : m + 1, 0] = self._b
+        self._tableau[:, 1 : m + 1, 1 : n + 1] = self._a
+        self._tableau[:, 1 : m + 1, n + 1 : n + m + 1] = np.identity(m)
+        self._basis[:] = np.arange(n + 1, n + m + 1)
+
+    def _find_pivots(self, ks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the pivot (r,s) of every program in ks using Bland's rule, r is 0 when the sth
+        column has no positive entry.
+        """
+        tableaux: np.ndarray = self._tableau[ks]
+        s: np.ndarray = np.argmax(~(tableaux[:, 0, 1:] >= 0), axis=1) + 1
+        columns: np.ndarray = tableaux[np.arange(len(ks)), 1:, s]
+        positive: np.ndarray = columns > 0
+        ratios: np.ndarray = np.full(columns.shape, np.inf)
+        np.divide(tableaux[:, 1:, 0], columns, out=ratios, where=positive)
+        ratios[~(ratios < np.inf)] = np.inf
+        r: np.ndarray = ratios.argmin(axis=1) + 1
+        r[ratios.min(axis=1) == np.inf] = 0
+        return r, s
+
+    def _pivot(self, ks: np.ndarray, r: np.ndarray, s: np.ndarray) -> None:
+        """
+        Pivots the tableau of every program ks[i] on its (r[i], s[i]) entry
+        """
+        rows: np.ndarray = self._tableau[ks, r]
+        rows /= rows[np.arange(len(ks)), s][:, None]
+        self._tableau[ks, r] = rows
+        columns: np.ndarray = self._tableau[ks, :, s]
+        columns[np.arange(len(ks)), r] = 0
+        self._tableau[ks] -= columns[:, :, None] * rows[:, None, :]
+
+    def _solve_auxillary_problem(self) -> None:
+        """
+        Solves the auxillary problem of every program using the phase 1 simplex method
+        """
+        active: np.ndarray = self._tableau[:, 0, 1:].min(axis=1) < 0
+        while active.any():
+            ks: np.ndarray = np.flatnonzero(active)
+            r, s = self._find_pivots(ks)
+            # phase 1 is never unbounded, a missing pivot row can only come from round off
+            stuck: np.ndarray = r == 0
+            self._valid[ks[stuck]] = False
+            ks, r, s = ks[~stuck], r[~stuck], s[~stuck]
+            self._pivot(ks, r, s)
+            self._basis[ks, r - 1] = s
+            active[:] = False
+            active[ks] = self._tableau[ks, 0, 1:].min(axis=1) < 0
+
+    def _drive_auxillary_variables_from_basis(self) -> None:
+        """
+        Removes auxillary variables from the basis of every program, sets up for phase 2
+        """
+        k, m, n = self._a.shape
+        for r in range(m):
+            ks: np.ndarray = np.flatnonzero(
+                self._valid & (self._basis[:, r] >= n + 1) & (self._basis[:, r] <= m + n)
+            )
+            non_zero: np.ndarray = self._tableau[ks, r + 1, 1:] != 0
+            has_pivot: np.ndarray = non_zero.any(axis=1)
+            ks = ks[has_pivot]
+            s: np.ndarray = np.argmax(non_zero[has_pivot], axis=1) + 1
+            self._pivot(ks, np.full(len(ks), r + 1), s)
+            self._basis[ks, r] = s
+        # programs that keep an auxillary variable in the basis are infeasible
+        self._valid &= ~np.any(self._basis >= n + 1, axis=1)
+
+    def _get_solutions(self, ks: np.ndarray) -> np.ndarray:
+        """
+        Gets the current solutions of the programs ks stored in their tableaux
+        """
+        n: int = self._a.shape[2]
+        solutions: np.ndarray = np.zeros((len(ks), n + 1))
+        rows: np.ndarray = np.arange(len(ks))[:, None]
+        solutions[rows, self._basis[ks]] = self._tableau[ks, 1:, 0]
+        return solutions[:, 1:]
+
+    def _set_cost_vectors(self, ks: np.ndarray) -> None:
+        """
+        Writes the cost vectors of the programs ks into their objective rows
+        """
+        solutions: np.ndarray = self._get_solutions(ks)
+        self._tableau[ks, 0, 0] = -np.matmul(self._c[ks, None, :], solutions[:, :, None])[:, 0, 0]
+        self._tableau[ks, 0, 1:] = self._c[ks]
+
+    def _change_tableau_to_phase_two(self) -> None:
+        """
+        Removes the columns of the auxillary variables and changes the objective function of
+        every program, preparing the tableaux for phase 2.
+        """
+        n: int = self._a.shape[2]
+        ks: np.ndarray = np.flatnonzero(self._valid)
+        self._tableau = self._tableau[:, :, 0 : n + 1].copy()
+        self._set_cost_vectors(ks)
+
+    def _after_phase_two_pivot(self, ks: np.ndarray) -> None:
+        """
+        Called after every phase 2 pivot of the programs ks, the objective never changes here
+        """
+
+    def _complete_phase_two(self) -> None:
+        """
+        Solves the phase 2 simplex of every program
+        """
+        active: np.ndarray = self._valid & (self._tableau[:, 0, 1:].min(axis=1) < 0)
+        while active.any():
+            ks: np.ndarray = np.flatnonzero(active)
+            r, s = self._find_pivots(ks)
+            # no pivot row means the program is unbounded
+            unbounded: np.ndarray = r == 0
+            self._valid[ks[unbounded]] = False
+            ks, r, s = ks[~unbounded], r[~unbounded], s[~unbounded]
+            self._pivot(ks, r, s)
+            self._basis[ks, r - 1] = s
+            self._after_phase_two_pivot(ks)
+            active[:] = False
+            active[ks] = self._tableau[ks, 0, 1:].min(axis=1) < 0
+
+    def solve_programs(self) -> np.ndarray:
+        """
+        Induces the solving of every program
+        Returns a (K,) bool array which is True where the program is bounded and feasible
+        """
+        self._construct_tableau()
+        self._solve_auxillary_problem()
+        self._drive_auxillary_variables_from_basis()
+        self._change_tableau_to_phase_two()
+        self._complete_phase_two()
+        ks: np.ndarray = np.flatnonzero(self._valid)
+        self._solution[ks] = self._get_solutions(ks)
+        return self._valid.copy()
+
+    def get_solutions(self) -> np.ndarray:
+        """
+        Returns the (K, 4) array of the skill variables of every solution
+        """
+        return self._solution[:, 0:4]
+
+
+class BatchedLinearPieceWiseTwoPhaseSimplex(BatchedTwoPhaseSimplex):
+    """
+    Batched counterpart of LinearPieceWiseTwoPhaseSimplex, the cost vector of every program is
+    rebuilt from the slope tables after each of its phase 2 pivots.
+    """
+
+    def __init__(self, a, b, c, scalings_floats, base_physical, base_magical, profile=None):
+        super().__init__(a, b, c)
+        self._profile = game_profiles.get_profile(profile)
+        scalings_floats = np.array(scalings_floats, dtype=float, ndmin=2)
+        weapons = np.stack(np.broadcast_arrays(np.ravel(base_physical), np.ravel(base_magical)), axis=-1)
+        # the cost vector multipliers of every skill
+        self._weights: np.ndarray = self._profile.get_weights(scalings_floats, weapons)
+
+    def _after_phase_two_pivot(self, ks: np.ndarray) -> None:
+        """
+        Changes to the cost vectors of the pieces the new solutions lie on
+        """
+        skills = self._profile.stat_count
+        cost_vectors: np.ndarray = self._get_solutions(ks)
+        cost_vectors[:, 0:skills] = -self._profile.get_lp_slopes(cost_vectors[:, 0:skills])
+        cost_vectors[:, 0:skills] *= self._weights[ks]
+        self._c[ks] = cost_vectors
+        self._set_cost_vectors(ks)
+
     
 class InvalidProblemException(Exception):
     """
@@ -308,3 +886,14 @@ class InvalidProblemException(Exception):
     """
     def __init__(self, message):
         self.message = message
+
+
+class IterationLimitException(Exception):
+    """
+    Exception raised by PivotInstrumentation when a phase of the simplex method runs more
+    iterations than allowed, a sign of a cycling or badly degenerate problem.
+    """
+    def __init__(self, message, phase, iterations):
+        self.message = message
+        self.phase = phase
+        self.iterations = iterations
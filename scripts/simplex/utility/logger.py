@@ -1,16 +1,53 @@
-from logic.file import File
-from logic.commands import Append
 from datetime import datetime
+import os
+import time
+
+def _format_message(to_log : str) -> str:
+    now = datetime.now()
+    now_str = now.strftime("%d/%m/%Y %H:%M:%S")
+    return f"<Info> {now_str} :" + to_log
 
 class Logger:
-    def __init__(self, file_path : str):
-        self._file = File(file_path)
-    
+    """
+    Logger which appends to the end of the file without ever reading it, messages are held in a
+    bounded buffer which is flushed once it holds buffer_size characters or flush_interval seconds
+    have passed since the last flush. The file ends up as it would editing it through File.
+    """
+    def __init__(self, file_path : str, buffer_size : int = 1 << 16, flush_interval : float = 5.0):
+        # a new (or empty) file starts with the empty line File creates it with
+        is_new : bool = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+        self._file = open(file_path, "a")
+        self._buffer : list[str] = ["\n"] if is_new else []
+        self._buffered : int = len(self._buffer)
+        self._buffer_size : int = buffer_size
+        self._flush_interval : float = flush_interval
+        self._last_flush : float = time.monotonic()
+
     def log(self, to_log : str):
-        now = datetime.now()
-        now_str = now.strftime("%d/%m/%Y %H:%M:%S")
-        message : str = f"<Info> {now_str} :" + to_log
-        self._file.modify_contents(Append(), -1 , message)
+        message : str = "\n" + _format_message(to_log)
+        self._buffer.append(message)
+        self._buffered += len(message)
+        if self._buffered >= self._buffer_size or time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes every buffered message to the end of the file"""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._file.flush()
+            self._buffer.clear()
+            self._buffered = 0
+        self._last_flush = time.monotonic()
 
     def write_log(self):
-        self._file.write_to_file()
+        self.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
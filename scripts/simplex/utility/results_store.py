@@ -0,0 +1,113 @@
+import numpy as np
+
+# one row per test case, the fields are named after the test case and results dict keys
+# solutions which weren't found (an infeasible ground truth) are stored as nan
+RESULTS_DTYPE : np.dtype = np.dtype([
+    ("grades", "U1", (4,)),
+    ("requirements", np.int32, (4,)),
+    ("skills", np.int32, (4,)),
+    ("base_physical", np.float64),
+    ("base_magical", np.float64),
+    ("levels", np.int32),
+    ("runtime_it", np.float64),
+    ("soln_it", np.float64, (4,)),
+    ("obj_fun_it_soln", np.float64),
+    ("runtime_app", np.float64),
+    ("soln_app", np.float64, (4,)),
+    ("obj_fn_app_soln", np.float64),
+    ("runtime_opt", np.float64),
+    ("soln_opt", np.float64, (4,)),
+    ("obj_fn_opt_soln", np.float64),
+])
+
+_MAGIC : bytes = b"\x93NUMPY\x01\x00"
+# the header is always padded to this many bytes so it can be rewritten in place with any row count
+_HEADER_SIZE : int = 1024
+
+def _get_header(dtype : np.dtype, rows : int) -> bytes:
+    """Version 1.0 .npy header of a one dimensional array padded to _HEADER_SIZE bytes"""
+    header : str = repr({"descr" : np.lib.format.dtype_to_descr(dtype), "fortran_order" : False, "shape" : (rows,)})
+    length : int = _HEADER_SIZE - len(_MAGIC) - 2
+    if len(header) + 1 > length:
+        raise ValueError("dtype is too large for the results header")
+    return _MAGIC + length.to_bytes(2, "little") + (header.ljust(length - 1) + "\n").encode("latin1")
+
+def to_row(results : dict, test_case : dict) -> np.ndarray:
+    """
+    Converts the (results, test case) pair of run_test_case into a row of RESULTS_DTYPE,
+    missing fields are left as 0
+    """
+    values : dict = {**test_case, **results}
+    row : np.ndarray = np.zeros((), dtype=RESULTS_DTYPE)
+    for name in RESULTS_DTYPE.names:
+        if name in values:
+            row[name] = np.nan if values[name] is None else values[name]
+    return row
+
+class ResultsWriter:
+    """
+    Sink writing results to a .npy file of RESULTS_DTYPE rows (or any one dimensional
+    structured dtype). Rows are buffered and appended to the end of the file, after every
+    flush the header is rewritten with the new row count so the file is always a valid array
+    which read_results can map without parsing anything.
+    """
+
+    def __init__(self, path : str, dtype : np.dtype = RESULTS_DTYPE, buffer_rows : int = 4096):
+        self._dtype : np.dtype = np.dtype(dtype)
+        self._file = open(path, "wb")
+        self._file.write(_get_header(self._dtype, 0))
+        self._file.flush()
+        self._buffer : np.ndarray = np.zeros(buffer_rows, dtype=self._dtype)
+        self._buffered : int = 0
+        self._rows : int = 0
+
+    def append_row(self, row) -> None:
+        self._buffer[self._buffered] = row
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def append(self, results : dict, test_case : dict) -> None:
+        """Appends the (results, test case) pair returned by run_test_case"""
+        self.append_row(to_row(results, test_case))
+
+    def append_rows(self, rows : np.ndarray) -> None:
+        """Appends a whole array of rows, bypassing the buffer"""
+        self.flush()
+        np.ascontiguousarray(rows, dtype=self._dtype).tofile(self._file)
+        self._rows += len(rows)
+        self._write_header()
+
+    def flush(self) -> None:
+        if self._buffered > 0:
+            self._buffer[:self._buffered].tofile(self._file)
+            self._rows += self._buffered
+            self._buffered = 0
+        self._write_header()
+
+    def _write_header(self) -> None:
+        end : int = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_get_header(self._dtype, self._rows))
+        self._file.seek(end)
+        self._file.flush()
+
+    def __len__(self) -> int:
+        return self._rows + self._buffered
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def read_results(path : str) -> np.ndarray:
+    """
+    Maps a results file as a read only structured array, columns such as
+    read_results(path)["runtime_it"] are views of the file rather than copies.
+    """
+    return np.load(path, mmap_mode="r")
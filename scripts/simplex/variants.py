@@ -0,0 +1,98 @@
+"""
+This module expands a weapon into its variants, one handed or two handed and every infusion, and
+optimises all of them at once. The variants are rows of one batch: their attack rating tables are
+built together and solved by a single vectorized dynamic program (exact_allocation.allocate_batch)
+rather than a solve per variant, then the best variant is picked from the batch.
+"""
+
+import numpy as np
+import game_profiles
+from exact_allocation import allocate_batch
+from objective_fn import get_total_damage_ratings
+
+# two handing a weapon multiplies strength (the first skill) by this much
+TWO_HANDING_MULTIPLIER: float = 1.5
+
+
+def expand_variants(weapon: dict, two_handing: tuple = (False, True), infusions: dict = None) -> list:
+    """
+    Lists every variant of a weapon (in the form maximise_damage takes it) as a weapon dict with
+    the "infusion" and "two_handing" it was made with.
+    infusions maps the name of every infusion to the weapon fields it changes (such as grades,
+    physical_damage and magic_damage), it defaults to weapon["infusions"] and the weapon as it is
+    is always the "normal" infusion.
+    """
+    if infusions is None:
+        infusions = weapon.get("infusions", {})
+    base: dict = {key: value for key, value in weapon.items() if key != "infusions"}
+    infused: list = [("normal", {})] + [(name, changes) for name, changes in infusions.items() if name != "normal"]
+    return [
+        {**base, **changes, "infusion": name, "two_handing": two_handed}
+        for name, changes in infused
+        for two_handed in two_handing
+    ]
+
+
+def _get_two_handed_rating(profile) -> np.ndarray:
+    """Rating table of every skill when two handing, only strength changes"""
+    points: np.ndarray = np.arange(profile.max_skill + 1, dtype=float) * TWO_HANDING_MULTIPLIER
+    rating: np.ndarray = profile.rating.copy()
+    rating[0] = profile.get_ratings(np.column_stack([points] * profile.stat_count))[:, 0]
+    return rating
+
+
+def _get_lower_bounds(variants: list, skills: list) -> np.ndarray:
+    """
+    Lower bound of every skill of every variant, a two handed weapon meets its strength
+    requirement with 1.5 times the strength as it does in game.
+    """
+    requirements: np.ndarray = np.array([variant["requirements"] for variant in variants], dtype=np.intp)
+    two_handed: np.ndarray = np.array([variant["two_handing"] for variant in variants], dtype=bool)
+    # ceil(requirement / 1.5) without going through floats
+    requirements[two_handed, 0] = -(-2 * requirements[two_handed, 0] // 3)
+    return np.maximum(requirements, np.asarray(skills, dtype=np.intp))
+
+
+def optimise_variants(variants: list, skills: list, level: int, profile=None) -> tuple:
+    """
+    Finds the optimal build of every variant (as listed by expand_variants) under the
+    constraints of optimise_exactly in one batched solve.
+    Returns the (variants, skills) array of builds and the (variants,) array of their attack
+    ratings, variants without a feasible build have a row of 0s and an attack rating of nan.
+    """
+    profile = game_profiles.get_profile(profile)
+    scalings: np.ndarray = profile.get_scales([variant["grades"] for variant in variants])
+    bases: np.ndarray = np.array(
+        [[variant[name + "_damage"] for name in profile.damage_names] for variant in variants], dtype=float
+    )
+    two_handed: np.ndarray = np.array([variant["two_handing"] for variant in variants], dtype=bool)
+    # one rating table per variant chosen by how it is held
+    ratings: np.ndarray = np.stack((profile.rating, _get_two_handed_rating(profile)))[two_handed.astype(np.intp)]
+    values: np.ndarray = profile.get_weights(scalings, bases)[:, :, None] * ratings
+    lower_bounds: np.ndarray = _get_lower_bounds(variants, skills)
+    budgets: np.ndarray = level - (lower_bounds.sum(axis=1) - int(np.sum(skills)))
+    builds, totals = allocate_batch(values, lower_bounds, budgets)
+    damages: np.ndarray = np.full(len(variants), np.nan)
+    # scored by the objective function, one call for each way of holding the weapon
+    for held in (False, True):
+        rows: np.ndarray = np.flatnonzero((two_handed == held) & (totals > -np.inf))
+        if len(rows) > 0:
+            damages[rows] = get_total_damage_ratings(
+                builds[rows], scalings[rows], bases[rows], two_handing=held, profile=profile
+            )
+    return builds, damages
+
+
+def optimise_best_variant(
+    weapon: dict, skills: list, level: int, two_handing: tuple = (False, True), infusions: dict = None, profile=None
+) -> tuple:
+    """
+    Finds the variant of a weapon with the greatest attack rating and its optimal build.
+    Returns (variant, build, attack rating), (None, None, nan) if no variant is feasible.
+    """
+    variants: list = expand_variants(weapon, two_handing, infusions)
+    builds, damages = optimise_variants(variants, skills, level, profile)
+    if np.all(np.isnan(damages)):
+        return None, None, np.nan
+    best: int = int(np.nanargmax(damages))
+    return variants[best], [int(x) for x in builds[best]], float(damages[best])
@@ -0,0 +1,140 @@
+"""
+This module ingests a game's weapon list from CSV or JSON once and stores it as a struct of arrays
+catalogue, a directory holding one .npy file per field with the grades already translated to float
+scales. Catalogues are memory mapped when opened so later runs start instantly and every field is a
+zero copy view which can be passed straight to the batched solvers.
+"""
+
+import csv
+import json
+import os
+import numpy as np
+import game_profiles
+
+_META_FILE: str = "catalogue.json"
+_FIELDS: tuple = ("names", "grades", "scales", "requirements", "base_damages")
+# base damage columns of problem.json style data
+_BASE_DAMAGE_ALIASES: dict = {"physical": "base_physical", "magic": "base_magical"}
+
+
+def _get_base_damage(weapon: dict, name: str) -> float:
+    if name + "_damage" in weapon:
+        return float(weapon[name + "_damage"])
+    return float(weapon[_BASE_DAMAGE_ALIASES[name]])
+
+
+def _read_csv(path: str, profile) -> list:
+    """
+    Reads weapons from a CSV file with a header of name, <skill>_grade and <skill>_requirement
+    for every skill and <damage>_damage for every damage type of the profile.
+    """
+    weapons: list = []
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            weapons.append({
+                "name": row["name"],
+                "grades": [row[skill + "_grade"].strip().upper() for skill in profile.skill_names],
+                "requirements": [int(row[skill + "_requirement"]) for skill in profile.skill_names],
+                **{name + "_damage": float(row[name + "_damage"]) for name in profile.damage_names},
+            })
+    return weapons
+
+
+def read_weapons(path: str, profile=None) -> list:
+    """
+    Reads a weapon list from a .csv file or a .json file holding a list of weapons in the form
+    maximise_damage takes them with a "name" added.
+    """
+    profile = game_profiles.get_profile(profile)
+    if path.endswith(".csv"):
+        return _read_csv(path, profile)
+    with open(path) as file:
+        return json.load(file)
+
+
+def build_catalogue(weapons: list, path: str, profile=None) -> None:
+    """
+    Writes weapons (as read by read_weapons) to a catalogue directory at path, created if needed.
+    Raises ValueError for duplicate names or grades the profile doesn't know.
+    """
+    profile = game_profiles.get_profile(profile)
+    names: list = [str(weapon["name"]) for weapon in weapons]
+    if len(set(names)) != len(names):
+        raise ValueError("weapon names must be unique")
+    for weapon in weapons:
+        unknown: list = [grade for grade in weapon["grades"] if grade not in profile.grade_multipliers]
+        if unknown:
+            raise ValueError(f"weapon {weapon['name']} has unknown grades {unknown}")
+    shape: tuple = (len(weapons), profile.stat_count)
+    grades: np.ndarray = np.array([weapon["grades"] for weapon in weapons], dtype="U1").reshape(shape)
+    arrays: dict = {
+        "names": np.array(names, dtype=str),
+        "grades": grades,
+        "scales": profile.get_scales(grades),
+        "requirements": np.array([weapon["requirements"] for weapon in weapons], dtype=np.uint8).reshape(shape),
+        "base_damages": np.array(
+            [[_get_base_damage(weapon, name) for name in profile.damage_names] for weapon in weapons], dtype=float
+        ).reshape(len(weapons), len(profile.damage_names)),
+    }
+    os.makedirs(path, exist_ok=True)
+    for field in _FIELDS:
+        np.save(os.path.join(path, field + ".npy"), arrays[field])
+    with open(os.path.join(path, _META_FILE), "w") as file:
+        json.dump({"profile": profile.name, "weapons": len(weapons)}, file)
+
+
+class WeaponCatalogue:
+    """
+    Memory mapped struct of arrays weapon table, row i of every field belongs to weapon i.
+
+    Fields
+    ======
+        names - (weapons,) names
+        grades - (weapons, skills) letter grades
+        scales - (weapons, skills) float scales of the grades
+        requirements - (weapons, skills) uint8 requirements
+        base_damages - (weapons, damage types) base damages
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, _META_FILE)) as file:
+            meta: dict = json.load(file)
+        self.profile: str = meta["profile"]
+        for field in _FIELDS:
+            setattr(self, field, np.load(os.path.join(path, field + ".npy"), mmap_mode="r").view(np.ndarray))
+        self._indices: dict = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get_index(self, name: str) -> int:
+        """Row of a weapon, the name lookup is built on first use"""
+        if self._indices is None:
+            self._indices = {str(name): i for i, name in enumerate(self.names)}
+        return self._indices[name]
+
+    def get_weapon(self, weapon) -> dict:
+        """Weapon (a name or row) in the form maximise_damage takes it, with its name"""
+        i: int = self.get_index(weapon) if isinstance(weapon, str) else int(weapon)
+        profile = game_profiles.get_profile(self.profile)
+        return {
+            "name": str(self.names[i]),
+            "grades": [str(grade) for grade in self.grades[i]],
+            "requirements": [int(requirement) for requirement in self.requirements[i]],
+            **{name + "_damage": float(damage) for name, damage in zip(profile.damage_names, self.base_damages[i])},
+        }
+
+    def get_weapons(self) -> list:
+        """Every weapon as a weapon dict, as build_index and the loadout optimiser take them"""
+        return [self.get_weapon(i) for i in range(len(self))]
+
+
+def open_catalogue(source_path: str, path: str, profile=None) -> WeaponCatalogue:
+    """
+    Opens the catalogue at path, (re)building it from the weapon data at source_path first
+    when it is missing or older than the source.
+    """
+    meta_path: str = os.path.join(path, _META_FILE)
+    if not os.path.exists(meta_path) or os.path.getmtime(meta_path) < os.path.getmtime(source_path):
+        build_catalogue(read_weapons(source_path, profile), path, profile)
+    return WeaponCatalogue(path)